@@ -1,18 +1,18 @@
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication
-from PyQt6.QtCore import QModelIndex, Qt
+from PyQt6.QtCore import QModelIndex, Qt, QThreadPool
 import os
 import sys
 import subprocess
 
 from src.core.app import CoreApp
 from src.core.data_processor import DataProcessor
-from src.core.settings import Settings
 from src.apps.pdf_ms.models.pdf_table_model import PDFTableModel
 from src.apps.pdf_ms.models.pdf_proxy_model import PDFSortFilterProxyModel
 from src.apps.pdf_ms.views.main_window import MainWindow
 from src.apps.pdf_ms.views.metadata_view import MetadataView
 from src.apps.pdf_ms.views.settings_dialog import SettingsDialog
 from src.apps.pdf_ms.views.reader import ReaderWindow
+from src.apps.pdf_ms.controllers.scan_worker import ScanWorker
 
 class MainController:
     """
@@ -22,10 +22,14 @@ class MainController:
     2. Call Model (CoreApp) to fetch/update data.
     3. Update Views with new data.
     """
+    # Most recent root folders offered in the history combo
+    HISTORY_LIMIT = 50
+
     def __init__(self):
         self.app_core = CoreApp()
         self.data_processor = DataProcessor()
         self.full_df = None # Store complete scanned data
+        self._scan_gen = 0 # Bumped per scan; older results are ignored
         
         # Initialize Views
         self.main_window = MainWindow()
@@ -48,7 +52,7 @@ class MainController:
         self.main_window.act_settings.triggered.connect(self.open_settings)
         self.main_window.table_view.selectionModel().selectionChanged.connect(self.on_selection_changed)
         self.main_window.table_view.doubleClicked.connect(self.on_double_click)
-        self.main_window.search_input.textChanged.connect(self.on_search)
+        self.main_window.search_committed.connect(self.on_search)
         self.metadata_view.save_requested.connect(self.save_metadata)
         self.main_window.combo_history.activated.connect(self.on_history_selected)
         
@@ -74,7 +78,7 @@ class MainController:
         Set the main window title dynamically based on settings.
         Format: {Title} -- Github_Ver (Date) >>> Local_DEV_Ver [Date] -- # AI_IDE #
         """
-        settings = Settings()
+        settings = self.app_core.settings
         
         title = "PDF Management System"
         github_ver = settings.config.get("last_version_github", "v1.0.0")
@@ -90,27 +94,27 @@ class MainController:
         # Initialize File Watcher BEFORE loading history
         from src.core.services.file_watcher import FileWatcherService
         self.file_watcher = FileWatcherService()
-        self.file_watcher.handler.file_created.connect(self.on_file_changed)
-        self.file_watcher.handler.file_deleted.connect(self.on_file_changed)
-        self.file_watcher.handler.file_moved.connect(self.on_file_changed)
+        # One batched signal per debounce window instead of one per event
+        self.file_watcher.handler.changes_flushed.connect(self.on_files_changed)
 
         # Load History and Startup (may trigger _load_folder_data which needs file_watcher)
         self.load_history_and_startup()
 
-    def on_file_changed(self, path):
+    def on_files_changed(self, paths):
         """
         Refresh view when file system changes.
+        Reloads at most once per watcher batch, however many files it touched.
         Optimisation: Could update model directly, but simple reload is safer for MVP.
         """
         # Checks if the change is relevant to the current directory
         current_root = self.main_window.combo_history.currentText()
         if current_root:
             normalized_root = os.path.abspath(current_root)
-            normalized_path = os.path.abspath(path)
             
-            # Simple check if changed file is within current root
-            if normalized_path.startswith(normalized_root):
-                 print(f"File changed: {path}. Reloading...")
+            # Simple check if a changed file is within current root
+            changed = [p for p in paths if os.path.abspath(p).startswith(normalized_root)]
+            if changed:
+                 print(f"Files changed: {len(changed)} (e.g. {changed[0]}). Reloading...")
                  self._load_folder_data(current_root)
 
     def show(self):
@@ -139,10 +143,10 @@ class MainController:
                 QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
                 
                 from src.core.services.pdf_engine import PDFEngine
-                import json
+                from src.core.services import json_codec
                 
                 toc = PDFEngine.extract_toc(file_path)
-                toc_json = json.dumps(toc)
+                toc_json = json_codec.dumps(toc)
                 self.app_core.update_file_custom(file_path, bookmarks=toc_json)
                 
                 # Refresh UI (Reload folder to update 'has_toc' column)
@@ -224,27 +228,27 @@ class MainController:
         # Otherwise, we want to bookmark all (target = True)
         target_state = not all_bookmarked
 
-        # 3. Apply updates
-        for row, file_path, current_status in files_to_update:
-            # Only update if different from target (optimization)
-            if current_status != target_state:
-                # Update Core/DB
-                # Core toggle_bookmark toggles current state. 
-                # Since we know current != target, toggling current gives target.
-                self.app_core.toggle_bookmark(file_path)
-                
-                # Update In-Memory DataFrame
-                if self.full_df is not None:
-                     if 'is_bookmarked' not in self.full_df.columns:
-                         self.full_df['is_bookmarked'] = False
-                     
-                     col_idx = self.full_df.columns.get_loc('is_bookmarked')
-                     self.full_df.iloc[row, col_idx] = target_state
-                     
-                     # Notify View
-                     fav_col_index = 4
-                     idx = self.table_model.index(row, fav_col_index)
-                     self.table_model.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole])
+        # 3. Apply updates (only rows that differ from the target)
+        changed = [(row, path) for row, path, current in files_to_update if current != target_state]
+        if not changed:
+            return
+        
+        # Update Core/DB in one transaction
+        self.app_core.set_bookmarks([path for _, path in changed], target_state)
+        
+        # Update In-Memory DataFrame
+        if self.full_df is not None:
+             if 'is_bookmarked' not in self.full_df.columns:
+                 self.full_df['is_bookmarked'] = False
+             
+             col_idx = self.full_df.columns.get_loc('is_bookmarked')
+             fav_col_index = 4
+             for row, _ in changed:
+                 self.full_df.iloc[row, col_idx] = target_state
+                 
+                 # Notify View
+                 idx = self.table_model.index(row, fav_col_index)
+                 self.table_model.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole])
 
     def on_edit_metadata(self, index):
         """
@@ -276,10 +280,11 @@ class MainController:
         
         try:
             from src.core.services.pdf_engine import PDFEngine
-            import json
+            from src.core.services import json_codec
             
             success_count = 0
             error_files = []
+            rows = [] # Saved in one batch after the loop
             
             for index in indexes:
                 try:
@@ -293,15 +298,17 @@ class MainController:
                     
                     # Extract ToC
                     toc = PDFEngine.extract_toc(file_path)
-                    toc_json = json.dumps(toc)
+                    toc_json = json_codec.dumps(toc)
                     
-                    # Save to DB
-                    self.app_core.update_file_custom(file_path, bookmarks=toc_json)
+                    rows.append({'file_path': file_path, 'bookmarks': toc_json})
                     success_count += 1
                     
                 except Exception as e:
                     error_files.append(f"{os.path.basename(file_path)}: {str(e)}")
             
+            # Save to DB
+            self.app_core.update_files_custom_bulk(rows)
+            
             # Refresh UI
             current_root = self.main_window.combo_history.currentText()
             if current_root:
@@ -322,7 +329,7 @@ class MainController:
             QApplication.restoreOverrideCursor()
 
     def load_history_and_startup(self):
-        history = self.app_core.get_root_history()
+        history = self.app_core.get_root_history(self.HISTORY_LIMIT)
         self.main_window.combo_history.clear()
         if history:
             self.main_window.combo_history.addItems(history)
@@ -341,7 +348,7 @@ class MainController:
         self.main_window.combo_history.blockSignals(True)
         
         # Refresh list from DB to get correct order (most recent first)
-        history = self.app_core.get_root_history()
+        history = self.app_core.get_root_history(self.HISTORY_LIMIT)
         self.main_window.combo_history.clear()
         self.main_window.combo_history.addItems(history)
         
@@ -502,8 +509,31 @@ class MainController:
              QMessageBox.warning(self.main_window, "Error", f"Path does not exist: {folder_path}")
              return
 
-        # Scan
-        raw_df = self.app_core.scan(folder_path, recursive=True)
+        # Scan off the GUI thread; the table is updated in _on_scan_finished
+        self._scan_gen += 1
+        worker = ScanWorker(self.app_core, folder_path, recursive=True, generation=self._scan_gen)
+        worker.signals.progress.connect(self._on_scan_progress, Qt.ConnectionType.QueuedConnection)
+        worker.signals.finished.connect(self._on_scan_finished, Qt.ConnectionType.QueuedConnection)
+        worker.signals.error.connect(self._on_scan_error, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_scan_progress(self, generation, current, total, message):
+        if generation != self._scan_gen:
+            return # Progress from a superseded scan
+        self.main_window.statusBar().showMessage(f"{message} ({current}/{total})")
+
+    def _on_scan_error(self, folder_path, generation, message):
+        if generation != self._scan_gen:
+            return
+        self.main_window.statusBar().clearMessage()
+        QMessageBox.critical(self.main_window, "Error", f"Failed to scan {folder_path}: {message}")
+
+    def _on_scan_finished(self, folder_path, generation, raw_df):
+        if generation != self._scan_gen:
+            return # A newer scan was started meanwhile
+        self.main_window.statusBar().clearMessage()
+        # Only the latest scan's plan is what execute_plan acts on
+        self.app_core.current_plan = raw_df
         
         # Process Data via DataProcessor
         df = self.data_processor.process_scan_results(raw_df, root_path=folder_path)
@@ -545,7 +575,8 @@ class MainController:
             self.proxy_model.setFilterRegularExpression(regex)
 
     def open_settings(self):
-        settings = Settings()
+        # Edit the core's own Settings so the organizer sees the version bump
+        settings = self.app_core.settings
         dialog = SettingsDialog(settings.config, self.main_window)
         if dialog.exec():
             new_config = dialog.get_settings()
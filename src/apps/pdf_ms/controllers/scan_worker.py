@@ -0,0 +1,39 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+class WorkerSignals(QObject):
+    """
+    Signal holder for ScanWorker (QRunnable is not a QObject).
+    All signals carry the generation so the receiver can drop stale scans.
+    """
+    progress = pyqtSignal(int, int, int, str) # generation, current, total, message
+    finished = pyqtSignal(str, int, object) # folder_path, generation, DataFrame
+    error = pyqtSignal(str, int, str) # folder_path, generation, message
+
+class ScanWorker(QRunnable):
+    """
+    Runs CoreApp.build_plan (file walk, DB lookups, PDF ToC checks) on a
+    QThreadPool thread. No Qt objects or shared CoreApp state are touched
+    here; the plan goes back to the GUI thread through queued signals and
+    only becomes current_plan there, if its generation is still current.
+    """
+    
+    def __init__(self, core_app, folder_path, recursive=True, generation=0):
+        super().__init__()
+        self.core_app = core_app
+        self.folder_path = folder_path
+        self.recursive = recursive
+        self.generation = generation
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            df = self.core_app.build_plan(
+                self.folder_path, recursive=self.recursive, notify=self._notify
+            )
+        except Exception as e:
+            self.signals.error.emit(self.folder_path, self.generation, str(e))
+            return
+        self.signals.finished.emit(self.folder_path, self.generation, df)
+
+    def _notify(self, current, total, message):
+        self.signals.progress.emit(self.generation, current, total, message)
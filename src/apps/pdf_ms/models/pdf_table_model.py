@@ -1,5 +1,21 @@
 from PyQt6.QtCore import QAbstractTableModel, Qt, pyqtSignal
-import pandas as pd
+import numpy as np
+
+# Column painted by ActionDelegate (last entry of PDFTableModel headers)
+ACTIONS_COLUMN = 7
+
+# Custom role: bool ToC status, for delegates that don't need the full UserRole dict
+HAS_TOC_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Display symbols indexed by the 0/1 flag value
+FAV_SYMBOLS = np.array(["☆", "★"], dtype=object)
+TOC_SYMBOLS = np.array(["✗ No", "✓ Yes"], dtype=object)
+
+def _flag_array(df, col):
+    """Column as a plain bool ndarray (missing values / column -> False)."""
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df[col].fillna(False).astype(bool).to_numpy(copy=True)
 
 class PDFTableModel(QAbstractTableModel):
     """
@@ -11,12 +27,101 @@ class PDFTableModel(QAbstractTableModel):
         super().__init__()
         self._data = data
         self._headers = ["Filename", "Type", "Tags", "Category", "Fav", "ToC", "Path", "Actions"]
+        # Per-row UserRole payloads, valid until the next set_data()
+        self._user_role_cache: dict[int, dict] = {}
+        # Per-column display strings, built once per DataFrame
+        self._display: list[np.ndarray | None] = [None] * len(self._headers)
+        self._paths: np.ndarray | None = None
+        self._has_toc: np.ndarray | None = None
+        self._is_bookmarked: np.ndarray | None = None
+        self._build_arrays()
+        # Role -> handler(row, col) dispatch for data()
+        self._role_handlers = {
+            Qt.ItemDataRole.DisplayRole: self._display_data,
+            Qt.ItemDataRole.UserRole: self._user_data,
+            HAS_TOC_ROLE: self._has_toc_data,
+        }
+        self.dataChanged.connect(self._on_data_changed)
 
     def set_data(self, df):
         self.beginResetModel()
         self._data = df
+        self._user_role_cache.clear()
+        self._build_arrays()
         self.endResetModel()
 
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        # Controller edits the DataFrame in place (e.g. Fav toggle), so refresh stale rows
+        first, last = top_left.row(), bottom_right.row()
+        for row in range(first, last + 1):
+            self._user_role_cache.pop(row, None)
+        if self._data is not None and 0 <= first <= last < len(self._data):
+            changed = self._data.iloc[first:last + 1]
+            for col, arr in enumerate(self._display_columns(changed)):
+                self._display[col][first:last + 1] = arr
+            self._has_toc[first:last + 1] = _flag_array(changed, 'has_toc')
+            self._is_bookmarked[first:last + 1] = _flag_array(changed, 'is_bookmarked')
+
+    def _build_arrays(self):
+        if self._data is None:
+            self._display = [None] * len(self._headers)
+            self._paths = self._has_toc = self._is_bookmarked = None
+        else:
+            self._display = self._display_columns(self._data)
+            self._prefetch()
+
+    def _prefetch(self):
+        """
+        Materialize the per-row values the delegates read (path, ToC, Fav)
+        as NumPy arrays up front, so no DataFrame access happens while painting.
+        """
+        df = self._data
+        if 'original_path' in df.columns:
+            self._paths = df['original_path'].to_numpy(dtype=object)
+        else:
+            # e.g. the empty frame returned for a folder without PDFs
+            self._paths = np.full(len(df), None, dtype=object)
+        self._has_toc = _flag_array(df, 'has_toc')
+        self._is_bookmarked = _flag_array(df, 'is_bookmarked')
+
+    def _display_columns(self, df):
+        """
+        Vectorized DisplayRole strings for every column of `df`.
+        Headers: ["Filename", "Type", "Tags", "Category", "Fav", "ToC", "Path", "Actions"]
+        """
+        n = len(df)
+
+        def text(col, fallback_col=None, default=""):
+            if col in df.columns:
+                return df[col].astype(str).to_numpy(dtype=object, copy=True)
+            if fallback_col is not None:
+                return text(fallback_col)
+            return np.full(n, default, dtype=object)
+
+        def symbols(col, table, default):
+            if col not in df.columns:
+                return np.full(n, default, dtype=object)
+            # 0/1 codes index straight into the symbol table (no per-row branching)
+            codes = _flag_array(df, col).view(np.int8)
+            return table.take(codes)
+
+        if 'tags' in df.columns:
+            tags = df['tags'].fillna('').to_numpy(dtype=object, copy=True)
+        else:
+            tags = np.full(n, "", dtype=object)
+
+        return [
+            text('filename_no_ext', 'filename'),
+            text('file_type', default="PDF File"),
+            tags,
+            text('category'),
+            symbols('is_bookmarked', FAV_SYMBOLS, "☆"),
+            symbols('has_toc', TOC_SYMBOLS, "?"),
+            text('relative_path', 'original_path'),
+            # Delegate handles painting, but we can return text for accessibility if needed
+            np.full(n, "", dtype=object),
+        ]
+
     def rowCount(self, parent=None):
         return len(self._data) if self._data is not None else 0
 
@@ -27,66 +132,48 @@ class PDFTableModel(QAbstractTableModel):
         if not index.isValid() or self._data is None:
             return None
 
-        if role == Qt.ItemDataRole.DisplayRole:
-            row = index.row()
-            col = index.column()
-            
-            # Map column index to DataFrame column
-            # Headers: ["Filename", "Type", "Tags", "Category", "Bookmarks", "Path", "Actions"]
-            
-            if col == 0:
-                if 'filename_no_ext' in self._data.columns:
-                    return str(self._data.iloc[row]['filename_no_ext'])
-                return str(self._data.iloc[row]['filename'])
-            elif col == 1:
-                if 'file_type' in self._data.columns:
-                    return str(self._data.iloc[row]['file_type'])
-                return "PDF File"
-            elif col == 2:
-                tags = self._data.iloc[row]['tags']
-                return tags if tags else ""
-            elif col == 3:
-                return str(self._data.iloc[row]['category'])
-            elif col == 4:
-                # Fav / User Bookmark
-                if 'is_bookmarked' in self._data.columns:
-                    val = self._data.iloc[row]['is_bookmarked']
-                    return "★" if val else "☆"
-                return "☆"
-            elif col == 5:
-                # Bookmarks Status
-                if 'has_toc' in self._data.columns:
-                    val = self._data.iloc[row]['has_toc']
-                    has_toc = True if (val and val is not pd.NA) else False
-                    return "✓ Yes" if has_toc else "✗ No"
-                return "?"
-            elif col == 6:
-                if 'relative_path' in self._data.columns:
-                    return str(self._data.iloc[row]['relative_path'])
-                return str(self._data.iloc[row]['original_path'])
-            elif col == 7:
-                # Delegate handles painting, but we can return text for accessibility if needed
-                return "" 
-        
-        elif role == Qt.ItemDataRole.UserRole:
-            # Return enriched data for delegates
-            row = index.row()
-            has_toc = False
-            if 'has_toc' in self._data.columns:
-                val = self._data.iloc[row]['has_toc']
-                has_toc = True if (val and val is not pd.NA) else False
-            
-            is_bookmarked = False
-            if 'is_bookmarked' in self._data.columns:
-                is_bookmarked = bool(self._data.iloc[row]['is_bookmarked'])
-                
-            return {
-                'has_toc': has_toc,
-                'is_bookmarked': is_bookmarked,
-                'path': str(self._data.iloc[row]['original_path'])
-            }
-        
-        return None
+        # Qt queries many roles per cell; unhandled ones fall straight through
+        handler = self._role_handlers.get(role)
+        return handler(index.row(), index.column()) if handler else None
+
+    def multiData(self, index, roleDataSpan):
+        """
+        Fill every role Qt asks for in one call. Item delegates in Qt 6 fetch
+        font, alignment, colors, decoration and text this way, so a cell paint
+        costs one Python call instead of one data() call per role.
+        """
+        if not index.isValid() or self._data is None:
+            return
+        row, col = index.row(), index.column()
+        handlers = self._role_handlers
+        for i in range(len(roleDataSpan)):
+            role_data = roleDataSpan[i]
+            handler = handlers.get(role_data.role())
+            if handler:
+                role_data.setData(handler(row, col))
+            else:
+                role_data.clearData()
+
+    def _display_data(self, row, col):
+        arr = self._display[col]
+        return arr[row] if arr is not None else ""
+
+    def _user_data(self, row, col):
+        # Return enriched data for delegates
+        cached = self._user_role_cache.get(row)
+        if cached is not None:
+            return cached
+
+        user_data = {
+            'has_toc': bool(self._has_toc[row]),
+            'is_bookmarked': bool(self._is_bookmarked[row]),
+            'path': str(self._paths[row])
+        }
+        self._user_role_cache[row] = user_data
+        return user_data
+
+    def _has_toc_data(self, row, col):
+        return bool(self._has_toc[row])
 
     def headerData(self, section, orientation, role):
         if role == Qt.ItemDataRole.DisplayRole:
@@ -97,6 +184,6 @@ class PDFTableModel(QAbstractTableModel):
         return None
 
     def get_file_path_at(self, row):
-        if self._data is not None and 0 <= row < len(self._data):
-            return str(self._data.iloc[row]['original_path'])
+        if self._paths is not None and 0 <= row < len(self._paths):
+            return str(self._paths[row])
         return None
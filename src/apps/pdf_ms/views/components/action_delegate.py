@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QStyledItemDelegate, QApplication, QStyle, QStyleOptionButton, QToolTip
-from PyQt6.QtCore import Qt, QRect, QSize, pyqtSignal, QEvent
-from PyQt6.QtGui import QMouseEvent, QHelpEvent, QColor, QIcon, QPainter
+from PyQt6.QtCore import Qt, QRect, QSize, QPoint, pyqtSignal, QEvent, QTimer, QPersistentModelIndex
+from PyQt6.QtGui import QColor, QPainter, QPixmap
+from src.apps.pdf_ms.models.pdf_table_model import ACTIONS_COLUMN, HAS_TOC_ROLE
 
 class ActionDelegate(QStyledItemDelegate):
     """
@@ -11,93 +12,186 @@ class ActionDelegate(QStyledItemDelegate):
     # Emits row index and action type
     action_requested = pyqtSignal(int, str)
 
+    DOT_SIZE = 6 # ToC status indicator
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.hover_row = -1
         self.hover_button = 0 # 0=None, 1=File, 2=Folder, 3=ToC
         
+        # Cache the style; refreshed on StyleChange (see eventFilter)
+        self._style = QApplication.style()
+        
         # Cache icons
-        self.icon_file = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
-        self.icon_folder = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self.icon_file = self._style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        self.icon_folder = self._style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
         # For ToC, we'll use a book icon if available, or a generic one colored
         # SP_FileDialogDetailedView is list-like, maybe appropriate.
-        self.icon_toc = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView) 
+        self.icon_toc = self._style.standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView) 
+
+        # ToC indicator dots: Red (No ToC) / Green (Has ToC), drawn per
+        # device pixel ratio on first use; keyed by (has_toc, dpr)
+        self._dot_colors = {True: QColor("#28a745"), False: QColor("#dc3545")} # Bootstrap Green / Red
+        self._dot_cache: dict[tuple[bool, float], QPixmap] = {}
+
+        # Pre-rendered buttons keyed by (btn_id, hovered, width, height, device pixel ratio)
+        self._pix_cache: dict[tuple[int, int, int, int, float], QPixmap] = {}
+        # Hover repaints are collected and flushed once per event-loop turn
+        self._paint_pending: set[QPersistentModelIndex] = set()
+        self._paint_timer = QTimer(self)
+        self._paint_timer.setSingleShot(True)
+        self._paint_timer.setInterval(0)
+        self._paint_timer.timeout.connect(self._flush_pending_paints)
+
+        # Button sub-rects relative to the cell, keyed by cell (width, height)
+        self._geom_cache: dict[tuple[int, int], tuple[int, tuple[QRect, QRect, QRect]]] = {}
+        if parent is not None:
+            parent.installEventFilter(self)
+            if hasattr(parent, 'horizontalHeader'):
+                parent.horizontalHeader().sectionResized.connect(self._on_section_resized)
 
     def paint(self, painter, option, index):
-        if index.column() == 7: # Action Column
+        if index.column() == ACTIONS_COLUMN:
             rect = option.rect
-            width = rect.width()
-            height = rect.height()
+            dpr = self._device_pixel_ratio(option)
             
             # Button layout: 3 buttons
-            count = 3
-            btn_width = width // count
+            _, btn_rects = self._button_geometry(rect)
+            origin = rect.topLeft()
             
             # Get Data
-            user_data = index.data(Qt.ItemDataRole.UserRole)
-            has_toc = user_data.get('has_toc', False) if user_data else False
+            has_toc = bool(index.data(HAS_TOC_ROLE))
             
             is_hovering_cell = (self.hover_row == index.row())
 
             # --- Button 1: Open File ---
-            self._draw_btn(painter, rect, 0, btn_width, height, 
-                           self.icon_file, "Open File", 1, is_hovering_cell)
+            self._draw_btn(painter, btn_rects[0].translated(origin),
+                           self.icon_file, 1, is_hovering_cell, dpr)
 
             # --- Button 2: Open Folder ---
-            self._draw_btn(painter, rect, 1, btn_width, height, 
-                           self.icon_folder, "Open Folder", 2, is_hovering_cell)
+            self._draw_btn(painter, btn_rects[1].translated(origin),
+                           self.icon_folder, 2, is_hovering_cell, dpr)
             
             # --- Button 3: ToC Status ---
-            # Custom color logic
-            # Paint a colored background or colored icon frame
-            toc_rect = QRect(rect.left() + (2 * btn_width), rect.top(), btn_width, height)
-            toc_rect.adjust(2, 2, -2, -2)
-            
-            # Color indicator: Red (No ToC) / Green (Has ToC)
-            color = QColor("#28a745") if has_toc else QColor("#dc3545") # Bootstrap Green/Red
-            
-            # Draw standard button frame first
-            btn_opt = QStyleOptionButton()
-            btn_opt.rect = toc_rect
-            btn_opt.icon = self.icon_toc
-            btn_opt.iconSize = QSize(16, 16)
-            btn_opt.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
-            if is_hovering_cell and self.hover_button == 3:
-                btn_opt.state |= QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Active
+            # Standard button frame first, then a colored indicator on top
+            toc_rect = btn_rects[2].translated(origin)
+            self._draw_btn(painter, toc_rect, self.icon_toc, 3, is_hovering_cell, dpr)
             
-            QApplication.style().drawControl(QStyle.ControlElement.CE_PushButton, btn_opt, painter)
-            
-            # Overlay a colored indicator (small circle or stripe)
-            painter.save()
-            painter.setBrush(color)
-            painter.setPen(Qt.PenStyle.NoPen)
-            # Draw small dot bottom-right
-            dot_size = 6
-            painter.drawEllipse(toc_rect.right() - dot_size - 2, toc_rect.bottom() - dot_size - 2, dot_size, dot_size)
-            painter.restore()
+            # Overlay the colored indicator: small dot bottom-right
+            dot = self._dot(has_toc, dpr)
+            painter.drawPixmap(toc_rect.right() - self.DOT_SIZE - 2, toc_rect.bottom() - self.DOT_SIZE - 2, dot)
 
         else:
             super().paint(painter, option, index)
 
-    def _draw_btn(self, painter, cell_rect, index, w, h, icon, tooltip, btn_id, is_hovering_cell):
-        rect = QRect(cell_rect.left() + (index * w), cell_rect.top(), w, h)
-        rect.adjust(2, 2, -2, -2)
-        
-        opt = QStyleOptionButton()
-        opt.rect = rect
-        opt.icon = icon
-        opt.iconSize = QSize(16, 16)
-        opt.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
-        if is_hovering_cell and self.hover_button == btn_id:
-            opt.state |= QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Active
-        
-        QApplication.style().drawControl(QStyle.ControlElement.CE_PushButton, opt, painter)
+    def _dot(self, has_toc, dpr):
+        key = (has_toc, dpr)
+        dot = self._dot_cache.get(key)
+        if dot is None:
+            dot = self._dot_cache[key] = self._make_dot(self._dot_colors[has_toc], dpr)
+        return dot
+
+    def _make_dot(self, color, dpr=1.0):
+        # DOT_SIZE * dpr device pixels, painted in logical coordinates
+        side = round(self.DOT_SIZE * dpr)
+        pixmap = QPixmap(side, side)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        dot_painter = QPainter(pixmap)
+        dot_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        dot_painter.setBrush(color)
+        dot_painter.setPen(Qt.PenStyle.NoPen)
+        dot_painter.drawEllipse(0, 0, self.DOT_SIZE, self.DOT_SIZE)
+        dot_painter.end()
+        return pixmap
+
+    @staticmethod
+    def _device_pixel_ratio(option):
+        """Pixel ratio of the screen the view is on (1.0 without a widget)."""
+        widget = option.widget
+        return widget.devicePixelRatioF() if widget is not None else 1.0
+
+    def _draw_btn(self, painter, rect, icon, btn_id, is_hovering_cell, dpr=1.0):
+        hovered = is_hovering_cell and self.hover_button == btn_id
+        painter.drawPixmap(rect.topLeft(), self._button_pixmap(btn_id, icon, rect.size(), hovered, dpr))
+
+    def _button_geometry(self, cell_rect):
+        """
+        Return (btn_width, button rects) for a cell of this size.
+        Rects are relative to the cell's top-left corner.
+        """
+        key = (cell_rect.width(), cell_rect.height())
+        geom = self._geom_cache.get(key)
+        if geom is None:
+            btn_width = cell_rect.width() // 3
+            height = cell_rect.height()
+            rects = tuple(
+                QRect(i * btn_width, 0, btn_width, height).adjusted(2, 2, -2, -2)
+                for i in range(3)
+            )
+            geom = (btn_width, rects)
+            self._geom_cache[key] = geom
+        return geom
+
+    def _on_section_resized(self, logical_index, old_size, new_size):
+        if logical_index == ACTIONS_COLUMN:
+            self._geom_cache.clear()
+
+    def _button_pixmap(self, btn_id, icon, size, hovered, dpr=1.0):
+        """
+        Return the pre-rendered button for (btn_id, hover state, size, dpr).
+        The style is only asked to draw each variant once; paints blit the pixmap.
+        The pixmap holds size * dpr device pixels so it stays sharp on high-DPI
+        screens; the style still draws in logical coordinates.
+        """
+        key = (btn_id, int(hovered), size.width(), size.height(), dpr)
+        pixmap = self._pix_cache.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(size * dpr)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            
+            opt = QStyleOptionButton()
+            opt.rect = QRect(QPoint(0, 0), size)
+            opt.icon = icon
+            opt.iconSize = QSize(16, 16)
+            opt.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+            if hovered:
+                opt.state |= QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Active
+            
+            pix_painter = QPainter(pixmap)
+            self._style.drawControl(QStyle.ControlElement.CE_PushButton, opt, pix_painter)
+            pix_painter.end()
+            self._pix_cache[key] = pixmap
+        return pixmap
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent():
+            # Cached buttons were drawn with the old style/palette
+            if event.type() in (QEvent.Type.StyleChange, QEvent.Type.PaletteChange):
+                self._style = QApplication.style()
+                self._pix_cache.clear()
+            return False
+        return super().eventFilter(obj, event)
+
+    def _queue_update(self, index):
+        self._paint_pending.add(QPersistentModelIndex(index))
+        if not self._paint_timer.isActive():
+            self._paint_timer.start()
+
+    def _flush_pending_paints(self):
+        view = self.parent()
+        pending, self._paint_pending = self._paint_pending, set()
+        if not view:
+            return
+        for p_index in pending:
+            if p_index.isValid():
+                view.update(p_index.model().index(p_index.row(), p_index.column()))
 
     def editorEvent(self, event, model, option, index):
-        if index.column() == 7:
+        if index.column() == ACTIONS_COLUMN:
             rect = option.rect
-            width = rect.width()
-            btn_width = width // 3
+            btn_width, _ = self._button_geometry(rect)
             
             if event.type() == QEvent.Type.MouseMove:
                 click_x = event.pos().x()
@@ -108,21 +202,24 @@ class ActionDelegate(QStyledItemDelegate):
                 elif local_x < btn_width * 2: new_btn = 2
                 else: new_btn = 3
                 
-                if (self.hover_row != index.row()) or (self.hover_button != new_btn):
+                prev = (self.hover_row, self.hover_button)
+                if prev != (index.row(), new_btn):
                     self.hover_row = index.row()
                     self.hover_button = new_btn
                     
-                    # Force repaint
-                    view = self.parent()
-                    if view: view.update(index)
-                    # Clear prev row if changed (omitted for brevity, handled by Leave)
+                    # Repaint only the cells whose hover state changed
+                    self._queue_update(index)
+                    if prev[0] not in (-1, index.row()):
+                        self._queue_update(model.index(prev[0], ACTIONS_COLUMN))
                 return True
                 
             elif event.type() == QEvent.Type.Leave:
+                prev_row = self.hover_row
                 self.hover_row = -1
                 self.hover_button = 0
                 view = self.parent()
-                if view: view.viewport().update() # Redraw all simpler
+                if view and prev_row != -1:
+                    view.update(model.index(prev_row, ACTIONS_COLUMN))
                 return True
 
             elif event.type() == QEvent.Type.MouseButtonRelease:
@@ -143,11 +240,10 @@ class ActionDelegate(QStyledItemDelegate):
         """
         Handle tooltips for the action buttons.
         """
-        if index.column() == 7:
+        if index.column() == ACTIONS_COLUMN:
             if event.type() == QEvent.Type.ToolTip:
                 rect = option.rect
-                width = rect.width()
-                btn_width = width // 3
+                btn_width, _ = self._button_geometry(rect)
                 
                 # event.pos() in helpEvent is relative to the widget (view)
                 # But option.rect is also in view coordinates usually.
@@ -162,8 +258,7 @@ class ActionDelegate(QStyledItemDelegate):
                     tooltip = "Open Containing Folder"
                 else:
                     # Check ToC status
-                    user_data = index.data(Qt.ItemDataRole.UserRole)
-                    has_toc = user_data.get('has_toc', False) if user_data else False
+                    has_toc = bool(index.data(HAS_TOC_ROLE))
                     tooltip = "Open Reader (ToC Ready)" if has_toc else "Generate ToC (Reader)"
                 
                 if tooltip:
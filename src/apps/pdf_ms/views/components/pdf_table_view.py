@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView, QMenu, QInputDialog, QMessageBox, QLineEdit
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction, QColor
+from src.apps.pdf_ms.models.pdf_table_model import ACTIONS_COLUMN
 from src.apps.pdf_ms.views.components.action_delegate import ActionDelegate
+from src.apps.pdf_ms.views.components.static_text_delegate import StaticTextDelegate
 
 class PDFTableView(QTableView):
     """
@@ -44,6 +46,44 @@ class PDFTableView(QTableView):
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setStretchLastSection(False)
         self.verticalHeader().setVisible(False) # Hide row numbers for cleaner look
+
+        # Context Menu
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        
+        # Header Context Menu for Column Toggling
+        self.horizontalHeader().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.horizontalHeader().customContextMenuRequested.connect(self.show_header_menu)
+
+        # Action Delegate
+        self.action_delegate = ActionDelegate(self)
+        self.setItemDelegateForColumn(ACTIONS_COLUMN, self.action_delegate)
+        self.action_delegate.action_requested.connect(self.on_action_requested)
+
+        # Fav / ToC columns only show a handful of fixed strings
+        self.static_text_delegate = StaticTextDelegate(self)
+        self.setItemDelegateForColumn(4, self.static_text_delegate)
+        self.setItemDelegateForColumn(5, self.static_text_delegate)
+        
+        # Styling (CSS-like)
+        self.setStyleSheet("""
+            QTableView {
+                background-color: #ffffff;
+                selection-background-color: #0078d7;
+                selection-color: #ffffff;
+                gridline-color: #e0e0e0;
+            }
+            QTableView::item {
+                padding: 5px;
+            }
+            QHeaderView::section {
+                background-color: #f0f0f0;
+                padding: 5px;
+                border: none;
+                border-right: 1px solid #d0d0d0;
+                border-bottom: 1px solid #d0d0d0;
+            }
+        """)
         
     def setModel(self, model):
         """
@@ -57,8 +97,19 @@ class PDFTableView(QTableView):
         Configure column resize modes and widths.
         """
         header = self.horizontalHeader()
-        # 0: Filename, 1: Type, 2: Tags, 3: Category, 4: Fav, 5: Bookmarks, 6: Path, 7: Actions
+        # 0: Filename, 1: Type, 2: Tags, 3: Category, 4: Fav, 5: ToC, 6: Path, 7: Actions
         
+        # Apply all changes in one layout pass
+        self.setUpdatesEnabled(False)
+        header.blockSignals(True)
+        try:
+            self._apply_column_layout(header)
+        finally:
+            header.blockSignals(False)
+            self.setUpdatesEnabled(True)
+        self.updateGeometries()
+
+    def _apply_column_layout(self, header):
         # Default behavior
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         
@@ -78,7 +129,7 @@ class PDFTableView(QTableView):
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
         self.setColumnWidth(4, 40)
 
-        # Bookmarks: Fixed small
+        # ToC: Fixed small
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
         self.setColumnWidth(5, 80)
         
@@ -86,41 +137,8 @@ class PDFTableView(QTableView):
         self.setColumnWidth(6, 300) # Default width for path
         
         # Actions: Fixed larger for 3 buttons
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Fixed)
-        self.setColumnWidth(7, 120)
-        
-        # Context Menu
-        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.show_context_menu)
-        
-        # Header Context Menu for Column Toggling
-        self.horizontalHeader().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.horizontalHeader().customContextMenuRequested.connect(self.show_header_menu)
-
-        # Action Delegate
-        self.action_delegate = ActionDelegate(self)
-        self.setItemDelegateForColumn(7, self.action_delegate)
-        self.action_delegate.action_requested.connect(self.on_action_requested)
-        
-        # Styling (CSS-like)
-        self.setStyleSheet("""
-            QTableView {
-                background-color: #ffffff;
-                selection-background-color: #0078d7;
-                selection-color: #ffffff;
-                gridline-color: #e0e0e0;
-            }
-            QTableView::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #f0f0f0;
-                padding: 5px;
-                border: none;
-                border-right: 1px solid #d0d0d0;
-                border-bottom: 1px solid #d0d0d0;
-            }
-        """)
+        header.setSectionResizeMode(ACTIONS_COLUMN, QHeaderView.ResizeMode.Fixed)
+        self.setColumnWidth(ACTIONS_COLUMN, 120)
 
     def on_table_clicked(self, index):
         """Handle clicks on the table."""
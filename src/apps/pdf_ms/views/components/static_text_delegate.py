@@ -0,0 +1,41 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QApplication, QStyle, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QStaticText, QPalette
+
+class StaticTextDelegate(QStyledItemDelegate):
+    """
+    Delegate for columns that only ever show a few fixed strings (Fav, ToC).
+    Each string is laid out once as a QStaticText and reused on every paint.
+    """
+
+    SYMBOLS = ("★", "☆", "✓ Yes", "✗ No")
+    PADDING = 8 # QTableView::item padding (5px) + the style's text margin
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._static = {s: QStaticText(s) for s in self.SYMBOLS}
+
+    def paint(self, painter, option, index):
+        static = self._static.get(index.data())
+        if static is None:
+            super().paint(painter, option, index)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        
+        # Background, selection and focus without the text layout pass
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        role = QPalette.ColorRole.HighlightedText if opt.state & QStyle.StateFlag.State_Selected else QPalette.ColorRole.Text
+        rect = opt.rect
+        y = rect.top() + (rect.height() - static.size().height()) / 2
+
+        painter.save()
+        painter.setFont(opt.font)
+        painter.setPen(opt.palette.color(role))
+        painter.drawStaticText(QPointF(rect.left() + self.PADDING, y), static)
+        painter.restore()
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QSplitter, QFileDialog, QHeaderView, QToolBar, QLineEdit, QSizePolicy, QComboBox, QApplication, QStyle
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from src.apps.pdf_ms.views.components.pdf_table_view import PDFTableView
 
 class MainWindow(QMainWindow):
@@ -8,6 +8,11 @@ class MainWindow(QMainWindow):
     MVC View: The main application window.
     Composes other views (PDFListView, MetadataView).
     """
+    
+    # Emitted once typing pauses, instead of on every keystroke
+    search_committed = pyqtSignal(str)
+    SEARCH_DEBOUNCE_MS = 150
+    
     def __init__(self):
         super().__init__()
         # Title will be set by controller
@@ -65,6 +70,13 @@ class MainWindow(QMainWindow):
         self.search_input.setToolTip("Filter files by name, tags, or notes")
         self.search_input.setFixedWidth(200)
         self.toolbar.addWidget(self.search_input)
+        
+        # Debounce: each keystroke restarts the countdown, the filter runs once
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._commit_search)
+        self.search_input.textChanged.connect(self._search_timer.start)
 
         # Splitter for List | Details
         splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -89,6 +101,9 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(splitter)
 
+    def _commit_search(self):
+        self.search_committed.emit(self.search_input.text())
+
     def add_metadata_view(self, view_widget):
         self.metadata_layout.addWidget(view_widget)
 
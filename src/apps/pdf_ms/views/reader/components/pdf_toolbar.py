@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import QToolBar, QLabel, QWidget, QSizePolicy
-from PyQt6.QtGui import QAction, QIcon
+from PyQt6.QtGui import QAction, QActionGroup, QIcon
 from PyQt6.QtCore import pyqtSignal, Qt
 
 class PDFToolbar(QToolBar):
@@ -55,27 +55,15 @@ class PDFToolbar(QToolBar):
         
         self.addSeparator()
         
-        # View Modes
-        self.act_fit_width = QAction("Fit Width", self)
-        self.act_fit_width.setCheckable(True)
-        self.act_fit_width.triggered.connect(lambda: self._handle_mode_change(self.act_fit_width, self.fit_width_requested))
-        self.addAction(self.act_fit_width)
-
-        self.act_fit_content = QAction("Fit Content", self)
-        self.act_fit_content.setCheckable(True)
-        self.act_fit_content.setToolTip("Fit to visible content (ignore margins)")
-        self.act_fit_content.triggered.connect(lambda: self._handle_mode_change(self.act_fit_content, self.fit_content_requested))
-        self.addAction(self.act_fit_content)
+        # View Modes (exclusive group: Qt keeps exactly one checked)
+        self._fit_group = QActionGroup(self)
+        self._fit_group.setExclusive(True)
         
-        self.act_fit_height = QAction("Fit Height", self)
-        self.act_fit_height.setCheckable(True)
-        self.act_fit_height.triggered.connect(lambda: self._handle_mode_change(self.act_fit_height, self.fit_height_requested))
-        self.addAction(self.act_fit_height)
-
-        self.act_fit_page = QAction("Fit Page", self)
-        self.act_fit_page.setCheckable(True)
-        self.act_fit_page.triggered.connect(lambda: self._handle_mode_change(self.act_fit_page, self.fit_page_requested))
-        self.addAction(self.act_fit_page)
+        self.act_fit_width = self._add_fit_action("Fit Width", self.fit_width_requested)
+        self.act_fit_content = self._add_fit_action("Fit Content", self.fit_content_requested,
+                                                    "Fit to visible content (ignore margins)")
+        self.act_fit_height = self._add_fit_action("Fit Height", self.fit_height_requested)
+        self.act_fit_page = self._add_fit_action("Fit Page", self.fit_page_requested)
         
         self.addSeparator()
         
@@ -89,19 +77,29 @@ class PDFToolbar(QToolBar):
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         self.addWidget(spacer)
 
-    def _handle_mode_change(self, action, signal):
-        # Uncheck others
-        for act in [self.act_fit_width, self.act_fit_height, self.act_fit_page, self.act_fit_content]:
-            if act != action:
-                act.setChecked(False)
-        signal.emit()
+    def _add_fit_action(self, text, signal, tooltip=None):
+        action = QAction(text, self)
+        action.setCheckable(True)
+        if tooltip:
+            action.setToolTip(tooltip)
+        # toggled only fires on a state change, so re-clicking the active mode is a no-op
+        action.toggled.connect(lambda checked: checked and signal.emit())
+        self._fit_group.addAction(action)
+        self.addAction(action)
+        return action
 
     def update_page_info(self, current, total):
         self.lbl_page_info.setText(f" {current} / {total} ")
 
     def set_mode_checked(self, mode):
-        # Helper to set check state programmatically
-        self.act_fit_width.setChecked(mode == "width")
-        self.act_fit_height.setChecked(mode == "height")
-        self.act_fit_page.setChecked(mode == "page")
-        self.act_fit_content.setChecked(mode == "content")
+        # Helper to set check state programmatically (without re-emitting requests)
+        modes = {
+            "width": self.act_fit_width,
+            "height": self.act_fit_height,
+            "page": self.act_fit_page,
+            "content": self.act_fit_content,
+        }
+        for key, action in modes.items():
+            action.blockSignals(True)
+            action.setChecked(key == mode)
+            action.blockSignals(False)
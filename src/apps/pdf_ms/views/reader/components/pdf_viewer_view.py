@@ -1,7 +1,10 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel, QFrame
-from PyQt6.QtCore import Qt, pyqtSignal, QEvent
-from PyQt6.QtGui import QPixmap, QImage, QPainter, QColor
-from src.core.services.pdf_renderer import PDFRenderer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer, QThreadPool
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QColor, QTransform
+import fitz
+import numpy as np
+from src.core.services.fitz_lock import FITZ_LOCK
+from .render_worker import RenderWorker
 
 class PDFViewerPanel(QWidget):
     """
@@ -12,6 +15,15 @@ class PDFViewerPanel(QWidget):
     # Signals
     page_changed = pyqtSignal(int) # new_page
     
+    RENDER_DEBOUNCE_MS = 80
+    WHEEL_ZOOM_MS = 30
+    ZOOM_STEP = 1.2
+    _WHEEL = QEvent.Type.Wheel
+    _CTRL = Qt.KeyboardModifier.ControlModifier
+    RENDER_PRIORITY = 5
+    PREFETCH_PRIORITY = 0
+    PREFETCH_OFFSETS = (1, -1, 2) # reading direction first
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.file_path = None
@@ -20,34 +32,103 @@ class PDFViewerPanel(QWidget):
         self.zoom_level = 1.0
         self.view_mode = "custom" # "custom", "width", "height", "page", "content"
         
+        # Document kept open for the lifetime of the panel so fit-zoom
+        # math does not re-parse the file on every resize/page flip.
+        self._doc = None
+        self._page_sizes = self._no_page_sizes()
+        
+        # Rendering runs on the global thread pool; every request bumps the
+        # generation so results from superseded renders are discarded.
+        self._render_gen = 0
+        self._pending_y_target = None
+        
+        # Rendered pages live in the global QPixmapCache, keyed by
+        # file/page/zoom/DPR so other reader windows on the same PDF share them.
+        
+        # Bumped per document so prefetches for a previous file are dropped
+        self._doc_gen = 0
+        # Cache keys with a prefetch already queued, so quick page flips
+        # do not rasterize the same neighbour twice.
+        self._prefetching = set()
+        
+        # Zoom the currently shown pixmap was rasterized at; the view
+        # transform scales it to zoom_level until the re-render arrives.
+        self._shown_zoom = None
+        
         self._init_ui()
         
     def _init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True) # Important for Fit modes
-        self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Page is a pixmap item in a graphics scene: zoom previews are view
+        # transforms, only committed zooms re-rasterize.
+        self._scene = QGraphicsScene(self)
+        self._pix_item = QGraphicsPixmapItem()
+        self._pix_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        self._scene.addItem(self._pix_item)
+        
+        self.graphics_view = QGraphicsView(self._scene)
+        self.graphics_view.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.graphics_view.setBackgroundBrush(QColor("#505050")) # Dark gray background
+        
+        # Install event filter for Ctrl+Scroll Zoom (before the view scrolls)
+        self.graphics_view.viewport().installEventFilter(self)
         
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setStyleSheet("background-color: #505050;") # Dark gray background
+        layout.addWidget(self.graphics_view)
         
-        # Install event filter for Ctrl+Scroll Zoom
-        self.scroll_area.viewport().installEventFilter(self)
-        self.image_label.installEventFilter(self)
+        # Debounce re-renders triggered by resize drags and rapid zoom clicks:
+        # each request restarts the countdown so only the last one rasterizes.
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(self.RENDER_DEBOUNCE_MS)
+        self._render_timer.timeout.connect(self.render_page)
         
-        self.scroll_area.setWidget(self.image_label)
-        layout.addWidget(self.scroll_area)
+        # Ctrl+wheel ticks accumulate into one zoom factor applied per burst
+        self._pending_zoom_factor = 1.0
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self.WHEEL_ZOOM_MS)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
 
     def load_document(self, file_path):
         self.file_path = file_path
-        self.total_pages = PDFRenderer.get_page_count(file_path)
+        self._open_document(file_path)
+        self._doc_gen += 1
+        self._prefetching.clear()
+        self.total_pages = self._doc.page_count if self._doc is not None else 0
         self.current_page = 1
         self.render_page()
 
+    def _open_document(self, file_path):
+        """Open and cache the fitz.Document plus its page sizes (no rasterizing)."""
+        self.close_document()
+        try:
+            with FITZ_LOCK:
+                self._doc = fitz.open(file_path)
+                # (N, 2) float32 array of (width, height) in points
+                self._page_sizes = np.asarray(
+                    [(p.rect.width, p.rect.height) for p in self._doc], dtype=np.float32
+                ).reshape(-1, 2)
+        except Exception as e:
+            print(f"Error opening PDF: {e}")
+            self._doc = None
+            self._page_sizes = self._no_page_sizes()
+
+    def close_document(self):
+        if self._doc is not None:
+            with FITZ_LOCK:
+                self._doc.close()
+        self._doc = None
+        self._page_sizes = self._no_page_sizes()
+
+    @staticmethod
+    def _no_page_sizes():
+        return np.empty((0, 2), dtype=np.float32)
+
     def render_page(self, y_target=None):
+        # A direct render supersedes any pending debounced one.
+        self._render_timer.stop()
         if not self.file_path:
             return
 
@@ -55,37 +136,109 @@ class PDFViewerPanel(QWidget):
         if self.view_mode != "custom":
              self._calculate_fit_zoom()
 
-        # Render
-        img_bytes = PDFRenderer.render_page(self.file_path, self.current_page, self.zoom_level)
-        if img_bytes:
-            image = QImage.fromData(img_bytes)
-            pixmap = QPixmap.fromImage(image)
-            self.image_label.setPixmap(pixmap)
-            # Ensure label size matches pixmap if not resizable, but ScrollArea handles it
-            
-            if y_target is not None:
-                # Scroll to Y
-                # y_target is in PDF points. Convert to pixels.
-                scroll_y = int(y_target * self.zoom_level)
-                self.scroll_area.verticalScrollBar().setValue(scroll_y)
+        # Cache hit: swap the pixmap in without touching MuPDF
+        self._render_gen += 1
+        self._pending_y_target = y_target
+        dpr = self.devicePixelRatioF()
+        key = self._cache_key(self.current_page, self.zoom_level, dpr)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            self._show_pixmap(pixmap, self.zoom_level)
+            self.page_changed.emit(self.current_page)
+            self._prefetch_neighbours()
+            return
+
+        # Render off the UI thread
+        worker = RenderWorker(self.file_path, self.current_page, self.zoom_level, self._render_gen, dpr)
+        worker.signals.finished.connect(self._on_render_finished)
+        QThreadPool.globalInstance().start(worker, self.RENDER_PRIORITY)
         
         self.page_changed.emit(self.current_page)
 
+    def _on_render_finished(self, page, generation, zoom, dpr, raw):
+        if generation != self._render_gen:
+            return # Stale: a newer render was requested meanwhile
+        if raw:
+            pixmap = self._pixmap_from_raw(raw, dpr)
+            self._cache_pixmap(self._cache_key(page, zoom, dpr), pixmap)
+            self._show_pixmap(pixmap, zoom)
+        self._prefetch_neighbours()
+
+    def _prefetch_neighbours(self):
+        """Render the pages around the current one into the cache while the user reads."""
+        pool = QThreadPool.globalInstance()
+        dpr = self.devicePixelRatioF()
+        for offset in self.PREFETCH_OFFSETS:
+            page = self.current_page + offset
+            if not (1 <= page <= self.total_pages):
+                continue
+            key = self._cache_key(page, self.zoom_level, dpr)
+            if key in self._prefetching or QPixmapCache.find(key) is not None:
+                continue
+            self._prefetching.add(key)
+            worker = RenderWorker(self.file_path, page, self.zoom_level, self._doc_gen, dpr)
+            worker.signals.finished.connect(self._on_prefetch_finished)
+            pool.start(worker, self.PREFETCH_PRIORITY)
+
+    def _on_prefetch_finished(self, page, generation, zoom, dpr, raw):
+        key = self._cache_key(page, zoom, dpr)
+        self._prefetching.discard(key)
+        if generation != self._doc_gen or not raw:
+            return
+        self._cache_pixmap(key, self._pixmap_from_raw(raw, dpr))
+
+    @staticmethod
+    def _pixmap_from_raw(raw, dpr=1.0):
+        """
+        Wrap raw RGB888 samples in a QImage (no copy) and upload to a QPixmap.
+        The pixmap is tagged with dpr, so the scene lays it out at its
+        logical size (physical pixels / dpr).
+        """
+        samples, width, height, stride = raw
+        image = QImage(samples, width, height, stride, QImage.Format.Format_RGB888)
+        # fromImage copies the pixels, so `samples` only has to outlive this call
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    def _cache_key(self, page, zoom, dpr=None):
+        # DPR is part of the key: a window moved to another screen must not
+        # reuse pages rasterized for the old pixel density
+        if dpr is None:
+            dpr = self.devicePixelRatioF()
+        return f"{self.file_path}|{page}|{zoom:.3f}|{dpr:.2f}"
+
+    @staticmethod
+    def _cache_pixmap(key, pixmap):
+        QPixmapCache.insert(key, pixmap)
+
+    def _show_pixmap(self, pixmap, zoom):
+        self._pix_item.setPixmap(pixmap)
+        self._scene.setSceneRect(self._pix_item.boundingRect())
+        self._shown_zoom = zoom
+        self._preview_zoom(self.zoom_level)
+        
+        if self._pending_y_target is not None:
+            # Scroll to Y
+            # y_target is in PDF points. Convert to pixels.
+            scroll_y = int(self._pending_y_target * self.zoom_level)
+            self.graphics_view.verticalScrollBar().setValue(scroll_y)
+
+    def _preview_zoom(self, zoom):
+        """Scale the shown pixmap to `zoom` without re-rasterizing."""
+        if not self._shown_zoom:
+            return
+        scale = zoom / self._shown_zoom
+        self.graphics_view.setTransform(QTransform.fromScale(scale, scale))
+
     def _calculate_fit_zoom(self):
         """Calculate zoom level based on current viewport size and PDF page size."""
-        # We need page dimensions without rendering fully first? 
-        # fitz.open(path).load_page(n).rect gives size.
-        # This is expensive to open every time.
-        # Optimization: Store doc or dimensions. For now, open briefly.
-        import fitz
+        if not (1 <= self.current_page <= len(self._page_sizes)):
+            return
         try:
-            doc = fitz.open(self.file_path)
-            page = doc.load_page(self.current_page - 1)
-            rect = page.rect
-            
-            page_w, page_h = rect.width, rect.height
-            view_w = self.scroll_area.viewport().width() - 20 # Scrollbar buffer
-            view_h = self.scroll_area.viewport().height() - 20
+            page_w, page_h = self._page_sizes[self.current_page - 1].tolist()
+            view_w = self.graphics_view.viewport().width() - 20 # Scrollbar buffer
+            view_h = self.graphics_view.viewport().height() - 20
             
             if self.view_mode == "width":
                 self.zoom_level = view_w / page_w
@@ -99,7 +252,9 @@ class PDFViewerPanel(QWidget):
             elif self.view_mode == "content":
                 # Fit Content - Fit visible content width
                 try:
-                    blocks = page.get_text("blocks")
+                    with FITZ_LOCK:
+                        page = self._doc.load_page(self.current_page - 1)
+                        blocks = page.get_text("blocks")
                     if blocks:
                         min_x = min(b[0] for b in blocks)
                         max_x = max(b[2] for b in blocks)
@@ -113,8 +268,6 @@ class PDFViewerPanel(QWidget):
                         self.zoom_level = view_w / page_w
                 except:
                     self.zoom_level = view_w / page_w
-
-            doc.close()
                 
         except Exception as e:
             print(f"Error calculating zoom: {e}")
@@ -130,36 +283,59 @@ class PDFViewerPanel(QWidget):
     def prev_page(self):
         self.go_to_page(self.current_page - 1)
 
+    def schedule_render(self):
+        """Request a render on the next debounce tick, coalescing bursts."""
+        self._render_timer.start()
+
     def zoom_in(self):
         self.view_mode = "custom"
-        self.zoom_level *= 1.2
-        self.render_page()
+        self.zoom_level *= self.ZOOM_STEP
+        self._preview_zoom(self.zoom_level)
+        self.schedule_render()
 
     def zoom_out(self):
         self.view_mode = "custom"
-        self.zoom_level /= 1.2
-        self.render_page()
+        self.zoom_level /= self.ZOOM_STEP
+        self._preview_zoom(self.zoom_level)
+        self.schedule_render()
 
     def set_view_mode(self, mode):
         """Set fit mode: 'width', 'height', 'page', 'custom'"""
+        if mode == self.view_mode:
+            return
         self.view_mode = mode
         self.render_page()
 
+    def _apply_pending_zoom(self):
+        factor = self._pending_zoom_factor
+        self._pending_zoom_factor = 1.0
+        if factor == 1.0:
+            return
+        self.view_mode = "custom"
+        self.zoom_level *= factor
+        self.render_page()
+
     def eventFilter(self, source, event):
-        if event.type() == QEvent.Type.Wheel:
-            modifiers = event.modifiers()
-            if modifiers & Qt.KeyboardModifier.ControlModifier:
-                # Zoom
-                delta = event.angleDelta().y()
-                if delta > 0:
-                    self.zoom_in()
-                else:
-                    self.zoom_out()
-                return True
-        return super().eventFilter(source, event)
+        # Runs for every viewport event: bail out before any other lookup
+        if event.type() != self._WHEEL:
+            return False
+        if event.modifiers() & self._CTRL:
+            # Zoom
+            if event.angleDelta().y() > 0:
+                self._pending_zoom_factor *= self.ZOOM_STEP
+            else:
+                self._pending_zoom_factor /= self.ZOOM_STEP
+            self._preview_zoom(self.zoom_level * self._pending_zoom_factor)
+            self._zoom_timer.start()
+            return True
+        return False
 
     def resizeEvent(self, event):
         # Re-render if in a Fit mode
         if self.view_mode != "custom":
-            self.render_page()
+            self.schedule_render()
         super().resizeEvent(event)
+
+    def closeEvent(self, event):
+        self.close_document()
+        super().closeEvent(event)
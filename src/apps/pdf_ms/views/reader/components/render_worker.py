@@ -0,0 +1,31 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from src.core.services.pdf_renderer import PDFRenderer
+
+class RenderSignals(QObject):
+    """
+    Signal holder for RenderWorker (QRunnable is not a QObject).
+    """
+    finished = pyqtSignal(int, int, float, float, object) # page, generation, zoom, dpr, (samples, w, h, stride) or None
+
+class RenderWorker(QRunnable):
+    """
+    Rasterizes a single PDF page on a QThreadPool thread.
+    The generation number lets the receiver drop results that are already stale.
+    Returns raw RGB888 samples so the viewer builds a QImage without a PNG
+    round-trip; the document handle comes from the shared doc_cache.
+    zoom is in logical pixels; the page is rasterized at zoom * dpr so it
+    stays sharp on high-DPI screens.
+    """
+    
+    def __init__(self, file_path, page, zoom, generation, dpr=1.0):
+        super().__init__()
+        self.file_path = file_path
+        self.page = page
+        self.zoom = zoom
+        self.generation = generation
+        self.dpr = dpr
+        self.signals = RenderSignals()
+
+    def run(self):
+        raw = PDFRenderer.render_page_raw(self.file_path, self.page, self.zoom * self.dpr)
+        self.signals.finished.emit(self.page, self.generation, self.zoom, self.dpr, raw)
@@ -2,7 +2,8 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, 
     QTextEdit, QLabel, QPushButton, QMessageBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QCoreApplication
+from src.core.services._toc import build_toc_tree
 
 class ToCPanel(QWidget):
     """
@@ -18,6 +19,9 @@ class ToCPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.toc_data = []
+        # Tree items carry only an int id; the node dicts live here so edits
+        # go straight into toc_data without QVariant round-trips.
+        self._node_by_id = {}
         self.current_toc_item = None
         self._init_ui()
         
@@ -36,7 +40,9 @@ class ToCPanel(QWidget):
         self.note_editor = QTextEdit()
         self.note_editor.setPlaceholderText("Select a chapter to add notes...")
         self.note_editor.setToolTip("Write notes specific to the selected chapter")
-        self.note_editor.textChanged.connect(self._on_chapter_note_changed)
+        # Notes are written back on blur/hide, chapter switch and save,
+        # not on every keystroke.
+        self.note_editor.installEventFilter(self)
         layout.addWidget(self.note_editor, stretch=1)
         
         # Save Button
@@ -50,28 +56,100 @@ class ToCPanel(QWidget):
         Load ToC data structure into the tree.
         toc_data: List of dicts with keys: title, page, children, user_note
         """
+        self._reset(toc_data)
+        self._insert_items(*self._build_items(self.toc_data))
+
+    def load_toc_stream(self, nodes, batch_size=100):
+        """
+        Load top-level ToC nodes from an iterable (e.g. a streaming JSON
+        parser), inserting every `batch_size` nodes and letting the UI
+        repaint in between so the first entries show up immediately.
+        """
+        self._reset([])
+        batch = []
+        for node in nodes:
+            self.toc_data.append(node)
+            batch.append(node)
+            if len(batch) >= batch_size:
+                self._insert_items(*self._build_items(batch))
+                batch = []
+                QCoreApplication.processEvents()
+        if batch:
+            self._insert_items(*self._build_items(batch))
+
+    def _build_items(self, nodes):
+        """Build detached items for `nodes` iteratively; returns (roots, branches)."""
+        roots = []
+        branches = [] # (item, child_items)
+        stack = [(roots, node) for node in reversed(nodes)]
+        while stack:
+            siblings, data = stack.pop()
+            item = self._make_item(data)
+            siblings.append(item)
+            
+            children = data.get('children', [])
+            if children:
+                child_items = []
+                branches.append((item, child_items))
+                stack.extend((child_items, child) for child in reversed(children))
+        return roots, branches
+
+    def load_flat_toc(self, entries: list):
+        """
+        Load a pre-flattened ToC: rows of [depth, title, page, dest_y, user_note]
+        in document order (depth is 1-based). Rebuilds the nested toc_data with
+        the shared build_toc_tree, then the tree items from it.
+        """
+        toc_data = build_toc_tree(
+            (depth, {
+                "title": title,
+                "page": page,
+                "dest_y": dest_y,
+                "children": [],
+                "user_note": user_note,
+            })
+            for depth, title, page, dest_y, user_note in entries
+        )
+        self._reset(toc_data)
+        self._insert_items(*self._build_items(toc_data))
+
+    def _reset(self, toc_data):
         self.toc_data = toc_data # Keep reference
+        self._node_by_id = {}
         self.toc_tree.clear()
         self.note_editor.clear()
         self.current_toc_item = None
-        
-        def add_node(parent_menu, data):
-            item = QTreeWidgetItem(parent_menu)
-            item.setText(0, data.get('title', 'Untitled'))
-            # Store reference to the mutable dict in the item
-            item.setData(0, Qt.ItemDataRole.UserRole, data)
-            
-            for child in data.get('children', []):
-                add_node(item, child)
-                
-        for node in self.toc_data:
-            add_node(self.toc_tree, node)
-            
-        self.toc_tree.expandAll()
+
+    def _make_item(self, data):
+        item = QTreeWidgetItem([data.get('title', 'Untitled')])
+        node_id = len(self._node_by_id)
+        self._node_by_id[node_id] = data
+        item.setData(0, Qt.ItemDataRole.UserRole, node_id)
+        return item
+
+    def _insert_items(self, roots, branches):
+        # Insert with the list APIs while updates/signals are off so the tree lays out once
+        self.toc_tree.setUpdatesEnabled(False)
+        self.toc_tree.blockSignals(True)
+        try:
+            for item, child_items in branches:
+                item.addChildren(child_items)
+            self.toc_tree.addTopLevelItems(roots)
+            # Expansion only sticks once items belong to the tree
+            for item, _ in branches:
+                item.setExpanded(True)
+        finally:
+            self.toc_tree.blockSignals(False)
+            self.toc_tree.setUpdatesEnabled(True)
+
+    def _node_for(self, item):
+        """Return the ToC node dict backing a tree item."""
+        return self._node_by_id.get(item.data(0, Qt.ItemDataRole.UserRole))
 
     def _on_toc_clicked(self, item, column):
+        self._flush_chapter_note()
         self.current_toc_item = item
-        data = item.data(0, Qt.ItemDataRole.UserRole)
+        data = self._node_for(item)
         
         if data:
             # 1. Navigate
@@ -81,20 +159,24 @@ class ToCPanel(QWidget):
             self.toc_navigation_requested.emit(page, y_offset)
             
             # 2. Load Note
-            self.note_editor.blockSignals(True)
-            self.note_editor.setText(data.get('user_note', ''))
-            self.note_editor.blockSignals(False)
+            self.note_editor.setPlainText(data.get('user_note', ''))
+
+    def eventFilter(self, obj, event):
+        if obj is self.note_editor and event.type() in (QEvent.Type.FocusOut, QEvent.Type.Hide):
+            self._flush_chapter_note()
+        return super().eventFilter(obj, event)
 
-    def _on_chapter_note_changed(self):
-        if self.current_toc_item:
-            data = self.current_toc_item.data(0, Qt.ItemDataRole.UserRole)
-            if data:
+    def _flush_chapter_note(self):
+        """Write the editor text back into the current chapter's data dict."""
+        if self.current_toc_item and self.note_editor.document().isModified():
+            data = self._node_for(self.current_toc_item)
+            if data is not None:
                 # Update the in-memory data structure
                 data['user_note'] = self.note_editor.toPlainText()
-                # Re-set data just in case, though dict is mutable and passed by ref
-                self.current_toc_item.setData(0, Qt.ItemDataRole.UserRole, data)
+            self.note_editor.document().setModified(False)
 
     def _on_save_clicked(self):
+        self._flush_chapter_note()
         if self.toc_data:
             self.save_toc_requested.emit(self.toc_data)
         else:
@@ -0,0 +1,22 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from src.core.services.pdf_engine import PDFEngine
+
+class TocSignals(QObject):
+    """
+    Signal holder for TocWorker (QRunnable is not a QObject).
+    """
+    finished = pyqtSignal(object) # nested toc_data list
+
+class TocWorker(QRunnable):
+    """
+    Extracts a PDF's outline on a QThreadPool thread, so opening a large
+    document with no saved bookmarks does not block the reader window.
+    """
+    
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = TocSignals()
+
+    def run(self):
+        self.signals.finished.emit(PDFEngine.extract_toc(self.file_path))
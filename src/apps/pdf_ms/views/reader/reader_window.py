@@ -1,15 +1,16 @@
+import hashlib
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QMessageBox,
     QDockWidget
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QKeyEvent
-import json
+from src.core.services import json_codec, doc_cache
 
-from src.core.services.pdf_engine import PDFEngine
 from src.apps.pdf_ms.views.reader.components import (
     PDFToolbar, PDFViewerPanel, ToCPanel, MetadataPanel
 )
+from src.apps.pdf_ms.views.reader.components.toc_worker import TocWorker
 
 class ReaderWindow(QMainWindow):
     """
@@ -17,10 +18,15 @@ class ReaderWindow(QMainWindow):
     Orchestrates ToC, Viewer, and Metadata panels using Dock Widgets.
     """
     
+    # Bookmarks JSON larger than this (chars) is streamed into the ToC panel
+    STREAM_TOC_THRESHOLD = 64 * 1024
+    
     def __init__(self, file_path, core_app, parent=None):
         super().__init__(parent)
         self.file_path = file_path
         self.core_app = core_app
+        self._meta = None # DB metadata, fetched once per window
+        self._toc_digest = None # Digest of the bookmarks JSON last read from / written to the DB
         
         self.setWindowTitle(f"Reader: {file_path}")
         self.resize(1200, 800)
@@ -41,18 +47,22 @@ class ReaderWindow(QMainWindow):
         self.toolbar.setFloatable(True)
         self.addToolBar(Qt.ToolBarArea.TopToolBarArea, self.toolbar)
         
-        # 3. Left Panel (ToC)
+        # 3. Left Panel (ToC) and 4. Right Panel (Metadata)
+        # Docks start with placeholders; the real panels (and their data) are
+        # built the first time a dock becomes visible or the panel is accessed.
+        self._toc_panel = None
+        self._metadata_panel = None
+        
         self.dock_toc = QDockWidget("Table of Contents", self)
-        self.toc_panel = ToCPanel()
-        self.dock_toc.setWidget(self.toc_panel)
+        self.dock_toc.setWidget(QWidget())
         self.dock_toc.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
+        self.dock_toc.visibilityChanged.connect(self._on_toc_dock_visibility)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.dock_toc)
         
-        # 4. Right Panel (Metadata)
         self.dock_meta = QDockWidget("Metadata", self)
-        self.metadata_panel = MetadataPanel()
-        self.dock_meta.setWidget(self.metadata_panel)
+        self.dock_meta.setWidget(QWidget())
         self.dock_meta.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
+        self.dock_meta.visibilityChanged.connect(self._on_meta_dock_visibility)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock_meta)
         
         # 5. Add Toggle Actions to Toolbar
@@ -83,50 +93,108 @@ class ReaderWindow(QMainWindow):
         self.toolbar.fit_content_requested.connect(lambda: self.viewer.set_view_mode("content"))
         self.toolbar.full_mode_requested.connect(self._toggle_full_screen)
         
-        # Viewer -> Toolbar
-        self.viewer.page_changed.connect(self._on_page_changed)
-        
-        # ToC -> Viewer
-        self.toc_panel.toc_navigation_requested.connect(self._on_toc_navigation)
+        # Viewer -> Toolbar (queued: the label relayout runs after the render path returns)
+        self.viewer.page_changed.connect(self._on_page_changed, Qt.ConnectionType.QueuedConnection)
         
-        # ToC -> App (Save)
-        self.toc_panel.save_toc_requested.connect(self._save_toc_to_db)
-        
-        # Metadata -> App (Save)
-        self.metadata_panel.save_requested.connect(self._save_file_metadata)
-
     def _load_data(self):
         # Load PDF in Viewer
         self.viewer.load_document(self.file_path)
         # Update initial toolbar state
         self.toolbar.update_page_info(self.viewer.current_page, self.viewer.total_pages)
-        
-        # Load ToC
-        self._load_toc()
-        
-        # Load Metadata
-        self._load_metadata()
+        # ToC and Metadata are loaded when their panels are first created
+
+    @property
+    def toc_panel(self):
+        if self._toc_panel is None:
+            panel = ToCPanel()
+            self._swap_dock_widget(self.dock_toc, panel)
+            self._toc_panel = panel
+            # ToC -> Viewer
+            panel.toc_navigation_requested.connect(self._on_toc_navigation)
+            # ToC -> App (Save)
+            panel.save_toc_requested.connect(self._save_toc_to_db)
+            self._load_toc()
+        return self._toc_panel
+
+    @property
+    def metadata_panel(self):
+        if self._metadata_panel is None:
+            panel = MetadataPanel()
+            self._swap_dock_widget(self.dock_meta, panel)
+            self._metadata_panel = panel
+            # Metadata -> App (Save)
+            panel.save_requested.connect(self._save_file_metadata)
+            self._load_metadata()
+        return self._metadata_panel
+
+    @staticmethod
+    def _swap_dock_widget(dock, widget):
+        placeholder = dock.widget()
+        dock.setWidget(widget)
+        if placeholder is not None:
+            placeholder.deleteLater()
+
+    def _on_toc_dock_visibility(self, visible):
+        if visible:
+            self.toc_panel
+
+    def _on_meta_dock_visibility(self, visible):
+        if visible:
+            self.metadata_panel
+
+    def _get_meta(self):
+        """Fetch the file's DB metadata once and share it between panels."""
+        if self._meta is None:
+            self._meta = self.core_app.pdf_manager.get_metadata(self.file_path)
+        return self._meta
 
     def _load_toc(self):
         # 1. Try Load from DB
-        db_meta = self.core_app.pdf_manager.get_metadata(self.file_path)
+        db_meta = self._get_meta()
+        if db_meta.get('bookmarks'):
+            self._toc_digest = self._stored_digest(db_meta['bookmarks'])
+        
+        # Pre-flattened rows build the tree in one linear pass
+        bookmarks_flat = db_meta.get('bookmarks_flat', '')
+        if bookmarks_flat:
+            try:
+                self.toc_panel.load_flat_toc(json_codec.loads(bookmarks_flat))
+                return
+            except Exception:
+                pass
+        
         bookmarks_json = db_meta.get('bookmarks', '')
         
+        # Very large ToCs are parsed and shown incrementally
+        if len(bookmarks_json) > self.STREAM_TOC_THRESHOLD:
+            try:
+                self.toc_panel.load_toc_stream(json_codec.iter_items(bookmarks_json))
+                if self.toc_panel.toc_data:
+                    return
+            except Exception:
+                pass
+        
         toc_data = []
         if bookmarks_json:
             try:
-                toc_data = json.loads(bookmarks_json)
+                toc_data = json_codec.loads(bookmarks_json)
             except:
                 toc_data = []
         
-        # 2. If DB empty, Extract
+        # 2. If DB empty, Extract (opens the PDF, so off the UI thread)
         if not toc_data:
-            toc_data = PDFEngine.extract_toc(self.file_path)
+            worker = TocWorker(self.file_path)
+            worker.signals.finished.connect(self._on_toc_extracted)
+            QThreadPool.globalInstance().start(worker)
+            return
             
         self.toc_panel.load_toc(toc_data)
 
+    def _on_toc_extracted(self, toc_data):
+        self.toc_panel.load_toc(toc_data)
+
     def _load_metadata(self):
-        meta = self.core_app.pdf_manager.get_metadata(self.file_path)
+        meta = self._get_meta()
         self.metadata_panel.set_data(self.file_path, meta.get('tags', ''), meta.get('notes', ''))
 
     def _on_page_changed(self, page):
@@ -142,10 +210,29 @@ class ReaderWindow(QMainWindow):
             
         self.viewer.go_to_page(page, y_offset)
 
+    @staticmethod
+    def _digest(toc_json):
+        return hashlib.blake2b(toc_json.encode("utf-8"), digest_size=16).digest()
+
+    @classmethod
+    def _stored_digest(cls, toc_json):
+        """
+        Digest of a stored ToC as the save path would serialize it: rows written
+        with other JSON spacing (e.g. stdlib json.dumps) still match when unchanged.
+        """
+        try:
+            return cls._digest(json_codec.dumps(json_codec.loads(toc_json)))
+        except Exception:
+            return None
+
     def _save_toc_to_db(self, toc_data):
         try:
-            toc_json = json.dumps(toc_data)
-            self.core_app.update_file_custom(self.file_path, bookmarks=toc_json)
+            toc_json = json_codec.dumps(toc_data)
+            digest = self._digest(toc_json)
+            # Navigation-only sessions leave the ToC as loaded: skip the DB write
+            if digest != self._toc_digest:
+                self.core_app.update_file_custom(self.file_path, bookmarks=toc_json)
+                self._toc_digest = digest
             QMessageBox.information(self, "Success", "Chapter Notes Saved!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save ToC: {str(e)}")
@@ -165,6 +252,12 @@ class ReaderWindow(QMainWindow):
             self.showFullScreen()
             self.toolbar.act_full_mode.setChecked(True)
 
+    def closeEvent(self, event):
+        # Child widgets do not receive closeEvent, release the cached document here.
+        self.viewer.close_document()
+        doc_cache.close(self.file_path)
+        super().closeEvent(event)
+
     def keyPressEvent(self, event: QKeyEvent):
         """Handle ESC key to exit full screen."""
         if event.key() == Qt.Key.Key_Escape and self.isFullScreen():
@@ -1,12 +1,24 @@
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from .settings import Settings
 from .organizer import FileOrganizer
 from .storage import Storage
 from .pdf_manager import PDFManager
 from .services.bookmark_service import BookmarkService
 from .services.pdf_engine import PDFEngine
+from .services.pdf_renderer import PDFRenderer
 from pathlib import Path
 
+def _stat_key(file_path):
+    """(mtime_ns, size) identifying a file version, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 class CoreApp:
     def __init__(self, config_path="config/settings.json"):
         self.settings = Settings(config_path)
@@ -17,6 +29,11 @@ class CoreApp:
         self.current_plan = None
         self._observers = []
 
+    def close(self):
+        """Release the database connection and open PDF handles (call once on shutdown)."""
+        self.storage.close()
+        PDFRenderer.close_all()
+
     def add_observer(self, observer_callback):
         """
         Add a callback function to receive progress updates.
@@ -24,48 +41,109 @@ class CoreApp:
         """
         self._observers.append(observer_callback)
 
+    def remove_observer(self, observer_callback):
+        if observer_callback in self._observers:
+            self._observers.remove(observer_callback)
+
     def _notify(self, current, total, message):
         for callback in self._observers:
             callback(current, total, message)
 
     def scan(self, directory_path: str, recursive=False):
+        """Build the plan for directory_path and make it the current plan."""
+        self.current_plan = self.build_plan(directory_path, recursive=recursive, notify=self._notify)
+        return self.current_plan
+
+    def build_plan(self, directory_path: str, recursive=False, notify=None):
+        """
+        Scan directory_path into an enriched PDF plan without touching
+        current_plan or the observer list, so it is safe to run on a worker
+        thread; the caller decides whether the result becomes current.
+        notify(current, total, message) receives progress, if given.
+        """
+        notify = notify or (lambda current, total, message: None)
         path = Path(directory_path).resolve()
-        self.current_plan = self.organizer.scan_directory(path, recursive=recursive)
+        plan = self.organizer.scan_directory(path, recursive=recursive)
         
         # Filter for PDF files only
-        if self.current_plan is not None and not self.current_plan.empty:
+        if plan is not None and not plan.empty:
             # Ensure case-insensitive matching
-            self.current_plan = self.current_plan[
-                self.current_plan['extension'].str.lower() == '.pdf'
-            ].copy()
+            plan = plan[plan['extension'].str.lower() == '.pdf'].copy()
 
         # Enrich with PDF metadata if available
-        if self.current_plan is not None and not self.current_plan.empty:
-            def get_meta(row):
-                # Assuming 'target_path' or 'original_path' is the key. 
-                # If we are just scanning, it's 'original_path'.
-                # However, organizer returns 'original_path' column.
-                fpath = str(row['original_path'])
-                
-                # Double-check if it's a PDF (ignore .url, .exe, etc. if they slipped through)
-                if not fpath.lower().endswith('.pdf'):
-                    return pd.Series(['', '', False, False])
-
-                meta = self.pdf_manager.get_metadata(fpath)
-                
-                # Check DB for extracted ToC
-                has_toc = bool(meta.get('bookmarks'))
-                
-                # If not in DB, check file physically (Real-time verification)
-                if not has_toc:
-                     has_toc = PDFEngine.has_toc(fpath)
-
-                is_bookmarked = meta.get('is_bookmarked', False)
-                return pd.Series([meta['tags'], meta['notes'], has_toc, is_bookmarked])
-
-            self.current_plan[['tags', 'notes', 'has_toc', 'is_bookmarked']] = self.current_plan.apply(get_meta, axis=1)
-
-        return self.current_plan
+        if plan is not None and not plan.empty:
+            paths = plan['original_path'].astype(str)
+            total = len(paths)
+            notify(0, total, "Reading metadata...")
+            
+            # One batched DB fetch instead of a query per row
+            meta = self.pdf_manager.get_metadata_bulk(paths.tolist()).reindex(paths)
+            
+            # Check DB for extracted ToC (a stored-bookmarks flag, not the JSON)
+            has_toc = meta['has_bookmarks'].fillna(False).astype(bool).to_numpy(copy=True)
+            
+            # If not in DB, check file physically (Real-time verification)
+            pending = np.flatnonzero(~has_toc)
+            if len(pending):
+                notify(total - len(pending), total, "Checking ToC...")
+                has_toc[pending] = self._check_toc_files(
+                    paths.iloc[pending].tolist(), self._plan_stats(plan, pending)
+                )
+            
+            plan['tags'] = meta['tags'].fillna('').to_numpy()
+            plan['notes'] = meta['notes'].fillna('').to_numpy()
+            plan['has_toc'] = has_toc
+            plan['is_bookmarked'] = meta['is_bookmarked'].fillna(False).astype(bool).to_numpy()
+            notify(total, total, "Scan complete")
+
+        return plan
+
+    @staticmethod
+    def _plan_stats(plan, rows):
+        """(mtime_ns, size) collected by the directory scan for the given row positions, or None."""
+        if 'mtime_ns' not in plan.columns or 'size' not in plan.columns:
+            return None
+        mtimes = plan['mtime_ns'].iloc[rows]
+        sizes = plan['size'].iloc[rows]
+        return [
+            (int(m), int(sz)) if pd.notna(m) and pd.notna(sz) else None
+            for m, sz in zip(mtimes, sizes)
+        ]
+
+    def _check_toc_files(self, paths, stats=None):
+        """
+        PDFEngine.has_toc for each path, skipping the PDF open for files whose
+        (mtime_ns, size) match the persisted toc_cache. `stats` may carry the
+        (mtime_ns, size) already gathered during the scan.
+        """
+        if stats is None:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                stats = list(executor.map(_stat_key, paths))
+        
+        cache = self.storage.get_toc_cache_bulk(paths)
+        cached = dict(zip(cache.index, zip(cache['mtime_ns'], cache['size'], cache['has_toc'])))
+        
+        results = [False] * len(paths)
+        misses = []
+        for i, (fpath, stat) in enumerate(zip(paths, stats)):
+            if stat is None:
+                continue # Missing/unreadable file: has_toc would be False anyway
+            hit = cached.get(fpath)
+            if hit is not None and (hit[0], hit[1]) == stat:
+                results[i] = bool(hit[2])
+            else:
+                misses.append(i)
+        
+        if misses:
+            # One file at a time: fitz is not thread-safe, and the cache above
+            # already limits the opens to new or modified files
+            computed = [PDFEngine.has_toc_cached(paths[i], *stats[i]) for i in misses]
+            for i, value in zip(misses, computed):
+                results[i] = value
+            self.storage.save_toc_cache(
+                (paths[i], stats[i][0], stats[i][1], value) for i, value in zip(misses, computed)
+            )
+        return results
 
     def execute_plan(self, dry_run=False):
         if self.current_plan is None or self.current_plan.empty:
@@ -91,8 +169,8 @@ class CoreApp:
     def save_root_history(self, path):
         self.storage.save_root_history(path)
 
-    def get_root_history(self):
-        return self.storage.get_root_history()
+    def get_root_history(self, limit=None):
+        return self.storage.get_root_history(limit)
 
     def update_file_metadata(self, file_path, tags, notes):
         # We preserve existing bookmarks if possible.
@@ -102,6 +180,10 @@ class CoreApp:
     def update_file_custom(self, file_path, **kwargs):
         self.pdf_manager.update_custom(file_path, **kwargs)
 
+    def update_files_custom_bulk(self, rows):
+        """Partial update of many files: rows are dicts with 'file_path' and fields to set."""
+        self.pdf_manager.update_custom_many(rows)
+
     def refresh_toc_status(self, file_path):
         """Returns True if file has bookmarks in DB, else False."""
         meta = self.pdf_manager.get_metadata(file_path)
@@ -110,3 +192,7 @@ class CoreApp:
     def toggle_bookmark(self, file_path):
         """Toggle user bookmark (favorite) status."""
         return self.bookmark_service.toggle_bookmark(file_path)
+
+    def set_bookmarks(self, file_paths, is_bookmarked):
+        """Bookmark (or un-bookmark) many files in one batch."""
+        self.bookmark_service.set_bookmarks(file_paths, is_bookmarked)
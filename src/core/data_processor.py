@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 
 class DataProcessor:
@@ -8,7 +9,9 @@ class DataProcessor:
     """
 
     def __init__(self):
-        pass
+        # original_path -> row position, for the DataFrame it was built from
+        self._path_to_row = {}
+        self._indexed_df = None
 
     def process_scan_results(self, df: pd.DataFrame, root_path: str = None) -> pd.DataFrame:
         """
@@ -18,6 +21,10 @@ class DataProcessor:
         3. Extract File Type and Filename without extension
         4. Add 'Actions' placeholder column
         """
+        # A new plan invalidates the path index
+        self._indexed_df = None
+        self._path_to_row = {}
+
         if df is None or df.empty:
             return pd.DataFrame()
 
@@ -30,16 +37,18 @@ class DataProcessor:
 
         # 2. Calculate Relative Paths
         if root_path and 'original_path' in df.columns:
-             df['relative_path'] = df['original_path'].apply(
-                 lambda x: os.path.relpath(x, start=root_path) if os.path.exists(root_path) else x
-             )
+            if os.path.exists(root_path):
+                df['relative_path'] = self._relative_paths(df['original_path'], root_path)
+            else:
+                df['relative_path'] = df['original_path']
 
         # 3. Extract File Type and Filename without extension
         if 'filename' in df.columns:
-            df['filename_no_ext'] = df['filename'].apply(os.path.splitext).str[0]
+            # Rows are PDFs here, so the last dot always starts the extension
+            df['filename_no_ext'] = df['filename'].str.rsplit('.', n=1).str[0]
         
         if 'extension' in df.columns:
-            df['file_type'] = df['extension'].str.replace('.', '', regex=False).str.upper() + " File"
+            df['file_type'] = df['extension'].str.lstrip('.').str.upper() + " File"
 
         # 4. Add Placeholder for Actions (can be used by View delegates)
         # We don't necessarily need data here, but it ensures the column exists if we want to bind it
@@ -47,12 +56,48 @@ class DataProcessor:
 
         return df
 
+    @staticmethod
+    def _relative_paths(paths: pd.Series, root_path: str) -> pd.Series:
+        """
+        Vectorized os.path.relpath: strip the root prefix in one pass and
+        only fall back to relpath for rows that are not directly under it.
+        """
+        paths = paths.astype(str)
+        prefix = os.path.join(os.path.abspath(root_path), '')
+        under_root = paths.str.startswith(prefix)
+        relative = paths.str.slice(len(prefix))
+        if not under_root.all():
+            relative[~under_root] = [
+                os.path.relpath(p, start=root_path) for p in paths[~under_root]
+            ]
+        return relative
+
+    def _rebuild_index(self, df: pd.DataFrame):
+        self._path_to_row = dict(zip(df['original_path'].to_numpy(), np.arange(len(df))))
+        self._indexed_df = df
+
+    def _row_of(self, df: pd.DataFrame, file_path: str):
+        """Row position of file_path in df via a dict lookup instead of a full column compare."""
+        if self._indexed_df is not df:
+            self._rebuild_index(df)
+        i = self._path_to_row.get(file_path)
+        if i is not None and (i >= len(df) or df['original_path'].iat[i] != file_path):
+            # df was modified in place since the index was built
+            self._rebuild_index(df)
+            i = self._path_to_row.get(file_path)
+        return i
+
     def update_metadata(self, df: pd.DataFrame, file_path: str, tags: str, notes: str) -> pd.DataFrame:
         """
         Update metadata in the dataframe.
         """
-        if df is not None:
-            mask = df['original_path'] == file_path
-            df.loc[mask, 'tags'] = tags
-            df.loc[mask, 'notes'] = notes
+        if df is None or 'original_path' not in df.columns:
+            return df
+        i = self._row_of(df, file_path)
+        if i is None:
+            return df
+        for column, value in (('tags', tags), ('notes', notes)):
+            if column not in df.columns:
+                df[column] = ''
+            df.iat[i, df.columns.get_loc(column)] = value
         return df
@@ -1,20 +1,32 @@
+import os
 import shutil
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from .settings import Settings
 
 class FileOrganizer:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.categories = settings.file_categories
-        self.default_category = settings.default_category
+        self._settings_version = None
+        self._refresh_categories()
 
-    def _get_category(self, extension):
-        ext = extension.lower()
+    def _refresh_categories(self):
+        """Rebuild the flat ext -> category lookup if the settings changed since the last build."""
+        if self._settings_version == self.settings.version:
+            return
+        self.categories = self.settings.file_categories or {}
+        self.default_category = self.settings.default_category
+        # The first category listing an extension wins
+        self._ext_to_cat = {}
         for category, extensions in self.categories.items():
-            if ext in extensions:
-                return category
-        return self.default_category
+            for ext in extensions:
+                self._ext_to_cat.setdefault(ext.lower(), category)
+        self._settings_version = self.settings.version
+
+    def _get_category(self, extension):
+        self._refresh_categories()
+        return self._ext_to_cat.get(extension.lower(), self.default_category)
 
     def scan_directory(self, path, recursive=False):
         """
@@ -24,56 +36,154 @@ class FileOrganizer:
         if not path_obj.exists():
             return pd.DataFrame()
 
-        files_data = []
-        
-        # Choose iterator based on recursion
-        iterator = path_obj.rglob('*') if recursive else path_obj.iterdir()
+        self._refresh_categories()
+        root = str(path_obj)
+        ignore_files = self.settings.ignore_files # frozenset
+        paths = []
+        names = []
+        mtimes = []
+        sizes = []
         
-        for item in iterator:
-            if item.is_dir():
+        for entry in self._iter_files(root, recursive):
+            # Check ignore list (before any stat)
+            if entry.name in ignore_files:
                 continue
-            
-            # Check ignore list
-            if item.name in self.settings.ignore_files:
+            paths.append(entry.path)
+            names.append(entry.name)
+            # DirEntry caches stat results, so later steps need not re-stat the file
+            try:
+                st = entry.stat()
+                mtimes.append(st.st_mtime_ns)
+                sizes.append(st.st_size)
+            except OSError:
+                mtimes.append(None)
+                sizes.append(None)
+        
+        if not paths:
+            return pd.DataFrame()
+        
+        # Build the plan column-wise instead of one dict per file
+        df = pd.DataFrame({'original_path': paths, 'filename': names})
+        # Same as os.path.splitext: a leading dot (".bashrc") is not an extension
+        df['extension'] = df['filename'].str.extract(r'(?s)^\.*[^.].*(\.[^.]*)$', expand=False).fillna('')
+        category = df['extension'].str.lower().map(self._ext_to_cat).fillna(self.default_category)
+        # For recursive scan, we might want to preserve structure or flatten.
+        # Current logic flattens into category folders in the root.
+        # This is fine for the "Organizer" logic.
+        df['category'] = category.astype('category')
+        df['target_dir'] = os.path.join(root, '') + category
+        df['target_path'] = df['target_dir'] + os.sep + df['filename']
+        # Plain strings: status later takes free-form values (e.g. error messages)
+        df['status'] = 'pending'
+        df['action'] = 'move'
+        # Nullable ints: nanosecond mtimes do not survive a float column
+        df['mtime_ns'] = pd.array(mtimes, dtype="Int64")
+        df['size'] = pd.array(sizes, dtype="Int64")
+        return df
+
+    @staticmethod
+    def _iter_files(root, recursive):
+        """Yield os.DirEntry for every file under root (top-down, symlinked dirs not followed)."""
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
                 continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if recursive and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+                yield entry
+            stack.extend(reversed(subdirs))
 
-            category = self._get_category(item.suffix)
-            # For recursive scan, we might want to preserve structure or flatten.
-            # Current logic flattens into category folders in the root.
-            # This is fine for the "Organizer" logic.
-            
-            target_dir = path_obj / category
-            target_path = target_dir / item.name
+    @staticmethod
+    def _dir_names(taken, directory):
+        """Normcased names in directory, listed once per run and cached in `taken`."""
+        names = taken.get(directory)
+        if names is None:
+            try:
+                names = {os.path.normcase(n) for n in os.listdir(directory)}
+            except OSError: # Target directory not created yet
+                names = set()
+            taken[directory] = names
+        return names
 
-            files_data.append({
-                'original_path': str(item),
-                'filename': item.name,
-                'extension': item.suffix,
-                'category': category,
-                'target_dir': str(target_dir),
-                'target_path': str(target_path),
-                'status': 'pending',
-                'action': 'move'
-            })
+    def _resolve_targets(self, df, pending):
+        """
+        Final target path for each pending row (dict row -> Path).
+        The first row per target name keeps it when the directory does not
+        hold it yet: one set lookup, no stat. Only duplicates and names
+        already on disk go through _get_unique_filename's counter loop.
+        """
+        target_paths = df['target_path'].iloc[pending]
+        first = (~target_paths.map(os.path.normcase).duplicated()).tolist()
         
-        return pd.DataFrame(files_data)
+        taken = {} # target dir -> names present or already assigned in this run
+        resolved = {}
+        for i, target_path, is_first in zip(pending, target_paths.tolist(), first):
+            if not is_first:
+                continue
+            path = Path(target_path)
+            names = self._dir_names(taken, path.parent)
+            name = os.path.normcase(path.name)
+            if name not in names:
+                names.add(name)
+                resolved[i] = path
+        for i, target_path in zip(pending, target_paths.tolist()):
+            if i not in resolved:
+                resolved[i] = self._get_unique_filename(target_path, taken)
+        return resolved
 
-    def _get_unique_filename(self, target_path):
-        """Resolves filename conflicts."""
+    def _get_unique_filename(self, target_path, taken=None):
+        """
+        Resolves filename conflicts.
+        With `taken` (dict: directory -> set of normcased names), names known
+        from one listing per directory are skipped without a stat; only the
+        final candidate is stat'ed (files may appear after the listing).
+        The returned name is reserved for later files in the same run.
+        """
         path = Path(target_path)
-        if not path.exists():
-            return path
+        parent = path.parent
+        if taken is None:
+            exists = Path.exists
+        else:
+            names = self._dir_names(taken, parent)
+            exists = lambda p: os.path.normcase(p.name) in names or p.exists()
         
         stem = path.stem
         suffix = path.suffix
-        parent = path.parent
         counter = 1
         
-        while path.exists():
+        while exists(path):
             path = parent / f"{stem}_{counter}{suffix}"
             counter += 1
+        if taken is not None:
+            names.add(os.path.normcase(path.name))
         return path
 
+    MOVE_WORKERS = 8
+
+    @staticmethod
+    def _move(src, target_path):
+        """Move one file; returns its status string."""
+        try:
+            # Names were checked against a listing; never overwrite a file
+            # that appeared since
+            if os.path.lexists(target_path):
+                return f'error: target exists: {target_path}'
+            shutil.move(str(src), str(target_path))
+            return 'success'
+        except Exception as e:
+            return f'error: {str(e)}'
+
     def organize(self, df, dry_run=False):
         """
         Executes the organization based on the DataFrame.
@@ -82,33 +192,45 @@ class FileOrganizer:
         if df.empty:
             return df
 
-        results = []
+        # Plain lists instead of a Series per row; written back once at the end
+        origs = df['original_path'].tolist()
+        target_dirs = df['target_dir'].tolist()
+        target_paths = df['target_path'].tolist()
+        statuses = df['status'].tolist()
+        pending = [i for i, status in enumerate(statuses) if status == 'pending']
+        # Names are resolved up front, in row order, so parallel moves never collide
+        resolved = self._resolve_targets(df, pending) if pending else {}
+        moves = [] # (row, src, target_dir, final_target_path)
         
-        for index, row in df.iterrows():
-            if row['status'] != 'pending':
-                results.append(row)
-                continue
-
-            src = Path(row['original_path'])
-            target_dir = Path(row['target_dir'])
-            initial_target_path = Path(row['target_path'])
-            
-            # Recalculate unique path just before move to avoid race conditions/conflicts
-            final_target_path = self._get_unique_filename(initial_target_path)
+        for i in pending:
+            final_target_path = resolved[i]
             
             # Update row with final path
-            row['target_path'] = str(final_target_path)
+            target_paths[i] = str(final_target_path)
+            if dry_run:
+                statuses[i] = 'dry_run_success'
+            else:
+                moves.append((i, origs[i], target_dirs[i], final_target_path))
 
-            try:
-                if not dry_run:
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(src), str(final_target_path))
-                    row['status'] = 'success'
-                else:
-                    row['status'] = 'dry_run_success'
-            except Exception as e:
-                row['status'] = f'error: {str(e)}'
+        if moves:
+            # Create each directory once here rather than racing in the workers
+            dir_errors = {}
+            for target_dir in dict.fromkeys(m[2] for m in moves):
+                try:
+                    Path(target_dir).mkdir(parents=True, exist_ok=True)
+                except Exception as e:
+                    dir_errors[target_dir] = f'error: {str(e)}'
             
-            results.append(row)
+            # Moves are I/O bound and independent: overlap their latency
+            workers = min(self.MOVE_WORKERS, (os.cpu_count() or 1) * 2, len(moves))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda m: dir_errors.get(m[2]) or self._move(m[1], m[3]), moves
+                )
+                for (i, *_), status in zip(moves, results):
+                    statuses[i] = status
 
-        return pd.DataFrame(results)
+        df = df.copy()
+        df['target_path'] = target_paths
+        df['status'] = statuses
+        return df
@@ -1,5 +1,6 @@
 from .storage import Storage
-import json
+from .services.pdf_engine import PDFEngine
+from .services import json_codec
 
 class PDFManager:
     def __init__(self, storage: Storage):
@@ -12,12 +13,16 @@ class PDFManager:
         # For this MVC, let's keep it simple: Tags are comma-separated strings in UI, stored as string
         return data
 
+    def get_metadata_bulk(self, file_paths):
+        """Get metadata for many files at once as a DataFrame indexed by path."""
+        return self.storage.get_pdf_metadata_bulk(file_paths)
+
     def update_metadata(self, file_path: str, tags: str, notes: str, bookmarks: str = ""):
         """Update metadata in storage."""
         # Check if bookmarks is empty, maybe we should preserve existing?
         # Current usage suggests this method is for overwriting provided fields.
         # But if we want partial updates, we should use update_custom.
-        self.storage.update_pdf_metadata(file_path, tags, notes, bookmarks)
+        self.storage.update_pdf_metadata(file_path, tags, notes, bookmarks, self._flatten_bookmarks(bookmarks))
 
     def update_custom(self, file_path: str, **kwargs):
         """
@@ -31,4 +36,45 @@ class PDFManager:
         notes = kwargs.get('notes', current['notes'])
         bookmarks = kwargs.get('bookmarks', current['bookmarks'])
         
-        self.storage.update_pdf_metadata(file_path, tags, notes, bookmarks)
+        # Keep the flat ToC index in sync; rows saved before it existed get it lazily here
+        if 'bookmarks' not in kwargs and current.get('bookmarks_flat'):
+            bookmarks_flat = current['bookmarks_flat']
+        else:
+            bookmarks_flat = self._flatten_bookmarks(bookmarks)
+        
+        self.storage.update_pdf_metadata(file_path, tags, notes, bookmarks, bookmarks_flat)
+
+    def update_custom_many(self, rows):
+        """
+        Partial update of many files at once.
+        Each row is a dict with 'file_path' plus any of 'tags', 'notes', 'bookmarks';
+        rows with the same keys share one batched statement.
+        """
+        groups = {}
+        for row in rows:
+            keys = tuple(sorted(k for k in row if k != 'file_path'))
+            groups.setdefault(keys, []).append(row)
+        
+        for keys, group in groups.items():
+            if not keys:
+                continue
+            columns = list(keys)
+            if 'bookmarks' in keys:
+                columns.append('bookmarks_flat')
+            params = []
+            for row in group:
+                values = [row[k] for k in keys]
+                if 'bookmarks' in keys:
+                    values.append(self._flatten_bookmarks(row['bookmarks']))
+                params.append((row['file_path'], *values))
+            self.storage.update_pdf_metadata_many(columns, params)
+
+    @staticmethod
+    def _flatten_bookmarks(bookmarks: str) -> str:
+        """Nested bookmarks JSON -> flat [depth, title, page, dest_y, user_note] rows JSON."""
+        if not bookmarks:
+            return ""
+        try:
+            return json_codec.dumps(PDFEngine.flatten_toc(json_codec.loads(bookmarks)))
+        except Exception:
+            return ""
@@ -0,0 +1,5 @@
+"""Path helpers shared by the services."""
+
+def is_pdf(path):
+    """Case-insensitive '.pdf' suffix check without lowercasing the whole path."""
+    return path[-4:].lower() == '.pdf'
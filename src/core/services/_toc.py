@@ -0,0 +1,26 @@
+"""
+Shared builder turning a flat, level-annotated ToC into the nested
+{"title", "page", "dest_y", "children", "user_note"} tree used across the app.
+"""
+
+def build_toc_tree(entries):
+    """
+    Nest (level, node) pairs given in document order; level is 1-based as in
+    PyMuPDF's get_toc. Each node must carry a "children" list, which is
+    filled in place. Returns the list of root nodes.
+
+    A node's parent is the nearest preceding node with a lower level, so
+    malformed outlines that skip levels nest the same way as the original
+    per-caller loops did.
+    """
+    roots = []
+    stack = [] # (level, node) along the current branch
+    for level, node in entries:
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        if stack:
+            stack[-1][1]["children"].append(node)
+        else:
+            roots.append(node)
+        stack.append((level, node))
+    return roots
@@ -13,10 +13,11 @@ class BookmarkService:
         Toggles the bookmark status for the given file.
         Returns the new status (True/False).
         """
-        meta = self.storage.get_pdf_metadata(file_path)
-        new_status = not meta.get('is_bookmarked', False)
-        self.storage.update_bookmark_status(file_path, new_status)
-        return new_status
+        return self.storage.toggle_bookmark_status(file_path)
+
+    def set_bookmarks(self, file_paths, is_bookmarked: bool):
+        """Set the bookmark status of many files at once (single DB transaction)."""
+        self.storage.update_bookmark_status_many(file_paths, is_bookmarked)
 
     def is_bookmarked(self, file_path: str) -> bool:
         """Check if a file is bookmarked."""
@@ -28,5 +29,4 @@ class BookmarkService:
         Retrieve all bookmarked files.
         (Future implementation for a 'Bookmarks' view)
         """
-        # TODO: Add query method in Storage if needed
-        pass
+        return self.storage.get_bookmarked_paths()
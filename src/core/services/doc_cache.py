@@ -0,0 +1,99 @@
+"""
+Process-wide cache of open fitz.Document handles, so repeated renders of
+the same file do not re-parse its xref on every call. Reserved for the
+reader: a cached handle keeps the file open (and, on Windows, locked
+against rename/move) until it is closed or evicted.
+
+fitz is not thread-safe: FITZ_LOCK is held for the whole
+`with open_document(path) as doc:` block and for every close.
+"""
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF
+
+from .fitz_lock import FITZ_LOCK
+
+MAX_OPEN_DOCUMENTS = 16
+
+class _Entry:
+    __slots__ = ("doc", "lock", "stamp", "closed")
+
+    def __init__(self, doc, stamp):
+        self.doc = doc
+        self.lock = threading.RLock()
+        self.stamp = stamp # (mtime_ns, size) the handle was opened at
+        self.closed = False
+
+_entries = OrderedDict() # path -> _Entry, least recently used first
+_entries_lock = threading.Lock()
+
+def _stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _retire(entry):
+    """Close an entry once no caller is using it."""
+    with entry.lock:
+        entry.closed = True
+        entry.doc.close()
+
+def _acquire(path, stamp):
+    retired = []
+    with _entries_lock:
+        entry = _entries.get(path)
+        if entry is not None and entry.stamp != stamp:
+            # File changed on disk since it was opened
+            retired.append(_entries.pop(path))
+            entry = None
+        if entry is None:
+            entry = _Entry(fitz.open(path), stamp)
+            _entries[path] = entry
+            while len(_entries) > MAX_OPEN_DOCUMENTS:
+                retired.append(_entries.popitem(last=False)[1])
+        else:
+            _entries.move_to_end(path)
+    # Close outside the cache lock: a caller holding an entry lock may be
+    # waiting on the cache lock to open another file.
+    for old in retired:
+        _retire(old)
+    return entry
+
+@contextmanager
+def open_document(path):
+    """
+    Yield the cached fitz.Document for path with exclusive access.
+    Raises what fitz.open / os.stat raise for missing or broken files.
+    """
+    path = os.fspath(path)
+    with FITZ_LOCK:
+        entry = _acquire(path, _stamp(path))
+        with entry.lock:
+            if not entry.closed:
+                yield entry.doc
+                return
+        # Evicted between lookup and lock: fall back to a private handle
+        doc = fitz.open(path)
+        try:
+            yield doc
+        finally:
+            doc.close()
+
+def close(path):
+    """Close and forget the cached handle for path, if any."""
+    with _entries_lock:
+        entry = _entries.pop(os.fspath(path), None)
+    if entry is not None:
+        with FITZ_LOCK:
+            _retire(entry)
+
+def clear():
+    """Close every cached handle."""
+    with _entries_lock:
+        entries = list(_entries.values())
+        _entries.clear()
+    with FITZ_LOCK:
+        for entry in entries:
+            _retire(entry)
@@ -1,37 +1,155 @@
+import os
 import sys
 import time
+from collections import OrderedDict
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from ._paths import is_pdf
+
+# Filesystems whose changes native observers (inotify/FSEvents) do not see
+# when made by other machines
+NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'afpfs', 'webdav', 'davfs', '9p',
+    'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs',
+})
+
+def _is_network_path(path):
+    """Best-effort check whether path lives on a network share."""
+    if path.startswith(('\\\\', '//')): # UNC path
+        return True
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            DRIVE_REMOTE = 4
+            drive = os.path.splitdrive(os.path.abspath(path))[0] + '\\'
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+        except (AttributeError, OSError):
+            return False
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError: # Not Linux (e.g. macOS): no cheap way to tell
+        return False
+    # Longest mount point containing path decides; spaces are octal-escaped
+    real = os.path.realpath(path)
+    best, fs_type = '', ''
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (real == mount_point or real.startswith(prefix)) and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FS_TYPES
 
 class FileMetadataHandler(QObject, FileSystemEventHandler):
     """
     Handles file system events and emits Qt signals.
+    Events are batched for DEBOUNCE_MS and de-duplicated per path, so a
+    burst (git pull, mass rename) reaches the UI once per affected file.
     """
+    DEBOUNCE_MS = 150
+
     # Signals to update UI
     file_created = pyqtSignal(str)
     file_deleted = pyqtSignal(str)
     file_moved = pyqtSignal(str, str) # src, dest
-    
+    changes_flushed = pyqtSignal(list) # every path touched by one batch
+
+    # Carries watchdog-thread events to this object's (Qt) thread
+    _event_received = pyqtSignal(str, str, str) # kind, src, dest
+
     def __init__(self):
         QObject.__init__(self) # Init Qt Object
+        self._pending = OrderedDict() # path -> (kind, src) in arrival order
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.DEBOUNCE_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        self._event_received.connect(self._enqueue)
+
+    def dispatch(self, event):
+        """Filter once here instead of in every on_* callback (watchdog thread)."""
+        if event.is_directory:
+            return
+        src = event.src_path
+        src_pdf = is_pdf(src)
+        if event.event_type == 'moved':
+            dest = event.dest_path
+            dest_pdf = is_pdf(dest)
+            if src_pdf and dest_pdf:
+                self._event_received.emit('moved', src, dest)
+            elif dest_pdf: # e.g. download.tmp -> doc.pdf
+                self._event_received.emit('created', dest, '')
+            elif src_pdf:
+                self._event_received.emit('deleted', src, '')
+        elif event.event_type in ('created', 'deleted') and src_pdf:
+            self._event_received.emit(event.event_type, src, '')
 
-    def on_created(self, event):
-        if not event.is_directory and event.src_path.lower().endswith('.pdf'):
-            self.file_created.emit(event.src_path)
+    def _enqueue(self, kind, src, dest):
+        if kind == 'moved':
+            # Fold into what is already queued for src: created-then-moved
+            # is just created, and a chain of moves keeps its first source
+            prior = self._pending.pop(src, None)
+            if prior is None or prior[0] == 'deleted':
+                self._put(dest, 'moved', src)
+            elif prior[0] == 'created':
+                self._put(dest, 'created', None)
+            else:
+                self._put(dest, 'moved', prior[1])
+        else:
+            self._put(src, kind, None)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
 
-    def on_deleted(self, event):
-        if not event.is_directory and event.src_path.lower().endswith('.pdf'):
-            self.file_deleted.emit(event.src_path)
+    def _put(self, path, kind, src):
+        # Last event per path wins; re-insert so order follows the latest event
+        self._pending.pop(path, None)
+        self._pending[path] = (kind, src)
 
-    def on_moved(self, event):
-        if not event.is_directory and event.src_path.lower().endswith('.pdf'):
-            self.file_moved.emit(event.src_path, event.dest_path)
+    def _flush(self):
+        """Emit one signal per affected path; deleted+created pairs become moves."""
+        pending, self._pending = self._pending, OrderedDict()
+
+        # Pair a deleted path with a created one of the same name elsewhere
+        deleted = {}
+        for path, (kind, _) in pending.items():
+            if kind == 'deleted':
+                deleted.setdefault(os.path.basename(path), []).append(path)
+        moves = {}
+        for path, (kind, _) in pending.items():
+            if kind == 'created':
+                candidates = deleted.get(os.path.basename(path))
+                if candidates:
+                    moves[path] = candidates.pop(0)
+        paired = set(moves.values())
+
+        touched = []
+        for path, (kind, src) in pending.items():
+            if path in paired:
+                continue
+            if path in moves:
+                kind, src = 'moved', moves[path]
+            if kind == 'moved':
+                self.file_moved.emit(src, path)
+                touched.extend((src, path))
+            elif kind == 'created':
+                self.file_created.emit(path)
+                touched.append(path)
+            else:
+                self.file_deleted.emit(path)
+                touched.append(path)
+        if touched:
+            self.changes_flushed.emit(touched)
 
 class FileWatcherService(QObject):
     """
     Service to watch a directory for PDF changes.
+    Network shares are polled: native observers miss changes made remotely.
     """
+    POLL_INTERVAL_S = 2
+    STOP_TIMEOUT_S = 1.0
+
     def __init__(self):
         super().__init__()
         self.observer = Observer()
@@ -39,6 +157,13 @@ class FileWatcherService(QObject):
         self.watch = None
         
     def start_watching(self, path):
+        polling = _is_network_path(path)
+        if polling != isinstance(self.observer, PollingObserver) or self.observer.stopped_event.is_set():
+            # Wrong kind for this path, or already stopped (threads cannot restart)
+            self._stop_observer()
+            self.observer = PollingObserver(timeout=self.POLL_INTERVAL_S) if polling else Observer()
+            self.watch = None
+        
         if self.watch:
              self.observer.unschedule(self.watch)
              
@@ -47,5 +172,11 @@ class FileWatcherService(QObject):
             self.observer.start()
             
     def stop_watching(self):
+        self._stop_observer()
+
+    def _stop_observer(self):
+        # Bounded join keeps the UI responsive; observer threads are daemons,
+        # so one still draining (e.g. a slow share) cannot block exit.
         self.observer.stop()
-        self.observer.join()
+        if self.observer.is_alive():
+            self.observer.join(timeout=self.STOP_TIMEOUT_S)
@@ -0,0 +1,9 @@
+"""
+Process-wide lock for PyMuPDF (fitz) calls.
+MuPDF's global state is not safe to use from several threads at once, so
+scan ToC probes, ToC extraction and page renders that may run on worker
+threads all go through FITZ_LOCK, as does the viewer on the GUI thread.
+"""
+import threading
+
+FITZ_LOCK = threading.RLock()
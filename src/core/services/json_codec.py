@@ -0,0 +1,40 @@
+"""
+JSON encode/decode for stored ToC/bookmark data.
+Uses orjson (native parser) when installed, stdlib json otherwise;
+ijson (streaming parser) for iter_items when installed.
+Values are always exchanged as str to match the TEXT columns in SQLite.
+"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ijson
+except ImportError:
+    ijson = None
+import io
+import json
+
+def loads(data):
+    """Parse a JSON str/bytes payload."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj) -> str:
+    """Serialize obj to a JSON str."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+def iter_items(data):
+    """
+    Yield the elements of a top-level JSON array one by one.
+    With ijson the array is parsed incrementally instead of materialized up front.
+    """
+    if ijson is not None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        yield from ijson.items(io.BytesIO(data), "item", use_float=True)
+    else:
+        yield from loads(data)
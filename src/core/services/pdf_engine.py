@@ -1,5 +1,11 @@
 import fitz  # PyMuPDF
-import os
+from functools import lru_cache
+from ._paths import is_pdf
+from ._toc import build_toc_tree
+from .fitz_lock import FITZ_LOCK
+
+# Missing files surface from fitz.open as its own class or as the builtin
+_MISSING = (FileNotFoundError, fitz.FileNotFoundError)
 
 class PDFEngine:
     """
@@ -17,85 +23,93 @@ class PDFEngine:
         Returns:
             bool: True if ToC exists, False otherwise (or if error).
         """
-        if not os.path.exists(file_path):
-            return False
-        
-        if not file_path.lower().endswith('.pdf'):
+        if not is_pdf(file_path):
             return False
             
+        # No separate exists() check: fitz.open fails fast on a missing file
         try:
-            doc = fitz.open(file_path)
-            # get_toc(simple=True) returns a list. If list is empty, no ToC.
-            toc = doc.get_toc(simple=True)
-            doc.close()
+            with FITZ_LOCK, fitz.open(file_path) as doc:
+                # get_toc(simple=True) returns a list. If list is empty, no ToC.
+                toc = doc.get_toc(simple=True)
             return len(toc) > 0
+        except _MISSING:
+            return False
         except Exception as e:
             # In production, use a logger instead of print
             print(f"Error checking ToC for {file_path}: {e}")
             return False
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def has_toc_cached(file_path: str, mtime_ns: int, size: int) -> bool:
+        """
+        Memoized has_toc. mtime_ns/size are part of the key so a modified
+        file is re-checked instead of returning a stale answer.
+        """
+        return PDFEngine.has_toc(file_path)
+
     @staticmethod
     def extract_toc(file_path: str):
         """
         Extract the Table of Contents from the PDF and return a nested dictionary structure.
         """
-        if not os.path.exists(file_path):
-            return []
-            
-        if not file_path.lower().endswith('.pdf'):
+        if not is_pdf(file_path):
             return []
             
         try:
-            doc = fitz.open(file_path)
-            toc_raw = doc.get_toc(simple=False)
-            doc.close()
-            
-            # Convert flat list to nested tree
-            # PyMuPDF toc: [[lvl, title, page, ...], ...]
-            # lvl is 1-based hierarchy level.
+            # Short-lived handle, like has_toc: callers such as batch ToC
+            # generation go on to rename/move the file, which an open handle
+            # blocks on Windows. Only the reader's renders use doc_cache.
+            with FITZ_LOCK, fitz.open(file_path) as doc:
+                toc_raw = doc.get_toc(simple=False)
             
-            toc_tree = []
-            stack = [] # [(level, node_dict)]
-
-            for item in toc_raw:
-                lvl, title, page = item[0], item[1], item[2]
-                dest = item[3] if len(item) > 3 else None
-                
-                # Extract Y coordinate if available in dest
-                dest_y = 0
-                if dest and isinstance(dest, dict) and 'to' in dest:
-                    try:
-                        # 'to' is usually a fitz.Point(x, y)
-                        dest_y = dest['to'].y
-                    except:
-                        pass
-                
-                node = {
-                    "title": title,
-                    "page": page,
-                    "dest_y": dest_y,
-                    "children": [],
-                    "user_note": "" # Placeholder for user data
-                }
-                
-                if lvl == 1:
-                    toc_tree.append(node)
-                    stack = [(1, node)]
-                else:
-                    # Find parent
-                    while stack and stack[-1][0] >= lvl:
-                        stack.pop()
-                    
-                    if stack:
-                        parent_node = stack[-1][1]
-                        parent_node["children"].append(node)
-                        stack.append((lvl, node))
-                    else:
-                        # Fallback if hierarchy is broken, treat as root
-                        toc_tree.append(node)
-                        stack = [(lvl, node)]
-                        
-            return toc_tree
+            # PyMuPDF toc: [[lvl, title, page, dest], ...], lvl is 1-based
+            return build_toc_tree((item[0], PDFEngine._toc_node(item)) for item in toc_raw)
+        except _MISSING:
+            return []
         except Exception as e:
             print(f"Error extracting ToC for {file_path}: {e}")
             return []
+
+    @staticmethod
+    def _toc_node(item):
+        """Build a tree node from one get_toc(simple=False) row."""
+        dest = item[3] if len(item) > 3 else None
+        
+        # Extract Y coordinate if available in dest
+        dest_y = 0
+        if dest and isinstance(dest, dict) and 'to' in dest:
+            try:
+                # 'to' is usually a fitz.Point(x, y)
+                dest_y = dest['to'].y
+            except:
+                pass
+        
+        return {
+            "title": item[1],
+            "page": item[2],
+            "dest_y": dest_y,
+            "children": [],
+            "user_note": "" # Placeholder for user data
+        }
+
+    @staticmethod
+    def flatten_toc(toc_tree):
+        """
+        Flatten a nested ToC (as returned by extract_toc) into rows of
+        [depth, title, page, dest_y, user_note] in document order.
+        depth is 1-based, like PyMuPDF's get_toc levels.
+        """
+        rows = []
+        stack = [(1, node) for node in reversed(toc_tree or [])]
+        while stack:
+            depth, node = stack.pop()
+            rows.append([
+                depth,
+                node.get('title', 'Untitled'),
+                node.get('page', 1),
+                node.get('dest_y', 0.0),
+                node.get('user_note', ''),
+            ])
+            stack.extend((depth + 1, child) for child in reversed(node.get('children', [])))
+        return rows
@@ -1,6 +1,7 @@
 import fitz  # PyMuPDF
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
+from . import doc_cache
 
 class PDFRenderer:
     """
@@ -11,33 +12,64 @@ class PDFRenderer:
     @staticmethod
     def render_page(file_path: str, page_num: int, zoom: float = 1.0) -> bytes:
         """
-        Renders a specific page to PNG bytes.
+        Renders a specific page to PNG bytes (for export; on-screen display
+        should use render_page_raw, which skips the DEFLATE encode/decode).
         page_num is 1-based (PyMuPDF uses 0-based).
         """
         try:
-            doc = fitz.open(file_path)
-            if page_num < 1 or page_num > doc.page_count:
-                return b""
-            
-            page = doc.load_page(page_num - 1)
-            
-            # Zoom matrix
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            img_bytes = pix.tobytes("png")
-            doc.close()
-            return img_bytes
+            with doc_cache.open_document(file_path) as doc:
+                return PDFRenderer.render_page_from_doc(doc, page_num, zoom)
         except Exception as e:
             print(f"Error rendering PDF: {e}")
             return b""
 
+    @staticmethod
+    def render_page_from_doc(doc: "fitz.Document", page_num: int, zoom: float = 1.0) -> bytes:
+        """
+        Same as render_page but for an already open document (no re-parse).
+        The document must only be used from the thread that owns it.
+        """
+        if page_num < 1 or page_num > doc.page_count:
+            return b""
+        page = doc.load_page(page_num - 1)
+        
+        # Rasterize directly at the target scale; no alpha channel to carry
+        mat = fitz.Matrix(zoom, zoom)
+        pix = page.get_pixmap(matrix=mat, alpha=False)
+        return pix.tobytes("png")
+
+    @staticmethod
+    def render_page_raw(file_path: str, page_num: int, zoom: float = 1.0) -> Optional[Tuple[bytes, int, int, int]]:
+        """
+        Renders a specific page to raw RGB888 samples, skipping the PNG codec.
+        Returns (samples, width, height, stride) or None on failure.
+        page_num is 1-based (PyMuPDF uses 0-based).
+        """
+        try:
+            with doc_cache.open_document(file_path) as doc:
+                return PDFRenderer.render_page_raw_from_doc(doc, page_num, zoom)
+        except Exception as e:
+            print(f"Error rendering PDF: {e}")
+            return None
+
+    @staticmethod
+    def render_page_raw_from_doc(doc: "fitz.Document", page_num: int, zoom: float = 1.0) -> Optional[Tuple[bytes, int, int, int]]:
+        """Same as render_page_raw but for an already open document."""
+        if page_num < 1 or page_num > doc.page_count:
+            return None
+        page = doc.load_page(page_num - 1)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return (pix.samples, pix.width, pix.height, pix.stride)
+
     @staticmethod
     def get_page_count(file_path: str) -> int:
         try:
-            doc = fitz.open(file_path)
-            count = doc.page_count
-            doc.close()
-            return count
+            with doc_cache.open_document(file_path) as doc:
+                return doc.page_count
         except:
             return 0
+
+    @staticmethod
+    def close_all() -> None:
+        """Close every cached document handle (call once on shutdown)."""
+        doc_cache.clear()
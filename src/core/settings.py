@@ -1,10 +1,16 @@
 import json
 from pathlib import Path
+from types import MappingProxyType
 
 class Settings:
     def __init__(self, config_path="config/settings.json"):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        self._config = self._load_config()
+        # Read-only view: changes go through save_config so derived values stay in sync
+        self.config = MappingProxyType(self._config)
+        # Bumped on every save so dependents can rebuild derived lookups lazily
+        self.version = 0
+        self._refresh_derived()
 
     def _load_config(self):
         if not self.config_path.exists():
@@ -33,31 +39,42 @@ class Settings:
         """
         Update and save configuration to JSON file.
         """
-        self.config.update(new_config)
+        self._config.update(new_config)
+        self.version += 1
+        self._refresh_derived()
         
         # Ensure directory exists
         if not self.config_path.parent.exists():
             self.config_path.parent.mkdir(parents=True)
             
+        # Encode up front: json.dump issues one write() call per encoder chunk
+        text = json.dumps(self._config, indent=4)
         with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=4)
+            f.write(text)
+
+    def _refresh_derived(self):
+        """Resolve the values read once per scanned file; sets for O(1) membership."""
+        self._file_categories = self._config.get("file_categories", {})
+        self._default_category = self._config.get("default_category", "Others")
+        self._ignore_files = frozenset(self._config.get("ignore_files", []))
+        self._ignore_folders = frozenset(self._config.get("ignore_folders", []))
 
     @property
     def file_categories(self):
-        return self.config.get("file_categories", {})
+        return self._file_categories
 
     @property
     def default_category(self):
-        return self.config.get("default_category", "Others")
+        return self._default_category
     
     @property
     def ignore_files(self):
-        return self.config.get("ignore_files", [])
+        return self._ignore_files
 
     @property
     def ignore_folders(self):
-        return self.config.get("ignore_folders", [])
+        return self._ignore_folders
 
     @property
     def db_path(self):
-        return self.config.get("db_path", "data/history.db")
+        return self._config.get("db_path", "data/history.db")
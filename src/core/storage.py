@@ -1,18 +1,84 @@
 import sqlite3
+import threading
+import time
+import zlib
 import pandas as pd
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 
 class Storage:
+    META_CACHE_MAX = 4096
+
+    # Applied once to the long-lived connection
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+
     def __init__(self, db_path="data/history.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the app's lifetime, shared by the UI thread and
+        # scan workers; the lock keeps their statements and transactions apart.
+        self._lock = threading.RLock()
+        # file_path -> get_pdf_metadata result; every write to a row drops its entry
+        self._meta_cache = OrderedDict()
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            self._conn.execute(pragma)
         self._init_db()
 
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _read(self):
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def _write(self, file_paths=()):
+        """
+        Run the block in one transaction: a single commit (and fsync) per call.
+        Cached metadata of file_paths is dropped while the lock is still held.
+        """
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+            for path in file_paths:
+                self._meta_cache.pop(path, None)
+
+    # Stored in the file's user_version; bump it whenever _create_schema
+    # gains a table, column, index or migration.
+    SCHEMA_VERSION = 2
+
     def _init_db(self):
-        """Initialize SQLite database with history table."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """
+        Initialize SQLite database with history table.
+        Skipped entirely (one header read) when the file is already current.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == self.SCHEMA_VERSION:
+            return
+        with self._write() as conn:
+            self._create_schema(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _create_schema(self, cursor):
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -33,7 +99,7 @@ class Storage:
                 notes TEXT,
                 bookmarks TEXT,
                 is_bookmarked INTEGER DEFAULT 0,
-                last_modified TEXT
+                last_modified INTEGER
             )
         ''')
         
@@ -42,7 +108,39 @@ class Storage:
             cursor.execute("SELECT is_bookmarked FROM pdf_metadata LIMIT 1")
         except sqlite3.OperationalError:
             cursor.execute("ALTER TABLE pdf_metadata ADD COLUMN is_bookmarked INTEGER DEFAULT 0")
-            conn.commit()
+
+        # Migration: pre-flattened ToC rows (JSON) next to the nested bookmarks JSON
+        try:
+            cursor.execute("SELECT bookmarks_flat FROM pdf_metadata LIMIT 1")
+        except sqlite3.OperationalError:
+            cursor.execute("ALTER TABLE pdf_metadata ADD COLUMN bookmarks_flat TEXT")
+
+        # Migration: drop the former msgpack copy of the bookmarks; the JSON
+        # and its flat index are the only stored forms
+        column_names = {row[1] for row in cursor.execute("PRAGMA table_info(pdf_metadata)")}
+        if 'bookmarks_mp' in column_names:
+            cursor.execute("ALTER TABLE pdf_metadata DROP COLUMN bookmarks_mp")
+
+        # Migration: last_modified as Unix seconds (4 bytes) instead of a
+        # 19-byte local-time string
+        column_types = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(pdf_metadata)")}
+        if column_types.get('last_modified', '').upper() == 'TEXT':
+            cursor.execute("ALTER TABLE pdf_metadata RENAME COLUMN last_modified TO last_modified_text")
+            cursor.execute("ALTER TABLE pdf_metadata ADD COLUMN last_modified INTEGER")
+            cursor.execute(
+                "UPDATE pdf_metadata SET last_modified = CAST(strftime('%s', last_modified_text, 'utc') AS INTEGER)"
+            )
+            cursor.execute("ALTER TABLE pdf_metadata DROP COLUMN last_modified_text")
+
+        # has_toc results keyed by file identity so unchanged files skip the PDF open
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS toc_cache (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                has_toc INTEGER
+            )
+        ''')
 
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS root_history (
@@ -51,92 +149,259 @@ class Storage:
                 last_accessed TEXT
             )
         ''')
-        conn.commit()
-        conn.close()
+
+        # file_path lookups already use the UNIQUE constraint's index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_root_last ON root_history(last_accessed DESC)")
+        # Partial index: only starred rows, so listing bookmarks touches just those
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_meta_bookmarked ON pdf_metadata(is_bookmarked) WHERE is_bookmarked = 1"
+        )
 
     def save_root_history(self, path):
         """Save a root folder path to history."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        accessed = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.save_root_history_many([path])
+
+    def save_root_history_many(self, paths):
+        """
+        Save several root folders in one transaction, as if saved one after
+        another: the last path becomes the most recent.
+        """
+        # Microseconds so two folders opened within one second still order
+        # correctly; older second-precision values sort before them as text.
+        now = datetime.now()
+        rows = [
+            (str(path), (now + timedelta(microseconds=i)).isoformat(sep=" ", timespec="microseconds"))
+            for i, path in enumerate(paths)
+        ]
+        if not rows:
+            return
         # Upsert: if path exists, update timestamp
-        cursor.execute('''
-            INSERT INTO root_history (path, last_accessed)
-            VALUES (?, ?)
-            ON CONFLICT(path) DO UPDATE SET
-                last_accessed=excluded.last_accessed
-        ''', (str(path), accessed))
-        conn.commit()
-        conn.close()
-
-    def get_root_history(self):
-        """Retrieve root folder history ordered by most recent."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT path FROM root_history ORDER BY last_accessed DESC")
-        rows = cursor.fetchall()
-        conn.close()
-        return [row[0] for row in rows]
+        with self._write() as conn:
+            conn.executemany('''
+                INSERT INTO root_history (path, last_accessed)
+                VALUES (?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    last_accessed=excluded.last_accessed
+            ''', rows)
+
+    def get_root_history(self, limit=None):
+        """Retrieve root folder history ordered by most recent (at most limit paths)."""
+        with self._read() as conn:
+            # LIMIT -1 means no limit; the index on last_accessed stops the
+            # scan after limit rows. Iterate the cursor: no list of row tuples.
+            cursor = conn.execute(
+                "SELECT path FROM root_history ORDER BY last_accessed DESC LIMIT ?",
+                (-1 if limit is None else int(limit),),
+            )
+            return [path for (path,) in cursor]
 
     def get_pdf_metadata(self, file_path):
         """Retrieve metadata for a specific PDF file."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT tags, notes, bookmarks, is_bookmarked FROM pdf_metadata WHERE file_path = ?", (file_path,))
-        row = cursor.fetchone()
-        conn.close()
-        if row:
-            return {
-                "tags": row[0], 
-                "notes": row[1], 
-                "bookmarks": row[2],
-                "is_bookmarked": bool(row[3])
-            }
-        return {"tags": "", "notes": "", "bookmarks": "", "is_bookmarked": False}
+        with self._lock:
+            cached = self._meta_cache.get(file_path)
+            if cached is not None:
+                self._meta_cache.move_to_end(file_path)
+                return dict(cached) # Callers may modify their copy
+            row = self._conn.execute(
+                "SELECT tags, notes, bookmarks, is_bookmarked, bookmarks_flat FROM pdf_metadata WHERE file_path = ?",
+                (file_path,)
+            ).fetchone()
+            if row:
+                meta = {
+                    "tags": row[0], 
+                    "notes": row[1], 
+                    "bookmarks": self._unpack_text(row[2]),
+                    "is_bookmarked": bool(row[3]),
+                    "bookmarks_flat": self._unpack_text(row[4]) or "",
+                }
+            else:
+                meta = {"tags": "", "notes": "", "bookmarks": "", "is_bookmarked": False, "bookmarks_flat": ""}
+            self._meta_cache[file_path] = meta
+            if len(self._meta_cache) > self.META_CACHE_MAX:
+                self._meta_cache.popitem(last=False)
+            return dict(meta)
 
-    def update_bookmark_status(self, file_path, is_bookmarked):
-        """Update only the bookmark status (favorite/starred)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        modified = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def get_bookmarked_paths(self):
+        """Paths of all bookmarked (starred) files."""
+        with self._read() as conn:
+            rows = conn.execute("SELECT file_path FROM pdf_metadata WHERE is_bookmarked = 1").fetchall()
+        return [row[0] for row in rows]
+
+    # SQLite's default limit on host parameters per statement
+    SQLITE_MAX_VARS = 999
+
+    def get_pdf_metadata_bulk(self, file_paths):
+        """
+        Retrieve metadata for many PDF files in a few queries.
+        Returns a DataFrame indexed by file_path with tags, notes,
+        has_bookmarks and is_bookmarked; files without a row are simply absent.
+        Scans only need to know whether bookmarks are stored, so SQLite
+        answers that from the column length and no ToC is decompressed;
+        get_pdf_metadata returns the bookmarks themselves.
+        """
+        columns = ['file_path', 'tags', 'notes', 'has_bookmarks', 'is_bookmarked']
+        select = ("file_path, tags, notes, "
+                  "(bookmarks IS NOT NULL AND length(bookmarks) > 0) AS has_bookmarks, is_bookmarked")
+        paths = list(dict.fromkeys(str(p) for p in file_paths))
+        rows = []
+        with self._read() as conn:
+            for start in range(0, len(paths), self.SQLITE_MAX_VARS):
+                chunk = paths[start:start + self.SQLITE_MAX_VARS]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT {select} FROM pdf_metadata WHERE file_path IN ({placeholders})",
+                    chunk
+                ).fetchall())
         
-        # Upsert logic is tricky for partial update if row doesn't exist.
-        # Check if exists first.
-        cursor.execute("SELECT 1 FROM pdf_metadata WHERE file_path = ?", (file_path,))
-        exists = cursor.fetchone()
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        df['has_bookmarks'] = df['has_bookmarks'].fillna(0).astype(bool)
+        df['is_bookmarked'] = df['is_bookmarked'].fillna(0).astype(bool)
+        return df.set_index('file_path')
+
+    def get_toc_cache_bulk(self, file_paths):
+        """
+        Retrieve cached has_toc results for many files.
+        Returns a DataFrame indexed by path with mtime_ns, size and has_toc.
+        """
+        columns = ['path', 'mtime_ns', 'size', 'has_toc']
+        paths = list(dict.fromkeys(str(p) for p in file_paths))
+        rows = []
+        with self._read() as conn:
+            for start in range(0, len(paths), self.SQLITE_MAX_VARS):
+                chunk = paths[start:start + self.SQLITE_MAX_VARS]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT {', '.join(columns)} FROM toc_cache WHERE path IN ({placeholders})",
+                    chunk
+                ).fetchall())
         
-        if exists:
-            cursor.execute('''
-                UPDATE pdf_metadata 
-                SET is_bookmarked = ?, last_modified = ?
-                WHERE file_path = ?
-            ''', (1 if is_bookmarked else 0, modified, file_path))
-        else:
-            # Insert new row with default empty values for others
-            cursor.execute('''
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        return df.set_index('path')
+
+    def save_toc_cache(self, rows):
+        """Insert or replace (path, mtime_ns, size, has_toc) rows."""
+        rows = [(str(p), int(m), int(sz), 1 if t else 0) for p, m, sz, t in rows]
+        if not rows:
+            return
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO toc_cache (path, mtime_ns, size, has_toc) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def update_bookmark_status(self, file_path, is_bookmarked):
+        """Update only the bookmark status (favorite/starred)."""
+        self.update_bookmark_status_many([file_path], is_bookmarked)
+
+    def toggle_bookmark_status(self, file_path):
+        """
+        Flip the bookmark status in a single statement and return the new value.
+        A cached metadata row is patched with the returned value instead of
+        being dropped, so the next read does not go back to SQLite.
+        """
+        modified = int(time.time())
+        with self._lock:
+            with self._write() as conn:
+                row = conn.execute('''
+                    INSERT INTO pdf_metadata (file_path, tags, notes, bookmarks, is_bookmarked, last_modified)
+                    VALUES (?, '', '', '', 1, ?)
+                    ON CONFLICT(file_path) DO UPDATE SET
+                        is_bookmarked = 1 - COALESCE(is_bookmarked, 0),
+                        last_modified = excluded.last_modified
+                    RETURNING is_bookmarked
+                ''', (file_path, modified)).fetchone()
+            is_bookmarked = bool(row[0])
+            cached = self._meta_cache.get(file_path)
+            if cached is not None:
+                cached["is_bookmarked"] = is_bookmarked
+        return is_bookmarked
+
+    def update_bookmark_status_many(self, file_paths, is_bookmarked):
+        """Set the bookmark status of many files in one transaction."""
+        modified = int(time.time())
+        flag = 1 if is_bookmarked else 0
+        rows = [(str(p), flag, modified) for p in file_paths]
+        if not rows:
+            return
+        with self._write([p for p, _, _ in rows]) as conn:
+            conn.executemany('''
                 INSERT INTO pdf_metadata (file_path, tags, notes, bookmarks, is_bookmarked, last_modified)
                 VALUES (?, '', '', '', ?, ?)
-            ''', (file_path, 1 if is_bookmarked else 0, modified))
-            
-        conn.commit()
-        conn.close()
+                ON CONFLICT(file_path) DO UPDATE SET
+                    is_bookmarked=excluded.is_bookmarked,
+                    last_modified=excluded.last_modified
+            ''', rows)
 
-    def update_pdf_metadata(self, file_path, tags, notes, bookmarks):
+    def update_pdf_metadata(self, file_path, tags, notes, bookmarks, bookmarks_flat=""):
         """Update or insert metadata for a PDF file."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        modified = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute('''
-            INSERT INTO pdf_metadata (file_path, tags, notes, bookmarks, last_modified)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(file_path) DO UPDATE SET
-                tags=excluded.tags,
-                notes=excluded.notes,
-                bookmarks=excluded.bookmarks,
-                last_modified=excluded.last_modified
-        ''', (file_path, tags, notes, bookmarks, modified))
-        conn.commit()
-        conn.close()
+        modified = int(time.time())
+        bookmarks = self._pack_text(bookmarks)
+        bookmarks_flat = self._pack_text(bookmarks_flat)
+        with self._write([file_path]) as conn:
+            conn.execute('''
+                INSERT INTO pdf_metadata (file_path, tags, notes, bookmarks, bookmarks_flat, last_modified)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(file_path) DO UPDATE SET
+                    tags=excluded.tags,
+                    notes=excluded.notes,
+                    bookmarks=excluded.bookmarks,
+                    bookmarks_flat=excluded.bookmarks_flat,
+                    last_modified=excluded.last_modified
+            ''', (file_path, tags, notes, bookmarks, bookmarks_flat, modified))
+
+    # Text columns stored zlib-compressed (as BLOB) once longer than COMPRESS_MIN
+    # characters; the storage class alone tells the reader which form it has
+    COMPRESSED_COLUMNS = ('bookmarks', 'bookmarks_flat')
+    COMPRESS_MIN = 1024
+
+    @classmethod
+    def _pack_text(cls, value):
+        if isinstance(value, str) and len(value) > cls.COMPRESS_MIN:
+            return zlib.compress(value.encode('utf-8'))
+        return value
+
+    @staticmethod
+    def _unpack_text(value):
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        return value
+
+    # Columns a bulk partial update may set
+    METADATA_COLUMNS = ('tags', 'notes', 'bookmarks', 'bookmarks_flat')
+
+    def update_pdf_metadata_many(self, columns, rows):
+        """
+        Upsert many (file_path, *values) rows, setting only `columns`.
+        One prepared statement and one transaction for the whole batch.
+        New rows get '' for the text columns not provided.
+        """
+        columns = list(columns)
+        unknown = set(columns) - set(self.METADATA_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown metadata columns: {sorted(unknown)}")
+        rows = list(rows)
+        if not rows:
+            return
+        
+        defaults = [c for c in ('tags', 'notes', 'bookmarks') if c not in columns]
+        insert_cols = ", ".join(["file_path"] + columns + defaults + ["last_modified"])
+        values = ", ".join(["?"] * (1 + len(columns)) + ["''"] * len(defaults) + ["?"])
+        updates = ", ".join(f"{c}=excluded.{c}" for c in columns + ["last_modified"])
+        sql = (f"INSERT INTO pdf_metadata ({insert_cols}) VALUES ({values}) "
+               f"ON CONFLICT(file_path) DO UPDATE SET {updates}")
+        
+        packed = [i + 1 for i, c in enumerate(columns) if c in self.COMPRESSED_COLUMNS]
+        if packed:
+            rows = [
+                tuple(self._pack_text(v) if i in packed else v for i, v in enumerate(row))
+                for row in rows
+            ]
+        
+        modified = int(time.time())
+        with self._write([row[0] for row in rows]) as conn:
+            conn.executemany(sql, [(*row, modified) for row in rows])
+
+    HISTORY_COLUMNS = ['original_path', 'filename', 'category', 'target_path', 'status', 'action']
 
     def save_history(self, df):
         """Save operations history to SQLite."""
@@ -144,28 +409,29 @@ class Storage:
             return
 
         # Ensure timestamp is string for SQLite
-        df['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # Filter columns to match table schema
-        cols = ['timestamp', 'original_path', 'filename', 'category', 'target_path', 'status', 'action']
+        # Plain Python values column by column (NaN -> NULL); missing columns are NULL
+        columns = [
+            df[col].astype(object).where(df[col].notna(), None).tolist()
+            if col in df.columns else [None] * len(df)
+            for col in self.HISTORY_COLUMNS
+        ]
+        rows = zip(repeat(timestamp), *columns)
         
-        # If df doesn't have some columns, add them
-        for col in cols:
-            if col not in df.columns:
-                df[col] = None
-
-        save_df = df[cols].copy()
-        
-        conn = sqlite3.connect(self.db_path)
-        save_df.to_sql('history', conn, if_exists='append', index=False)
-        conn.close()
+        with self._write() as conn:
+            conn.executemany(
+                f"INSERT INTO history (timestamp, {', '.join(self.HISTORY_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(self.HISTORY_COLUMNS) + 1))})",
+                rows
+            )
 
     def get_history(self):
         """Retrieve history as DataFrame."""
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM history", conn)
-        conn.close()
-        return df
+        with self._read() as conn:
+            cursor = conn.execute("SELECT * FROM history")
+            rows = cursor.fetchall()
+        return pd.DataFrame.from_records(rows, columns=[d[0] for d in cursor.description])
 
     def export_json(self, df, path):
         """Export current operations to JSON."""
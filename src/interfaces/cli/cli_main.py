@@ -2,13 +2,35 @@ import argparse
 import sys
 from ...core.app import CoreApp
 
-def run():
+def print_table(df, columns, out=None):
+    """
+    Write df[columns] as left-aligned text rows, one row at a time, so output
+    starts at once and no full-table string is built. Column widths come
+    from one vectorized length pass per column.
+    """
+    out = out or sys.stdout
+    text = df[columns].astype(str)
+    # No rows (empty folder or filter): .max() is NaN, so headers set the width
+    widths = [max(len(c), int(text[c].str.len().max()) if len(text) else 0) for c in columns]
+    # Last column unpadded: no trailing spaces
+    fmt = "  ".join([f"{{:<{w}}}" for w in widths[:-1]] + ["{}"])
+    out.write(fmt.format(*columns) + "\n")
+    for row in text.itertuples(index=False, name=None):
+        out.write(fmt.format(*row) + "\n")
+
+def _build_parser():
     parser = argparse.ArgumentParser(description="CoreApp File Organizer")
     parser.add_argument("path", nargs="?", default=".", help="Directory to organize")
     parser.add_argument("--dry-run", action="store_true", help="Simulate without moving files")
     parser.add_argument("--export", help="Export scan results to JSON file")
-    
-    args = parser.parse_args()
+    return parser
+
+# Built once at import; parse_args does not mutate it, so run() can be
+# called repeatedly (tests, shell-completion tooling can introspect it)
+PARSER = _build_parser()
+
+def run(argv=None):
+    args = PARSER.parse_args(argv)
     
     # 1. Initialize App
     try:
@@ -31,7 +53,7 @@ def run():
     # Preview
     if 'filename' in df.columns:
         print("\n--- Preview ---")
-        print(df[['filename', 'category', 'target_path']].to_string(index=False))
+        print_table(df, ['filename', 'category', 'target_path'])
         print("---------------\n")
 
     # 3. Export if requested
@@ -50,8 +72,15 @@ def run():
 
     # 5. Summary
     if not result_df.empty:
-        success_count = len(result_df[result_df['status'].str.contains('success')])
-        error_count = len(result_df[result_df['status'].str.contains('error')])
+        # Statuses are a few fixed labels, errors carry a message after ':'.
+        # One hashed pass counts the distinct values; only those (not every
+        # row) are then split down to their label.
+        counts = {}
+        for status, n in result_df['status'].value_counts().items():
+            label = status.partition(':')[0]
+            counts[label] = counts.get(label, 0) + n
+        success_count = int(counts.get('success', 0) + counts.get('dry_run_success', 0))
+        error_count = int(counts.get('error', 0))
         print(f"\nSummary: {success_count} moved, {error_count} errors.")
 
 if __name__ == "__main__":
@@ -5,13 +5,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QPixmapCache
 from src.apps.pdf_ms.controllers.main_controller import MainController
 
 def main():
     app = QApplication(sys.argv)
+    # Reader page pixmaps are cached here; the 10 MB default holds only a few pages
+    QPixmapCache.setCacheLimit(256 * 1024) # KB
     controller = MainController()
     controller.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    controller.app_core.close()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
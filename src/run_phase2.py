@@ -14,9 +14,9 @@ def create_dummy_pdf(path):
     page = doc.new_page()
     page.insert_text((50, 50), "Chapter 1 Content")
     
-    # Add ToC: [level, title, page_num]
-    # page_num is 1-based in fitz.set_toc? No, usually handles mapping. 
-    # fitz.set_toc expects list of [lvl, title, page]
+    # Add ToC: [level, title, page_num], page_num 1-based.
+    # Keep the 3-item form: set_toc then takes page xref/cropbox directly,
+    # while a dest dict with "to" loads every referenced page.
     toc = [
         [1, "Chapter 1", 1],
         [2, "Section 1.1", 1]
@@ -45,6 +45,12 @@ def main():
         img_data = PDFRenderer.render_page(test_pdf, 1)
         assert len(img_data) > 0, "Render produced empty bytes"
         print(f"[OK] Page Rendering Verified ({len(img_data)} bytes)")
+
+        raw = PDFRenderer.render_page_raw(test_pdf, 1)
+        assert raw is not None, "Raw render failed"
+        samples, width, height, stride = raw
+        assert len(samples) == height * stride, "Raw sample size mismatch"
+        print(f"[OK] Raw Page Rendering Verified ({width}x{height})")
         
         toc = PDFEngine.extract_toc(test_pdf)
         print(f"Extracted ToC: {toc}")
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Make `src.*` importable from every test module (once per session)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "real_render: use the real PDFRenderer in reader UI tests")
+
+@pytest.fixture(scope="session")
+def qapp():
+    # One QApplication (not QCoreApplication, which widgets reject) shared by
+    # every Qt test, whatever order the modules run in
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+@pytest.fixture
+def core_app(tmp_path):
+    # CoreApp on a throwaway settings.json / SQLite DB under tmp_path
+    from src.core.app import CoreApp
+    config = tmp_path / "settings.json"
+    config.write_text(json.dumps({"db_path": str(tmp_path / "meta.db")}))
+    app = CoreApp(config_path=str(config))
+    yield app
+    app.close()
+
+@pytest.fixture
+def make_pdf():
+    """
+    Factory writing a small PDF to path: `pages` blank pages, or one page per
+    (width, height) in `sizes`, plus an optional outline in fitz set_toc form.
+    """
+    import fitz
+    def make(path, pages=1, sizes=None, toc=None):
+        doc = fitz.open()
+        if sizes is None:
+            for _ in range(pages):
+                doc.new_page()
+        else:
+            for w, h in sizes:
+                doc.new_page(width=w, height=h)
+        if toc:
+            doc.set_toc(toc)
+        doc.save(str(path))
+        doc.close()
+        return path
+    return make
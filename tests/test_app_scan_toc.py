@@ -1,16 +1,12 @@
-import sys
 import os
+import warnings
 import pandas as pd
 import pytest
 
-# Add src to path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.join(current_dir, '..')
-sys.path.append(project_root)
-sys.path.append(os.path.join(project_root, 'src'))
-
 from src.core.app import CoreApp
 
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
 def test_scan_toc_population():
     # Setup
     app = CoreApp(config_path="config/settings.json")
@@ -34,15 +30,131 @@ def test_scan_toc_population():
     # Verify specific files
     # We know 'dummy_with_toc.pdf' has ToC, 'dummy_no_toc.pdf' does not.
     
-    row_with_toc = df[df['filename'] == 'dummy_with_toc.pdf']
-    if not row_with_toc.empty:
-        assert row_with_toc.iloc[0]['has_toc'] == True, "dummy_with_toc.pdf should have has_toc=True"
-        print("✓ dummy_with_toc.pdf verification passed")
-        
-    row_no_toc = df[df['filename'] == 'dummy_no_toc.pdf']
-    if not row_no_toc.empty:
-        assert row_no_toc.iloc[0]['has_toc'] == False, "dummy_no_toc.pdf should have has_toc=False"
-        print("✓ dummy_no_toc.pdf verification passed")
+    expected = {'dummy_with_toc.pdf': True, 'dummy_no_toc.pdf': False}
+    filenames = df['filename'].to_numpy()
+    has_toc = df['has_toc'].to_numpy()
+    for filename, want in expected.items():
+        hits = has_toc[filenames == filename]
+        if len(hits):
+            assert bool(hits[0]) is want, f"{filename} should have has_toc={want}"
+            print(f"✓ {filename} verification passed")
+
+def test_scan_enriches_with_bulk_metadata(core_app, tmp_path, make_pdf):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    make_pdf(docs / "toc.pdf", toc=[[1, "Chapter 1", 1]])
+    make_pdf(docs / "plain.pdf")
+    make_pdf(docs / "saved.pdf")
+    
+    saved = str((docs / "saved.pdf").resolve())
+    core_app.update_file_custom(saved, tags="work", notes="read", bookmarks='[{"title": "x"}]')
+    core_app.toggle_bookmark(saved)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        df = core_app.scan(str(docs)).set_index('filename')
+    
+    assert df.loc["saved.pdf", "tags"] == "work"
+    assert df.loc["saved.pdf", "notes"] == "read"
+    assert bool(df.loc["saved.pdf", "has_toc"]) is True
+    assert bool(df.loc["saved.pdf", "is_bookmarked"]) is True
+    
+    assert bool(df.loc["toc.pdf", "has_toc"]) is True
+    assert bool(df.loc["plain.pdf", "has_toc"]) is False
+    assert df.loc["plain.pdf", "tags"] == ""
+    assert bool(df.loc["plain.pdf", "is_bookmarked"]) is False
+
+def test_scan_reuses_cached_toc_checks(core_app, tmp_path, make_pdf, monkeypatch):
+    from src.core.services.pdf_engine import PDFEngine
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    make_pdf(docs / "toc.pdf", toc=[[1, "Chapter 1", 1]])
+    make_pdf(docs / "plain.pdf")
+    
+    opened = []
+    real_has_toc = PDFEngine.has_toc
+    monkeypatch.setattr(PDFEngine, "has_toc", staticmethod(lambda p: opened.append(p) or real_has_toc(p)))
+    PDFEngine.has_toc_cached.cache_clear()
+    
+    core_app.scan(str(docs))
+    assert len(opened) == 2
+    
+    # Fresh process cache: answers come from the toc_cache table
+    PDFEngine.has_toc_cached.cache_clear()
+    opened.clear()
+    df = core_app.scan(str(docs)).set_index('filename')
+    assert opened == []
+    assert bool(df.loc["toc.pdf", "has_toc"]) is True
+    assert bool(df.loc["plain.pdf", "has_toc"]) is False
+    
+    # A changed file is re-checked
+    make_pdf(docs / "plain.pdf", toc=[[1, "Chapter 1", 1]])
+    df = core_app.scan(str(docs)).set_index('filename')
+    assert [os.path.basename(p) for p in opened] == ["plain.pdf"]
+    assert bool(df.loc["plain.pdf", "has_toc"]) is True
+
+def test_scan_probes_toc_on_the_calling_thread(core_app, tmp_path, make_pdf, monkeypatch):
+    import threading
+    from src.core.services.pdf_engine import PDFEngine
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        make_pdf(docs / name)
+    
+    threads = []
+    real_has_toc = PDFEngine.has_toc
+    monkeypatch.setattr(PDFEngine, "has_toc", staticmethod(lambda p: threads.append(threading.current_thread()) or real_has_toc(p)))
+    PDFEngine.has_toc_cached.cache_clear()
+    
+    # fitz is not thread-safe: cache misses are opened one by one, never from a pool
+    core_app.scan(str(docs))
+    assert threads == [threading.current_thread()] * 3
+
+def test_scan_worker_delivers_results_on_gui_thread(qapp, core_app, tmp_path, make_pdf):
+    from PyQt6.QtCore import Qt, QThread, QThreadPool
+    from src.apps.pdf_ms.controllers.scan_worker import ScanWorker
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    make_pdf(docs / "one.pdf")
+    
+    results, progress = [], []
+    worker = ScanWorker(core_app, str(docs), generation=7)
+    worker.signals.finished.connect(
+        lambda path, gen, df: results.append((path, gen, df, QThread.currentThread())),
+        Qt.ConnectionType.QueuedConnection)
+    worker.signals.progress.connect(lambda g, c, t, m: progress.append((g, m)), Qt.ConnectionType.QueuedConnection)
+    QThreadPool.globalInstance().start(worker)
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+    
+    assert len(results) == 1
+    path, gen, df, thread = results[0]
+    assert (path, gen) == (str(docs), 7)
+    assert df['filename'].tolist() == ["one.pdf"]
+    assert thread is qapp.thread()
+    assert progress[-1] == (7, "Scan complete")
+    assert core_app._observers == []
+    # The worker leaves shared state alone; the GUI thread adopts the plan
+    assert core_app.current_plan is None
+
+def test_scan_reuses_directory_stat_results(core_app, tmp_path, make_pdf, monkeypatch):
+    import src.core.app as core_app_module
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    make_pdf(docs / "a.pdf")
+    make_pdf(docs / "sub" / "b.pdf")
+    
+    plan = core_app.organizer.scan_directory(str(docs), recursive=True)
+    st = os.stat(docs / "sub" / "b.pdf")
+    row = plan.set_index('filename').loc["b.pdf"]
+    assert (row['mtime_ns'], row['size']) == (st.st_mtime_ns, st.st_size)
+    assert len(core_app.organizer.scan_directory(str(docs))) == 1
+    
+    stat_calls = []
+    monkeypatch.setattr(core_app_module, "_stat_key", lambda p: stat_calls.append(p))
+    df = core_app.scan(str(docs), recursive=True)
+    assert stat_calls == []
+    assert sorted(df['filename']) == ["a.pdf", "b.pdf"]
 
 if __name__ == "__main__":
     try:
@@ -53,3 +53,14 @@ def test_update_existing_record(storage, bookmark_service):
     assert meta['is_bookmarked'] == 1
     assert meta['tags'] == "work"
     assert meta['notes'] == "important"
+
+def test_set_bookmarks_in_one_batch(core_app):
+    core_app.update_file_metadata("/a.pdf", "keep", "me")
+    core_app.set_bookmarks(["/a.pdf", "/b.pdf"], True)
+    
+    meta = core_app.storage.get_pdf_metadata_bulk(["/a.pdf", "/b.pdf"])
+    assert meta['is_bookmarked'].astype(bool).tolist() == [True, True]
+    assert core_app.pdf_manager.get_metadata("/a.pdf")['tags'] == "keep"
+    
+    core_app.set_bookmarks(["/b.pdf"], False)
+    assert core_app.bookmark_service.is_bookmarked("/b.pdf") is False
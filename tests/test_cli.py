@@ -0,0 +1,19 @@
+import io
+
+import pandas as pd
+
+from src.interfaces.cli.cli_main import print_table
+
+def test_print_table_aligns_columns():
+    out = io.StringIO()
+    print_table(pd.DataFrame({"name": ["a.pdf", "long_name.pdf"], "size": [1, 22]}), ["name", "size"], out)
+    assert out.getvalue().splitlines() == [
+        "name           size",
+        "a.pdf          1",
+        "long_name.pdf  22",
+    ]
+
+def test_print_table_with_no_rows_prints_the_header():
+    out = io.StringIO()
+    print_table(pd.DataFrame(columns=["a", "b"]), ["a", "b"], out)
+    assert out.getvalue() == "a  b\n"
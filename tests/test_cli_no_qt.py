@@ -0,0 +1,20 @@
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def test_core_and_cli_import_without_qt(tmp_path):
+    """Headless entry points must not pull in PyQt6 (blocked here outright)."""
+    config = tmp_path / "settings.json"
+    config.write_text(json.dumps({"db_path": str(tmp_path / "history.db")}))
+    code = (
+        "import sys; sys.modules['PyQt6'] = None\n"
+        "from src.core.app import CoreApp\n"
+        "import src.interfaces.cli.cli_main\n"
+        f"CoreApp(config_path={str(config)!r}).close()\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,51 @@
+import os
+import pandas as pd
+
+from src.core.data_processor import DataProcessor
+
+def _scan_df(paths):
+    return pd.DataFrame({
+        'original_path': paths,
+        'filename': [os.path.basename(p) for p in paths],
+        'extension': [os.path.splitext(p)[1] for p in paths],
+    })
+
+def test_process_scan_results_matches_per_row_logic(tmp_path):
+    root = str(tmp_path)
+    outside = os.path.join(os.path.dirname(root), "elsewhere", "x.pdf")
+    paths = [
+        os.path.join(root, "a.pdf"),
+        os.path.join(root, "sub", "my.report.v2.PDF"),
+        os.path.join(root, "notes.txt"),
+        outside,
+    ]
+    df = DataProcessor().process_scan_results(_scan_df(paths), root_path=root)
+    
+    expected_paths = [p for p in paths if p.lower().endswith('.pdf')]
+    assert df['original_path'].tolist() == expected_paths
+    assert df['relative_path'].tolist() == [os.path.relpath(p, start=root) for p in expected_paths]
+    assert df['filename_no_ext'].tolist() == [os.path.splitext(os.path.basename(p))[0] for p in expected_paths]
+    assert df['file_type'].tolist() == ["PDF File"] * 3
+
+def test_process_scan_results_missing_root_keeps_paths(tmp_path):
+    missing = str(tmp_path / "gone")
+    paths = [os.path.join(missing, "a.pdf")]
+    df = DataProcessor().process_scan_results(_scan_df(paths), root_path=missing)
+    assert df['relative_path'].tolist() == paths
+
+def test_update_metadata_uses_path_index():
+    processor = DataProcessor()
+    df = _scan_df(["/r/a.pdf", "/r/b.pdf"])
+    df['tags'] = ''
+    df['notes'] = ''
+    
+    df = processor.update_metadata(df, "/r/b.pdf", "t", "n")
+    assert df.loc[1, ['tags', 'notes']].tolist() == ["t", "n"]
+    assert df.loc[0, 'tags'] == ''
+    
+    # Unknown paths are ignored; reordering in place is detected
+    processor.update_metadata(df, "/r/missing.pdf", "x", "x")
+    df.sort_values('original_path', ascending=False, inplace=True, ignore_index=True)
+    processor.update_metadata(df, "/r/a.pdf", "ta", "na")
+    assert df.loc[1, ['original_path', 'tags']].tolist() == ["/r/a.pdf", "ta"]
+    assert (df['tags'] == 'x').sum() == 0
@@ -0,0 +1,99 @@
+import fitz
+
+from src.core.services import doc_cache
+from src.core.services.pdf_engine import PDFEngine
+from src.core.services.pdf_renderer import PDFRenderer
+
+def test_renders_share_one_open_document(tmp_path, make_pdf, monkeypatch):
+    path = tmp_path / "a.pdf"
+    make_pdf(path, pages=2, toc=[[1, "Intro", 1]])
+    doc_cache.clear()
+    
+    opened = []
+    real_open = fitz.open
+    monkeypatch.setattr(fitz, "open", lambda *a, **k: opened.append(a) or real_open(*a, **k))
+    
+    assert PDFRenderer.render_page_raw(str(path), 1) is not None
+    assert PDFRenderer.render_page_raw(str(path), 2) is not None
+    assert PDFRenderer.get_page_count(str(path)) == 2
+    assert len(opened) == 1
+    
+    doc_cache.close(str(path))
+    PDFRenderer.get_page_count(str(path))
+    assert len(opened) == 2
+    doc_cache.clear()
+
+def test_toc_extraction_leaves_no_cached_handle(tmp_path, make_pdf):
+    # Batch ToC generation renames files afterwards; an open handle blocks that on Windows
+    path = tmp_path / "a.pdf"
+    make_pdf(path, pages=1, toc=[[1, "Intro", 1]])
+    doc_cache.clear()
+    assert PDFEngine.extract_toc(str(path))[0]['title'] == "Intro"
+    assert str(path) not in doc_cache._entries
+
+def test_changed_file_is_reopened(tmp_path, make_pdf):
+    path = tmp_path / "a.pdf"
+    make_pdf(path, pages=1)
+    doc_cache.clear()
+    assert PDFRenderer.get_page_count(str(path)) == 1
+    
+    make_pdf(path, pages=3)
+    assert PDFRenderer.get_page_count(str(path)) == 3
+    doc_cache.clear()
+
+def test_cache_is_bounded(tmp_path, make_pdf, monkeypatch):
+    monkeypatch.setattr(doc_cache, "MAX_OPEN_DOCUMENTS", 2)
+    doc_cache.clear()
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"{i}.pdf"))
+        make_pdf(paths[-1])
+        PDFRenderer.get_page_count(paths[-1])
+    assert list(doc_cache._entries) == paths[1:]
+    doc_cache.clear()
+
+def test_close_all_releases_cached_handles(tmp_path, make_pdf):
+    path = tmp_path / "a.pdf"
+    make_pdf(path, pages=1)
+    doc_cache.clear()
+    PDFRenderer.render_page(str(path), 1)
+    assert str(path) in doc_cache._entries
+    
+    PDFRenderer.close_all()
+    assert not doc_cache._entries
+
+def test_missing_or_non_pdf_paths_fail_quietly(tmp_path, make_pdf, capsys):
+    missing = str(tmp_path / "missing.PDF")
+    assert PDFEngine.has_toc(missing) is False
+    assert PDFEngine.extract_toc(missing) == []
+    assert capsys.readouterr().out == ""
+    
+    path = tmp_path / "a.pdf"
+    make_pdf(path, toc=[[1, "Intro", 1]])
+    assert PDFEngine.has_toc(str(path)) is True
+    assert PDFEngine.has_toc(str(path)[:-4] + ".txt") is False
+    doc_cache.clear()
+
+def test_fitz_work_waits_for_the_process_lock(tmp_path, make_pdf):
+    import threading
+    from src.core.services.fitz_lock import FITZ_LOCK
+    path = tmp_path / "a.pdf"
+    make_pdf(path, toc=[[1, "Intro", 1]])
+    doc_cache.clear()
+    
+    results = {}
+    workers = [
+        threading.Thread(target=lambda: results.update(toc=PDFEngine.has_toc(str(path)))),
+        threading.Thread(target=lambda: results.update(pages=PDFRenderer.get_page_count(str(path)))),
+    ]
+    with FITZ_LOCK:
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join(0.2)
+        # Neither the ToC probe nor the render may touch fitz concurrently
+        assert results == {}
+    for t in workers:
+        t.join()
+    assert results == {"toc": True, "pages": 1}
+    doc_cache.clear()
@@ -1,57 +1,70 @@
 
 import unittest
 import os
-import shutil
 import pandas as pd
-import sys
-import time
+import pytest
+from datetime import datetime, timedelta
 from pathlib import Path
-
-# Add project root to sys.path
-sys.path.append(str(Path(__file__).resolve().parent.parent))
+from unittest import mock
 
 from src.core.storage import Storage
 from src.core.app import CoreApp
+from src.core.data_processor import DataProcessor
 
 class TestHistory(unittest.TestCase):
-    def setUp(self):
-        # Setup temporary test environment
-        self.test_dir = Path("test_history_env")
-        self.test_dir.mkdir(exist_ok=True)
+    @pytest.fixture(autouse=True)
+    def _env(self, tmp_path):
+        # pytest's tmp_path: created and cleaned up for us, unique per test
+        self.test_dir = tmp_path
         self.db_path = self.test_dir / "history.db"
         self.storage = Storage(str(self.db_path))
         
         # Create some fake folders
-        (self.test_dir / "folder_a").mkdir(exist_ok=True)
-        (self.test_dir / "folder_b").mkdir(exist_ok=True)
-
-    def tearDown(self):
-        # Cleanup
-        if self.test_dir.exists():
-            try:
-                shutil.rmtree(self.test_dir)
-            except PermissionError:
-                pass # Sometimes windows holds lock
+        (self.test_dir / "folder_a").mkdir()
+        (self.test_dir / "folder_b").mkdir()
+        yield
+        # Release the file so the temp dir can be removed on Windows
+        self.storage.close()
 
     def test_save_and_get_history(self):
         path_a = str((self.test_dir / "folder_a").resolve())
         path_b = str((self.test_dir / "folder_b").resolve())
         
-        self.storage.save_root_history(path_a)
-        time.sleep(1.1) # Wait to ensure timestamp difference
-        self.storage.save_root_history(path_b)
+        # Consecutive calls land in the same second; feed a fake clock
+        # instead of sleeping so the ordering is deterministic
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        ticks = [start + timedelta(microseconds=i) for i in range(3)]
+        with mock.patch('src.core.storage.datetime') as clock:
+            clock.now.side_effect = ticks
+            self.storage.save_root_history(path_a)
+            self.storage.save_root_history(path_b)
+            
+            # Check order (most recent first)
+            history = self.storage.get_root_history()
+            self.assertEqual(len(history), 2)
+            self.assertEqual(history[0], path_b)
+            self.assertEqual(history[1], path_a)
+            
+            # Update path_a access time
+            self.storage.save_root_history(path_a)
+            history = self.storage.get_root_history()
+            self.assertEqual(history[0], path_a)
+
+    def test_save_history_many(self):
+        path_a = str((self.test_dir / "folder_a").resolve())
+        path_b = str((self.test_dir / "folder_b").resolve())
+        
+        # One transaction; the last path counts as the most recent
+        self.storage.save_root_history_many([path_a, path_b])
+        self.assertEqual(self.storage.get_root_history(), [path_b, path_a])
         
-        # Check order (most recent first)
-        history = self.storage.get_root_history()
-        self.assertEqual(len(history), 2)
-        self.assertEqual(history[0], path_b)
-        self.assertEqual(history[1], path_a)
+        # Re-saving existing paths updates them in place
+        self.storage.save_root_history_many([path_b, path_a])
+        self.assertEqual(self.storage.get_root_history(), [path_a, path_b])
         
-        # Update path_a access time
-        time.sleep(1.1)
-        self.storage.save_root_history(path_a)
-        history = self.storage.get_root_history()
-        self.assertEqual(history[0], path_a)
+        self.storage.save_root_history_many([])
+        self.assertEqual(len(self.storage.get_root_history()), 2)
+        self.assertEqual(self.storage.get_root_history(limit=1), [path_a])
 
     def test_relative_path_logic(self):
         # Simulate DataFrame logic from Controller
@@ -61,16 +74,20 @@ class TestHistory(unittest.TestCase):
         file = sub / "test.pdf"
         file.touch()
         
+        outside = (self.test_dir / "folder_b" / "other.pdf").resolve()
         df = pd.DataFrame([{
             'original_path': str(file.resolve()),
             'filename': 'test.pdf'
+        }, {
+            'original_path': str(outside),
+            'filename': 'other.pdf'
         }])
         
+        # Same vectorized prefix strip the controller's data pipeline uses
         root_path = str(root.resolve())
-        df['relative_path'] = df['original_path'].apply(lambda x: os.path.relpath(x, start=root_path))
+        df['relative_path'] = DataProcessor._relative_paths(df['original_path'], root_path)
         
         expected_rel = os.path.join("sub", "test.pdf")
         self.assertEqual(df.iloc[0]['relative_path'], expected_rel)
-
-if __name__ == '__main__':
-    unittest.main()
+        # Rows outside the root fall back to os.path.relpath
+        self.assertEqual(df.iloc[1]['relative_path'], os.path.join("..", "folder_b", "other.pdf"))
@@ -0,0 +1,20 @@
+import pytest
+
+from src.core.services import json_codec
+
+TOC = [{"title": "Chapitre é", "page": 3, "dest_y": 12.5, "children": [], "user_note": ""}]
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_round_trip_returns_str(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    
+    encoded = json_codec.dumps(TOC)
+    assert isinstance(encoded, str)
+    assert json_codec.loads(encoded) == TOC
+
+def test_iter_items_yields_array_elements(monkeypatch):
+    monkeypatch.setattr(json_codec, "ijson", None)
+    assert list(json_codec.iter_items(json_codec.dumps(TOC * 3))) == TOC * 3
@@ -0,0 +1,105 @@
+import os
+
+def test_scan_plan_columns_match_per_file_logic(core_app, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ["a.PDF", "b.txt", "noext", ".hidden"]:
+        (docs / name).write_bytes(b"x")
+    
+    organizer = core_app.organizer
+    plan = organizer.scan_directory(str(docs)).set_index('filename')
+    assert sorted(plan.index) == [".hidden", "a.PDF", "b.txt", "noext"]
+    for name, row in plan.iterrows():
+        ext = os.path.splitext(name)[1]
+        assert row['extension'] == ext
+        assert row['category'] == organizer._get_category(ext)
+        assert row['target_path'] == os.path.join(str(docs), row['category'], name)
+        assert (row['status'], row['action']) == ("pending", "move")
+    assert organizer.scan_directory(str(tmp_path / "empty")).empty
+
+def test_organize_moves_pending_files(core_app, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.pdf").write_bytes(b"x")
+    (docs / "b.pdf").write_bytes(b"y")
+    
+    plan = core_app.organizer.scan_directory(str(docs))
+    plan.loc[plan['filename'] == "b.pdf", 'status'] = "skipped"
+    
+    dry = core_app.organizer.organize(plan, dry_run=True).set_index('filename')
+    assert dry.loc["a.pdf", 'status'] == "dry_run_success"
+    assert (docs / "a.pdf").exists()
+    
+    result = core_app.organizer.organize(plan).set_index('filename')
+    assert result.loc["a.pdf", 'status'] == "success"
+    assert result.loc["b.pdf", 'status'] == "skipped"
+    assert os.path.exists(result.loc["a.pdf", 'target_path'])
+    assert not (docs / "a.pdf").exists()
+    assert plan['status'].tolist().count("pending") == 1 # input left untouched
+
+def test_organize_assigns_unique_names_from_one_listing(core_app, tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    (root / "sub1").mkdir(parents=True)
+    (root / "sub2").mkdir()
+    (root / "sub1" / "a.pdf").write_bytes(b"1")
+    (root / "sub2" / "a.pdf").write_bytes(b"2")
+    
+    plan = core_app.organizer.scan_directory(str(root), recursive=True)
+    target_dir = plan['target_dir'].iloc[0]
+    os.makedirs(target_dir)
+    for name in ["a.pdf", "a_1.pdf"]:
+        open(os.path.join(target_dir, name), "wb").close()
+    
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda p: listings.append(p) or real_listdir(p))
+    
+    # Dry runs reserve names too, so both files get distinct targets
+    dry = core_app.organizer.organize(plan, dry_run=True)
+    assert sorted(os.path.basename(p) for p in dry['target_path']) == ["a_2.pdf", "a_3.pdf"]
+    assert len(listings) == 1
+    
+    result = core_app.organizer.organize(plan)
+    assert (result['status'] == "success").all()
+    assert sorted(os.listdir(target_dir)) == ["a.pdf", "a_1.pdf", "a_2.pdf", "a_3.pdf"]
+
+def test_organize_keeps_free_names_and_never_overwrites(core_app, tmp_path):
+    root = tmp_path / "root"
+    for sub in ("s1", "s2", "s3"):
+        (root / sub).mkdir(parents=True)
+        (root / sub / "x.pdf").write_bytes(sub.encode())
+    
+    plan = core_app.organizer.scan_directory(str(root), recursive=True)
+    dry = core_app.organizer.organize(plan, dry_run=True)
+    assert sorted(os.path.basename(p) for p in dry['target_path']) == ["x.pdf", "x_1.pdf", "x_2.pdf"]
+    
+    # A file that appears after names were resolved is left alone
+    src, dst = root / "s1" / "x.pdf", root / "s2" / "x.pdf"
+    assert core_app.organizer._move(src, dst).startswith("error: target exists")
+    assert src.read_bytes() == b"s1" and dst.read_bytes() == b"s2"
+
+def test_organize_moves_in_parallel_and_reports_per_dir_errors(core_app, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    names = [f"f{i}.pdf" for i in range(20)] + ["x.zip"]
+    for name in names:
+        (docs / name).write_bytes(b"x")
+    
+    core_app.settings.save_config({"file_categories": {"Docs": [".pdf"]}})
+    plan = core_app.organizer.scan_directory(str(docs))
+    blocked = plan.set_index('filename').loc["x.zip", 'target_dir']
+    with open(blocked, "w"): # A file where the directory should go
+        pass
+    
+    result = core_app.organizer.organize(plan).set_index('filename')
+    assert (result.loc[names[:-1], 'status'] == "success").all()
+    assert all(os.path.exists(p) for p in result.loc[names[:-1], 'target_path'])
+    assert result.loc["x.zip", 'status'].startswith("error:")
+    assert (docs / "x.zip").exists()
+
+def test_category_lookup_follows_settings_changes(core_app):
+    organizer = core_app.organizer
+    core_app.settings.save_config({"file_categories": {"Docs": [".PDF"], "Other Docs": [".pdf"]},
+                              "default_category": "Misc"})
+    assert organizer._get_category(".Pdf") == "Docs"
+    assert organizer._get_category(".zip") == "Misc"
@@ -0,0 +1,44 @@
+from src.core.services import json_codec
+
+def test_bookmarks_update_keeps_flat_index_in_sync(core_app):
+    toc = [{"title": "A", "page": 1, "dest_y": 0.0, "user_note": "", "children": [
+        {"title": "A.1", "page": 2, "dest_y": 0.0, "user_note": "x", "children": []}]}]
+    core_app.update_file_custom("/doc.pdf", bookmarks=json_codec.dumps(toc))
+    
+    meta = core_app.pdf_manager.get_metadata("/doc.pdf")
+    assert json_codec.loads(meta['bookmarks_flat']) == [[1, "A", 1, 0.0, ""], [2, "A.1", 2, 0.0, "x"]]
+    
+    # Unrelated updates leave it alone; clearing bookmarks clears it
+    core_app.update_file_metadata("/doc.pdf", "tag", "note")
+    assert core_app.pdf_manager.get_metadata("/doc.pdf")['bookmarks_flat'] == meta['bookmarks_flat']
+    core_app.update_file_custom("/doc.pdf", bookmarks="")
+    assert core_app.pdf_manager.get_metadata("/doc.pdf")['bookmarks_flat'] == ""
+
+def test_metadata_reads_never_write(core_app, monkeypatch):
+    toc = [{"title": "A", "page": 1, "dest_y": 0.0, "user_note": "", "children": []}]
+    core_app.update_file_custom("/doc.pdf", bookmarks=json_codec.dumps(toc))
+    core_app.storage._meta_cache.clear()
+    
+    writes = []
+    monkeypatch.setattr(core_app.storage, "_write", lambda *a: writes.append(a))
+    meta = core_app.pdf_manager.get_metadata("/doc.pdf")
+    assert json_codec.loads(meta['bookmarks']) == toc
+    assert 'bookmarks_mp' not in meta
+    assert writes == []
+
+def test_bulk_custom_update_sets_only_given_fields(core_app):
+    core_app.update_file_metadata("/a.pdf", "old", "keep me")
+    toc = [{"title": "A", "page": 1, "dest_y": 0.0, "user_note": "", "children": []}]
+    
+    core_app.update_files_custom_bulk([
+        {"file_path": "/a.pdf", "tags": "new"},
+        {"file_path": "/b.pdf", "tags": "fresh"},
+        {"file_path": "/c.pdf", "bookmarks": json_codec.dumps(toc)},
+    ])
+    
+    a = core_app.pdf_manager.get_metadata("/a.pdf")
+    assert (a['tags'], a['notes']) == ("new", "keep me")
+    b = core_app.pdf_manager.get_metadata("/b.pdf")
+    assert (b['tags'], b['notes'], b['bookmarks']) == ("fresh", "", "")
+    c = core_app.pdf_manager.get_metadata("/c.pdf")
+    assert json_codec.loads(c['bookmarks_flat']) == [[1, "A", 1, 0.0, ""]]
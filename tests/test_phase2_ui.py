@@ -1,20 +1,8 @@
-import sys
-import os
 import pytest
 import fitz
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QThreadPool
 
-# Add project root
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.apps.pdf_ms.views.reader_window import ReaderWindow
-
-@pytest.fixture(scope="session")
-def qapp():
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    yield app
+from src.apps.pdf_ms.views.reader import ReaderWindow
 
 @pytest.fixture
 def dummy_pdf(tmp_path):
@@ -47,14 +35,17 @@ def test_reader_window_launch(qapp, dummy_pdf, mock_core_app):
         assert "test.pdf" in window.windowTitle()
         
         # Check widgets exist
-        assert window.toc_tree is not None
-        assert window.image_label is not None
+        assert window.toc_panel.toc_tree is not None
+        assert window.viewer is not None
         
         # Check initial state
-        assert window.current_page == 1
+        assert window.viewer.current_page == 1
+        assert window.viewer.total_pages == 1
         
-        # Determine if image was loaded (pixmap should be set)
-        assert window.image_label.pixmap() is not None
+        # Determine if image was loaded (rendered off the UI thread)
+        QThreadPool.globalInstance().waitForDone()
+        qapp.processEvents()
+        assert not window.viewer._pix_item.pixmap().isNull()
         
         window.close()
         print("ReaderWindow Launch Test Passed")
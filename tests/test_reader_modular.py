@@ -1,10 +1,7 @@
-import sys
-import os
 import pytest
-from PyQt6.QtWidgets import QApplication
-
-# Add project root to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QPixmap, QPixmapCache
 
 from src.apps.pdf_ms.views.reader import ReaderWindow
 from src.apps.pdf_ms.views.reader.components import PDFToolbar, PDFViewerPanel, ToCPanel, MetadataPanel
@@ -25,20 +22,16 @@ class MockPDFManager:
     def get_metadata(self, path):
         return {'tags': '', 'notes': '', 'bookmarks': ''}
 
-@pytest.fixture(scope="session")
-def qapp():
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    yield app
+@pytest.fixture(autouse=True)
+def _stub_renderer(request, monkeypatch):
+    """Reader UI tests check layout and scheduling, not pixels: skip MuPDF rasterizing."""
+    if request.node.get_closest_marker("real_render") is None:
+        monkeypatch.setattr(PDFRenderer, "render_page_raw", lambda f, p, z: None)
 
-def test_reader_window_initialization(qapp, monkeypatch):
+def test_reader_window_initialization(qapp):
     """
     Test that ReaderWindow initializes correctly with all modular components.
     """
-    # Patch PDFRenderer to avoid file errors
-    monkeypatch.setattr(PDFRenderer, "get_page_count", lambda f: 10)
-    monkeypatch.setattr(PDFRenderer, "render_page", lambda f, p, z: b'')
     
     core_app = MockCoreApp()
     # Use a dummy file path
@@ -84,16 +77,13 @@ def test_toc_panel_structure(qapp):
     assert panel.note_editor is not None
     assert panel.btn_save_toc is not None
 
-def test_toc_navigation_triggers_mode(qapp, monkeypatch):
-    # Patch PDFRenderer
-    monkeypatch.setattr(PDFRenderer, "get_page_count", lambda f: 10)
-    monkeypatch.setattr(PDFRenderer, "render_page", lambda f, p, z: b'')
+def test_toc_navigation_triggers_mode(qapp, tmp_path, make_pdf):
+    pdf_path = tmp_path / "nav.pdf"
+    make_pdf(pdf_path, sizes=[(200, 300)] * 10)
     
     core_app = MockCoreApp()
-    window = ReaderWindow("test.pdf", core_app)
-    
-    # Mock _calculate_fit_zoom to avoid fitz.open error
-    window.viewer._calculate_fit_zoom = lambda: None
+    window = ReaderWindow(str(pdf_path), core_app)
+    assert window.viewer.total_pages == 10
     
     # Force initial mode to 'page'
     window.viewer.view_mode = "page"
@@ -109,3 +99,399 @@ def test_toc_navigation_triggers_mode(qapp, monkeypatch):
     assert window.viewer.current_page == 5
     
     window.close()
+
+def test_viewer_caches_document_page_sizes(qapp, tmp_path, make_pdf):
+    pdf_path = tmp_path / "sizes.pdf"
+    make_pdf(pdf_path, sizes=[(200, 400), (300, 300)])
+
+    viewer = PDFViewerPanel()
+    viewer.load_document(str(pdf_path))
+    assert viewer._doc is not None
+    assert viewer._page_sizes.dtype == np.float32
+    assert viewer._page_sizes.tolist() == [[200, 400], [300, 300]]
+
+    viewer.view_mode = "width"
+    viewer.current_page = 2
+    viewer._calculate_fit_zoom()
+    view_w = viewer.graphics_view.viewport().width() - 20
+    assert viewer.zoom_level == pytest.approx(view_w / 300)
+
+    viewer.close_document()
+    assert viewer._doc is None
+    assert viewer._page_sizes.shape == (0, 2)
+
+def test_viewer_debounces_zoom_renders(qapp, monkeypatch):
+    calls = []
+    monkeypatch.setattr(PDFRenderer, "render_page_raw", lambda f, p, z: calls.append(z))
+
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    viewer.total_pages = 1
+    for _ in range(5):
+        viewer.zoom_in()
+    assert calls == []
+    assert viewer._render_timer.isActive()
+
+    viewer._render_timer.timeout.emit()
+    QThreadPool.globalInstance().waitForDone()
+    assert len(calls) == 1
+    assert not viewer._render_timer.isActive()
+
+def test_viewer_drops_stale_render_results(qapp):
+    viewer = PDFViewerPanel()
+    raw = (bytes(4 * 4 * 3), 4, 4, 4 * 3)
+
+    viewer._render_gen = 2
+    viewer._on_render_finished(1, 1, 1.0, 1.0, raw)
+    assert viewer._pix_item.pixmap().isNull()
+
+    viewer._on_render_finished(1, 2, 1.0, 1.0, raw)
+    assert viewer._pix_item.pixmap().width() == 4
+
+def test_viewer_renders_at_device_pixel_ratio(qapp, monkeypatch):
+    zooms = []
+    monkeypatch.setattr(PDFRenderer, "render_page_raw",
+                        lambda f, p, z: zooms.append(z) or (bytes(8 * 4 * 3), 8, 4, 8 * 3))
+
+    QPixmapCache.clear()
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    viewer.total_pages = 1
+    viewer.view_mode = "custom"
+    monkeypatch.setattr(viewer, "devicePixelRatioF", lambda: 2.0)
+    viewer.render_page()
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+
+    # Rasterized at zoom * DPR, laid out at the logical size
+    assert zooms == [2.0]
+    pixmap = viewer._pix_item.pixmap()
+    assert pixmap.devicePixelRatio() == 2.0
+    assert viewer._pix_item.boundingRect().width() == 4
+    # A 1x screen does not reuse the 2x page
+    assert viewer._cache_key(1, 1.0, 2.0) != viewer._cache_key(1, 1.0, 1.0)
+    assert QPixmapCache.find(viewer._cache_key(1, 1.0, 1.0)) is None
+
+def test_viewer_reuses_cached_pixmap(qapp, monkeypatch):
+    calls = []
+    monkeypatch.setattr(PDFRenderer, "render_page_raw", lambda f, p, z: calls.append(p))
+
+    QPixmapCache.clear()
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    viewer.total_pages = 3
+    pixmap = QPixmap(4, 4)
+    viewer._cache_pixmap(viewer._cache_key(2, viewer.zoom_level), pixmap)
+
+    viewer.go_to_page(2)
+    QThreadPool.globalInstance().waitForDone()
+    assert 2 not in calls
+    assert viewer._pix_item.pixmap().width() == 4
+
+
+    # The cache is shared: another viewer on the same file hits it too
+    other = PDFViewerPanel()
+    other.file_path = "test.pdf"
+    other.total_pages = 3
+    other.go_to_page(2)
+    QThreadPool.globalInstance().waitForDone()
+    assert 2 not in calls
+    assert other._pix_item.pixmap().width() == 4
+
+def test_viewer_prefetches_adjacent_pages(qapp, monkeypatch):
+    calls = []
+    monkeypatch.setattr(PDFRenderer, "render_page_raw", lambda f, p, z: calls.append(p))
+
+    QPixmapCache.clear()
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    viewer.total_pages = 5
+    viewer._cache_pixmap(viewer._cache_key(2, viewer.zoom_level), QPixmap(4, 4))
+
+    viewer.go_to_page(2)
+    viewer.go_to_page(2) # already queued: no duplicate prefetches
+    QThreadPool.globalInstance().waitForDone()
+    assert sorted(calls) == [1, 3, 4]
+
+def test_reader_panels_are_created_lazily(qapp):
+
+    window = ReaderWindow("test.pdf", MockCoreApp())
+    assert window._toc_panel is None
+    assert window._metadata_panel is None
+
+    panel = window.metadata_panel
+    assert isinstance(panel, MetadataPanel)
+    assert window.dock_meta.widget() is panel
+    assert window.metadata_panel is panel
+    assert window._toc_panel is None
+
+    window.close()
+
+def test_toc_panel_flushes_note_on_chapter_switch(qapp):
+    panel = ToCPanel()
+    toc = [
+        {'title': 'One', 'page': 1, 'children': []},
+        {'title': 'Two', 'page': 2, 'children': []},
+    ]
+    panel.load_toc(toc)
+    first = panel.toc_tree.topLevelItem(0)
+    second = panel.toc_tree.topLevelItem(1)
+
+    panel._on_toc_clicked(first, 0)
+    panel.note_editor.insertPlainText("first note")
+    # Typing alone does not touch the item data
+    assert 'user_note' not in toc[0]
+
+    panel._on_toc_clicked(second, 0)
+    # Written into the caller's ToC structure, not a copy
+    assert toc[0]['user_note'] == "first note"
+    assert panel._node_for(first) is toc[0]
+    assert panel.note_editor.toPlainText() == ''
+
+def test_toc_panel_builds_nested_tree_in_order(qapp):
+    panel = ToCPanel()
+    panel.load_toc([
+        {'title': 'A', 'page': 1, 'children': [
+            {'title': 'A.1', 'page': 1, 'children': []},
+            {'title': 'A.2', 'page': 2, 'children': [
+                {'title': 'A.2.1', 'page': 3, 'children': []},
+            ]},
+        ]},
+        {'title': 'B', 'page': 4, 'children': []},
+    ])
+    tree = panel.toc_tree
+    assert [tree.topLevelItem(i).text(0) for i in range(tree.topLevelItemCount())] == ['A', 'B']
+    a = tree.topLevelItem(0)
+    assert [a.child(i).text(0) for i in range(a.childCount())] == ['A.1', 'A.2']
+    assert a.child(1).child(0).text(0) == 'A.2.1'
+    assert a.isExpanded() and a.child(1).isExpanded()
+
+@pytest.mark.real_render
+def test_renderer_returns_raw_rgb_samples(tmp_path, make_pdf):
+    pdf_path = tmp_path / "raw.pdf"
+    make_pdf(pdf_path, sizes=[(100, 50)])
+    samples, width, height, stride = PDFRenderer.render_page_raw(str(pdf_path), 1, 2.0)
+    assert (width, height) == (200, 100)
+    assert stride >= width * 3
+    assert len(samples) == stride * height
+    assert PDFRenderer.render_page_raw(str(pdf_path), 2, 1.0) is None
+
+    import fitz
+    doc = fitz.open(str(pdf_path))
+    assert PDFRenderer.render_page_raw_from_doc(doc, 1, 2.0)[1:] == (200, 100, stride)
+    assert PDFRenderer.render_page_from_doc(doc, 1).startswith(b"\x89PNG")
+    doc.close()
+
+def test_same_view_mode_does_not_rerender(qapp, monkeypatch):
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    renders = []
+    monkeypatch.setattr(viewer, "render_page", lambda *a, **k: renders.append(a))
+
+    viewer.set_view_mode("width")
+    viewer.set_view_mode("width")
+    assert len(renders) == 1
+
+    toolbar = PDFToolbar()
+    emitted = []
+    toolbar.fit_width_requested.connect(lambda: emitted.append(True))
+    toolbar.act_fit_width.trigger()
+    toolbar.act_fit_width.trigger()
+    assert emitted == [True]
+    assert toolbar.act_fit_width.isChecked()
+
+def test_wheel_zoom_ticks_coalesce_into_one_render(qapp, monkeypatch):
+    from PyQt6.QtCore import QPointF, QPoint, Qt
+    from PyQt6.QtGui import QWheelEvent
+
+    viewer = PDFViewerPanel()
+    viewer.file_path = "test.pdf"
+    renders = []
+    monkeypatch.setattr(viewer, "render_page", lambda *a, **k: renders.append(viewer.zoom_level))
+
+    def wheel(dy):
+        return QWheelEvent(QPointF(5, 5), QPointF(5, 5), QPoint(0, 0), QPoint(0, dy),
+                           Qt.MouseButton.NoButton, Qt.KeyboardModifier.ControlModifier,
+                           Qt.ScrollPhase.NoScrollPhase, False)
+
+    for _ in range(3):
+        assert viewer.eventFilter(viewer.graphics_view.viewport(), wheel(120))
+    assert renders == []
+
+    viewer._zoom_timer.timeout.emit()
+    assert renders == [pytest.approx(1.2 ** 3)]
+    assert viewer._pending_zoom_factor == 1.0
+
+def test_fit_actions_are_exclusive(qapp):
+    toolbar = PDFToolbar()
+    emitted = []
+    toolbar.fit_height_requested.connect(lambda: emitted.append("height"))
+    toolbar.fit_content_requested.connect(lambda: emitted.append("content"))
+
+    toolbar.act_fit_width.trigger()
+    toolbar.act_fit_height.trigger()
+    assert toolbar.act_fit_height.isChecked()
+    assert not toolbar.act_fit_width.isChecked()
+
+    # Programmatic sync does not re-emit requests
+    toolbar.set_mode_checked("content")
+    assert toolbar.act_fit_content.isChecked()
+    assert not toolbar.act_fit_height.isChecked()
+    assert emitted == ["height"]
+
+def test_reader_fetches_metadata_once(qapp):
+
+    core_app = MockCoreApp()
+    calls = []
+    original = core_app.pdf_manager.get_metadata
+    core_app.pdf_manager.get_metadata = lambda path: calls.append(path) or original(path)
+
+    window = ReaderWindow("test.pdf", core_app)
+    window.toc_panel
+    window.metadata_panel
+    assert calls == ["test.pdf"]
+
+    window.close()
+
+def test_zoom_previews_with_view_transform(qapp):
+    viewer = PDFViewerPanel()
+    viewer._show_pixmap(QPixmap(10, 10), 1.0)
+    assert viewer.graphics_view.transform().m11() == pytest.approx(1.0)
+
+    viewer.zoom_in()
+    assert viewer.graphics_view.transform().m11() == pytest.approx(1.2)
+
+    # Re-rendered pixmap at the new zoom is shown 1:1 again
+    viewer._show_pixmap(QPixmap(12, 12), viewer.zoom_level)
+    assert viewer.graphics_view.transform().m11() == pytest.approx(1.0)
+
+def test_page_changed_updates_toolbar_after_event_loop(qapp, tmp_path, make_pdf):
+    pdf_path = tmp_path / "pages.pdf"
+    make_pdf(pdf_path, sizes=[(200, 300)] * 3)
+
+    window = ReaderWindow(str(pdf_path), MockCoreApp())
+    window.viewer.go_to_page(2)
+    assert window.toolbar.lbl_page_info.text() == " 1 / 3 "
+
+    qapp.processEvents()
+    assert window.toolbar.lbl_page_info.text() == " 2 / 3 "
+
+    window.close()
+
+def test_toc_panel_loads_flat_rows_into_nested_tree(qapp):
+    from src.core.services.pdf_engine import PDFEngine
+    toc = [
+        {'title': 'A', 'page': 1, 'dest_y': 0.0, 'user_note': 'n', 'children': [
+            {'title': 'A.1', 'page': 2, 'dest_y': 5.0, 'user_note': '', 'children': [
+                {'title': 'A.1.a', 'page': 3, 'dest_y': 0.0, 'user_note': '', 'children': []},
+            ]},
+        ]},
+        {'title': 'B', 'page': 4, 'dest_y': 0.0, 'user_note': '', 'children': []},
+    ]
+    rows = PDFEngine.flatten_toc(toc)
+    assert [r[0] for r in rows] == [1, 2, 3, 1]
+
+    panel = ToCPanel()
+    panel.load_flat_toc(rows)
+    assert panel.toc_data == toc
+    tree = panel.toc_tree
+    assert [tree.topLevelItem(i).text(0) for i in range(tree.topLevelItemCount())] == ['A', 'B']
+    a = tree.topLevelItem(0)
+    assert a.child(0).child(0).text(0) == 'A.1.a'
+    assert a.isExpanded() and a.child(0).isExpanded()
+    assert panel._node_for(a.child(0)) is panel.toc_data[0]['children'][0]
+
+def test_build_toc_tree_nests_by_level_and_tolerates_jumps():
+    from src.core.services._toc import build_toc_tree
+    def node(title):
+        return {'title': title, 'children': []}
+
+    tree = build_toc_tree([(1, node('A')), (2, node('A.1')), (3, node('A.1.a')),
+                           (2, node('A.2')), (1, node('B'))])
+    assert [n['title'] for n in tree] == ['A', 'B']
+    assert [n['title'] for n in tree[0]['children']] == ['A.1', 'A.2']
+    assert tree[0]['children'][0]['children'][0]['title'] == 'A.1.a'
+
+    # Malformed: leading level-2 entry becomes a root; a 1 -> 3 jump nests one level down
+    tree = build_toc_tree([(2, node('X')), (1, node('A')), (3, node('A.x'))])
+    assert [n['title'] for n in tree] == ['X', 'A']
+    assert tree[1]['children'][0]['title'] == 'A.x'
+
+    # Skipped levels: 1 -> 4 -> 3 keeps the 3 under A, beside the 4, not inside it
+    tree = build_toc_tree([(1, node('A')), (4, node('A.deep')), (3, node('A.mid'))])
+    assert [n['title'] for n in tree[0]['children']] == ['A.deep', 'A.mid']
+    assert tree[0]['children'][0]['children'] == []
+
+def test_large_bookmarks_are_streamed_into_toc(qapp, monkeypatch):
+    from src.core.services import json_codec
+    toc = [{'title': f'Ch {i}', 'page': i, 'children': [{'title': f'Ch {i}.1', 'page': i, 'children': []}]}
+           for i in range(1, 6)]
+
+    class BigTocManager(MockPDFManager):
+        def get_metadata(self, path):
+            return {'tags': '', 'notes': '', 'bookmarks': json_codec.dumps(toc)}
+
+    core_app = MockCoreApp()
+    core_app.pdf_manager = BigTocManager()
+    monkeypatch.setattr(ReaderWindow, "STREAM_TOC_THRESHOLD", 10)
+    streamed = []
+    original = ToCPanel.load_toc_stream
+    monkeypatch.setattr(ToCPanel, "load_toc_stream",
+                        lambda self, nodes, batch_size=2: streamed.append(True) or original(self, nodes, batch_size))
+
+    window = ReaderWindow("test.pdf", core_app)
+    panel = window.toc_panel
+    assert streamed == [True]
+    assert panel.toc_data == toc
+    assert panel.toc_tree.topLevelItemCount() == 5
+    assert panel.toc_tree.topLevelItem(4).child(0).text(0) == 'Ch 5.1'
+
+    window.close()
+
+def test_toc_is_extracted_off_the_ui_thread(qapp, tmp_path, make_pdf):
+    path = make_pdf(tmp_path / "outline.pdf", toc=[[1, "Intro", 1]])
+
+    window = ReaderWindow(str(path), MockCoreApp())
+    panel = window.toc_panel
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+    assert panel.toc_tree.topLevelItemCount() == 1
+    assert panel.toc_tree.topLevelItem(0).text(0) == "Intro"
+    window.close()
+
+def test_unchanged_toc_is_not_written_back(qapp, monkeypatch):
+    from src.core.services import json_codec
+    monkeypatch.setattr("PyQt6.QtWidgets.QMessageBox.information", lambda *a: None)
+    toc = [{"title": "A", "page": 1, "dest_y": 0.0, "children": [], "user_note": ""}]
+
+    core_app = MockCoreApp()
+    core_app.pdf_manager.get_metadata = lambda path: {'tags': '', 'notes': '', 'bookmarks': json_codec.dumps(toc)}
+    writes = []
+    core_app.update_file_custom = lambda path, bookmarks=None: writes.append(bookmarks)
+
+    window = ReaderWindow("test.pdf", core_app)
+    panel = window.toc_panel
+    window._save_toc_to_db(panel.toc_data)
+    assert writes == []
+
+    panel.toc_data[0]["user_note"] = "edited"
+    window._save_toc_to_db(panel.toc_data)
+    window._save_toc_to_db(panel.toc_data)
+    assert len(writes) == 1
+    window.close()
+
+def test_toc_stored_with_other_spacing_is_not_written_back(qapp, monkeypatch):
+    import json
+    monkeypatch.setattr("PyQt6.QtWidgets.QMessageBox.information", lambda *a: None)
+    toc = [{"title": "A", "page": 1, "dest_y": 0.0, "children": [], "user_note": ""}]
+
+    core_app = MockCoreApp()
+    # Older rows were written with stdlib json spacing, not the codec's output
+    core_app.pdf_manager.get_metadata = lambda path: {'tags': '', 'notes': '', 'bookmarks': json.dumps(toc, indent=2)}
+    writes = []
+    core_app.update_file_custom = lambda path, bookmarks=None: writes.append(bookmarks)
+
+    window = ReaderWindow("test.pdf", core_app)
+    window._save_toc_to_db(window.toc_panel.toc_data)
+    assert writes == []
+    window.close()
@@ -0,0 +1,14 @@
+import json
+import pytest
+
+def test_settings_values_are_resolved_once_and_refreshed_on_save(core_app, tmp_path):
+    settings = core_app.settings
+    assert settings.ignore_files == frozenset()
+    with pytest.raises(TypeError):
+        settings.config["ignore_files"] = ["x"] # read-only view
+    
+    settings.save_config({"ignore_files": [".DS_Store", "Thumbs.db"], "default_category": "Misc"})
+    assert settings.ignore_files == frozenset({".DS_Store", "Thumbs.db"})
+    assert settings.default_category == "Misc"
+    assert settings.config["default_category"] == "Misc"
+    assert json.loads((tmp_path / "settings.json").read_text())["ignore_files"] == [".DS_Store", "Thumbs.db"]
@@ -1,12 +1,8 @@
 
 import sys
-import os
 import unittest
 from PyQt6.QtWidgets import QApplication
 
-# Add project root to sys.path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from src.apps.pdf_ms.controllers.main_controller import MainController
 from src.apps.pdf_ms.views.main_window import MainWindow
 
@@ -0,0 +1,171 @@
+import json
+import sqlite3
+import pandas as pd
+import pytest
+
+from src.core.storage import Storage
+
+def test_bulk_metadata_fetch(tmp_path):
+    storage = Storage(str(tmp_path / "meta.db"))
+    storage.update_pdf_metadata("/a.pdf", "t1", "n1", "")
+    storage.update_bookmark_status("/b.pdf", True)
+    
+    meta = storage.get_pdf_metadata_bulk(["/a.pdf", "/b.pdf", "/missing.pdf"])
+    assert sorted(meta.index) == ["/a.pdf", "/b.pdf"]
+    assert meta.loc["/a.pdf", "tags"] == "t1"
+    assert bool(meta.loc["/b.pdf", "is_bookmarked"]) is True
+    
+    # More paths than SQLite allows in one statement
+    paths = [f"/x{i}.pdf" for i in range(Storage.SQLITE_MAX_VARS + 5)] + ["/a.pdf"]
+    assert list(storage.get_pdf_metadata_bulk(paths).index) == ["/a.pdf"]
+
+def test_former_msgpack_column_is_dropped(tmp_path):
+    db = str(tmp_path / "meta.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE pdf_metadata (id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT UNIQUE, "
+                 "tags TEXT, notes TEXT, bookmarks TEXT, is_bookmarked INTEGER DEFAULT 0, "
+                 "bookmarks_flat TEXT, bookmarks_mp BLOB, last_modified INTEGER)")
+    conn.execute("INSERT INTO pdf_metadata (file_path, tags, bookmarks_mp) VALUES ('/a.pdf', 't', x'00')")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    
+    storage = Storage(db)
+    with storage._read() as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(pdf_metadata)")}
+    assert 'bookmarks_mp' not in columns
+    assert storage.get_pdf_metadata("/a.pdf")["tags"] == "t"
+    storage.close()
+
+def test_storage_keeps_one_wal_connection(tmp_path):
+    storage = Storage(str(tmp_path / "meta.db"))
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    # A failing batch leaves nothing behind
+    with pytest.raises(ValueError):
+        with storage._write() as conn:
+            conn.execute("INSERT INTO root_history (path, last_accessed) VALUES ('/x', 'now')")
+            raise ValueError("boom")
+    assert storage.get_root_history() == []
+    
+    storage.save_root_history("/y")
+    assert storage.get_root_history() == ["/y"]
+    storage.close()
+
+def test_bookmark_and_history_queries_use_indexes(tmp_path):
+    storage = Storage(str(tmp_path / "meta.db"))
+    storage.update_bookmark_status_many(["/a.pdf", "/b.pdf"], True)
+    storage.update_bookmark_status("/b.pdf", False)
+    assert storage.get_bookmarked_paths() == ["/a.pdf"]
+    
+    plan = " ".join(r[-1] for r in storage._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT file_path FROM pdf_metadata WHERE is_bookmarked = 1"))
+    assert "idx_meta_bookmarked" in plan
+    plan = " ".join(r[-1] for r in storage._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT path FROM root_history ORDER BY last_accessed DESC"))
+    assert "idx_root_last" in plan
+    storage.close()
+
+def test_metadata_reads_are_cached_until_written(tmp_path):
+    storage = Storage(str(tmp_path / "meta.db"))
+    storage.update_pdf_metadata("/a.pdf", "t1", "n1", "")
+    first = storage.get_pdf_metadata("/a.pdf")
+    first["tags"] = "mutated by caller"
+    assert storage.get_pdf_metadata("/a.pdf")["tags"] == "t1"
+    assert "/a.pdf" in storage._meta_cache
+    
+    storage.update_pdf_metadata("/a.pdf", "t2", "n1", "")
+    assert storage.get_pdf_metadata("/a.pdf")["tags"] == "t2"
+    
+    # Toggle needs no prior read and keeps the cache coherent
+    assert storage.toggle_bookmark_status("/a.pdf") is True
+    assert storage.get_pdf_metadata("/a.pdf")["is_bookmarked"] is True
+    assert storage.toggle_bookmark_status("/a.pdf") is False
+    assert storage.toggle_bookmark_status("/new.pdf") is True
+    assert storage.get_pdf_metadata("/new.pdf")["tags"] == ""
+    storage.close()
+
+def test_toggle_patches_cached_row(tmp_path):
+    storage = Storage(str(tmp_path / "meta.db"))
+    storage.update_pdf_metadata("/a.pdf", "t1", "n1", "")
+    assert storage.get_pdf_metadata("/a.pdf")["is_bookmarked"] is False
+    
+    assert storage.toggle_bookmark_status("/a.pdf") is True
+    assert storage._meta_cache["/a.pdf"]["is_bookmarked"] is True
+    
+    assert storage.get_pdf_metadata("/a.pdf")["tags"] == "t1"
+    
+    # The patched entry matches the database
+    storage._meta_cache.clear()
+    assert storage.get_pdf_metadata("/a.pdf")["is_bookmarked"] is True
+    storage.close()
+
+def test_history_round_trip_without_pandas_sql(tmp_path):
+    storage = Storage(str(tmp_path / "hist.db"))
+    df = pd.DataFrame({
+        'original_path': ['/a.pdf', '/b.txt'],
+        'filename': ['a.pdf', 'b.txt'],
+        'category': pd.Categorical(['Docs', 'Others']),
+        'target_path': ['/Docs/a.pdf', None],
+        'status': ['success', 'skipped'],
+    })
+    storage.save_history(df)
+    assert 'timestamp' not in df.columns # caller's frame is left alone
+    
+    history = storage.get_history()
+    assert list(history.columns) == ['id', 'timestamp', 'original_path', 'filename',
+                                     'category', 'target_path', 'status', 'action']
+    assert history['category'].tolist() == ['Docs', 'Others']
+    assert history['target_path'][0] == '/Docs/a.pdf' and pd.isna(history['target_path'][1])
+    assert history['action'].isna().all()
+    assert history['timestamp'].notna().all()
+    storage.close()
+
+def test_metadata_uses_integer_timestamps_and_compresses_long_bookmarks(tmp_path):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(str(db))
+    conn.execute("""CREATE TABLE pdf_metadata (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_path TEXT UNIQUE, tags TEXT, notes TEXT, bookmarks TEXT,
+                    is_bookmarked INTEGER DEFAULT 0, last_modified TEXT)""")
+    conn.execute("INSERT INTO pdf_metadata (file_path, tags, notes, bookmarks, last_modified) "
+                 "VALUES ('/old.pdf', 't', 'n', '[]', '2024-01-02 03:04:05')")
+    conn.commit()
+    conn.close()
+    
+    storage = Storage(str(db))
+    assert storage.get_pdf_metadata("/old.pdf")["tags"] == "t"
+    long_toc = json.dumps([{"title": f"Chapter {i}", "page": i, "children": []} for i in range(200)])
+    storage.update_pdf_metadata("/new.pdf", "", "", long_toc, bookmarks_flat=long_toc)
+    storage.update_pdf_metadata_many(["bookmarks"], [("/bulk.pdf", long_toc)])
+    
+    with storage._read() as conn:
+        rows = dict(conn.execute("SELECT file_path, typeof(last_modified) FROM pdf_metadata").fetchall())
+        stored = conn.execute("SELECT bookmarks FROM pdf_metadata WHERE file_path = '/new.pdf'").fetchone()[0]
+    assert set(rows.values()) == {"integer"}
+    assert isinstance(stored, bytes) and len(stored) < len(long_toc)
+    
+    storage._meta_cache.clear()
+    meta = storage.get_pdf_metadata("/new.pdf")
+    assert meta["bookmarks"] == long_toc and meta["bookmarks_flat"] == long_toc
+    assert storage.get_pdf_metadata("/bulk.pdf")["bookmarks"] == long_toc
+    # Scans only get a flag, answered without decompressing anything
+    storage.update_pdf_metadata("/empty.pdf", "", "", "")
+    bulk = storage.get_pdf_metadata_bulk(["/bulk.pdf", "/old.pdf", "/empty.pdf"])
+    assert "bookmarks" not in bulk.columns
+    assert bulk["has_bookmarks"].to_dict() == {"/bulk.pdf": True, "/old.pdf": True, "/empty.pdf": False}
+    storage.close()
+
+def test_schema_setup_is_skipped_once_current(tmp_path, monkeypatch):
+    db = str(tmp_path / "meta.db")
+    Storage(db).close()
+    
+    calls = []
+    monkeypatch.setattr(Storage, "_create_schema", lambda self, cursor: calls.append(cursor))
+    storage = Storage(db)
+    assert calls == []
+    storage.update_pdf_metadata("/a.pdf", "t", "n", "")
+    storage.close()
+    
+    monkeypatch.setattr(Storage, "SCHEMA_VERSION", Storage.SCHEMA_VERSION + 1)
+    Storage(db).close()
+    assert len(calls) == 1
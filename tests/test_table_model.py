@@ -0,0 +1,104 @@
+import os
+import pandas as pd
+import pytest
+from PyQt6.QtCore import Qt
+
+from src.apps.pdf_ms.models.pdf_table_model import PDFTableModel
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame([
+        {'filename': 'a.pdf', 'filename_no_ext': 'a', 'original_path': '/docs/a.pdf',
+         'relative_path': 'a.pdf', 'tags': 'work', 'category': 'Documents',
+         'file_type': 'PDF File', 'has_toc': True, 'is_bookmarked': False},
+        {'filename': 'b.pdf', 'filename_no_ext': 'b', 'original_path': '/docs/sub/b.pdf',
+         'relative_path': os.path.join('sub', 'b.pdf'), 'tags': '', 'category': 'Documents',
+         'file_type': 'PDF File', 'has_toc': False, 'is_bookmarked': True},
+    ])
+
+def test_user_role_is_cached_per_row(qapp, sample_df):
+    model = PDFTableModel()
+    model.set_data(sample_df)
+
+    index = model.index(0, 7)
+    first = model.data(index, Qt.ItemDataRole.UserRole)
+    assert first == {'has_toc': True, 'is_bookmarked': False, 'path': '/docs/a.pdf'}
+    assert model.data(index, Qt.ItemDataRole.UserRole) is first
+
+def test_user_role_cache_invalidated(qapp, sample_df):
+    model = PDFTableModel()
+    model.set_data(sample_df)
+    model.index(0, 7).data(Qt.ItemDataRole.UserRole)
+
+    # In-place edit + dataChanged (as the controller does for Fav toggles)
+    sample_df.loc[0, 'is_bookmarked'] = True
+    idx = model.index(0, 4)
+    model.dataChanged.emit(idx, idx, [Qt.ItemDataRole.UserRole])
+    assert model.index(0, 7).data(Qt.ItemDataRole.UserRole)['is_bookmarked'] is True
+
+    # Full reset
+    model.set_data(sample_df.iloc[::-1].reset_index(drop=True))
+    assert model.index(0, 7).data(Qt.ItemDataRole.UserRole)['path'] == '/docs/sub/b.pdf'
+
+def test_display_strings(qapp, sample_df):
+    model = PDFTableModel()
+    model.set_data(sample_df)
+
+    row0 = [model.index(0, c).data() for c in range(model.columnCount())]
+    assert row0 == ['a', 'PDF File', 'work', 'Documents', '☆', '✓ Yes', 'a.pdf', '']
+    assert model.index(1, 4).data() == '★'
+    assert model.index(1, 5).data() == '✗ No'
+
+def test_display_refreshed_on_data_changed(qapp, sample_df):
+    model = PDFTableModel()
+    model.set_data(sample_df)
+    assert model.index(0, 4).data() == '☆'
+
+    sample_df.loc[0, 'is_bookmarked'] = True
+    idx = model.index(0, 4)
+    model.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DisplayRole])
+    assert model.index(0, 4).data() == '★'
+
+def test_multi_data_matches_data(qapp, sample_df):
+    from PyQt6.QtCore import QModelRoleData, QModelRoleDataSpan
+
+    model = PDFTableModel()
+    model.set_data(sample_df)
+    index = model.index(1, 5)
+
+    roles = [QModelRoleData(Qt.ItemDataRole.DisplayRole), QModelRoleData(Qt.ItemDataRole.FontRole)]
+    span = QModelRoleDataSpan(roles)
+    model.multiData(index, span)
+    assert span.dataForRole(Qt.ItemDataRole.DisplayRole) == model.index(1, 5).data()
+    assert span.dataForRole(Qt.ItemDataRole.FontRole) is None
+
+def test_has_toc_role(qapp, sample_df):
+    from src.apps.pdf_ms.models.pdf_table_model import HAS_TOC_ROLE
+
+    model = PDFTableModel()
+    model.set_data(sample_df)
+    assert model.index(0, 7).data(HAS_TOC_ROLE) is True
+    assert model.index(1, 7).data(HAS_TOC_ROLE) is False
+
+def test_action_buttons_render_at_device_pixel_ratio(qapp):
+    from PyQt6.QtCore import QSize
+    from src.apps.pdf_ms.views.components.action_delegate import ActionDelegate
+    delegate = ActionDelegate()
+    
+    hi = delegate._button_pixmap(1, delegate.icon_file, QSize(30, 20), False, 2.0)
+    assert (hi.width(), hi.height()) == (60, 40)
+    assert hi.devicePixelRatio() == 2.0
+    # Each pixel ratio has its own cached variant
+    lo = delegate._button_pixmap(1, delegate.icon_file, QSize(30, 20), False, 1.0)
+    assert (lo.width(), lo.height()) == (30, 20)
+    assert delegate._button_pixmap(1, delegate.icon_file, QSize(30, 20), False, 2.0) is hi
+
+def test_toc_dots_render_at_device_pixel_ratio(qapp):
+    from src.apps.pdf_ms.views.components.action_delegate import ActionDelegate
+    delegate = ActionDelegate()
+    
+    dot = delegate._dot(True, 2.0)
+    assert dot.width() == ActionDelegate.DOT_SIZE * 2
+    assert dot.devicePixelRatio() == 2.0
+    assert delegate._dot(True, 2.0) is dot
+    assert delegate._dot(False, 1.0).width() == ActionDelegate.DOT_SIZE
@@ -1,20 +1,7 @@
-import sys
-import os
 import pytest
-from PyQt6.QtWidgets import QApplication
-
-# Add project root
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.apps.pdf_ms.controllers.main_controller import MainController
 
-@pytest.fixture(scope="session")
-def qapp():
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    yield app
-
 def test_ui_startup(qapp):
     """
     Smoke test: Ensure MainController initializes MainWindow without error.
@@ -29,3 +16,61 @@ def test_ui_startup(qapp):
         print("UI Startup Test Passed")
     except Exception as e:
         pytest.fail(f"UI Startup Failed: {e}")
+
+def test_search_is_debounced(qapp):
+    from src.apps.pdf_ms.views.main_window import MainWindow
+    window = MainWindow()
+    committed = []
+    window.search_committed.connect(committed.append)
+    
+    for text in ("a", "ab", "abc"):
+        window.search_input.setText(text)
+    assert committed == []
+    assert window._search_timer.isActive()
+    
+    window._search_timer.timeout.emit()
+    assert committed == ["abc"]
+
+def test_settings_dialog_round_trip(qapp):
+    from src.apps.pdf_ms.views.settings_dialog import SettingsDialog
+    dialog = SettingsDialog({"default_category": "Books", "backup_enabled": True, "db_path": "x.db"})
+    
+    settings = dialog.get_settings()
+    assert settings["default_category"] == "Books"
+    assert settings["backup_enabled"] is True
+    assert settings["log_format"] == "json" # default
+    assert "db_path" not in settings # read-only, never saved
+    assert dialog._widgets["db_path"].text() == "x.db"
+
+def test_open_settings_updates_core_settings(qapp, tmp_path, monkeypatch):
+    from src.apps.pdf_ms.controllers import main_controller
+    
+    class FakeDialog:
+        def __init__(self, current_settings, parent=None):
+            pass
+        def exec(self):
+            return True
+        def get_settings(self):
+            return {"default_category": "Misc"}
+    
+    monkeypatch.setattr(main_controller, "SettingsDialog", FakeDialog)
+    monkeypatch.setattr(main_controller.QMessageBox, "information", lambda *args: None)
+    controller = MainController()
+    settings = controller.app_core.settings
+    monkeypatch.setattr(settings, "config_path", tmp_path / "settings.json")
+    
+    controller.open_settings()
+    assert settings.config["default_category"] == "Misc"
+    # The organizer shares this Settings instance and rebuilds on the next lookup
+    assert controller.app_core.organizer._get_category(".unknown") == "Misc"
+
+def test_stale_scan_progress_is_ignored(qapp):
+    controller = MainController()
+    controller._scan_gen = 2
+    status = controller.main_window.statusBar()
+    status.clearMessage()
+    
+    controller._on_scan_progress(1, 3, 10, "Checking ToC...")
+    assert status.currentMessage() == ""
+    controller._on_scan_progress(2, 3, 10, "Checking ToC...")
+    assert status.currentMessage() == "Checking ToC... (3/10)"
@@ -1,31 +1,21 @@
-import sys
 import os
 import time
-import pytest
-from PyQt6.QtCore import QCoreApplication
-
-# Add project root
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtCore import QEventLoop, QTimer
 
 from src.core.services.file_watcher import FileWatcherService
 
-@pytest.fixture
-def qapp():
-    app = QCoreApplication.instance()
-    if app is None:
-        app = QCoreApplication(sys.argv)
-    yield app
-
 def test_file_creation_detection(qapp, tmp_path):
     """
     Test that creating a PDF triggers the signal.
     """
     service = FileWatcherService()
     
-    # Track signal emission
+    # Track signal emission; the first one ends the wait
     signals_received = []
+    loop = QEventLoop()
     def on_created(path):
         signals_received.append(path)
+        loop.quit()
         
     service.handler.file_created.connect(on_created)
     
@@ -38,11 +28,9 @@ def test_file_creation_detection(qapp, tmp_path):
     with open(test_file, 'w') as f:
         f.write("dummy content")
         
-    # Wait for event (watchdog is threaded)
-    start_time = time.time()
-    while not signals_received and time.time() - start_time < 2:
-        qapp.processEvents()
-        time.sleep(0.1)
+    # Wait for event (watchdog is threaded), sleeping in Qt's event loop
+    QTimer.singleShot(2000, loop.quit)
+    loop.exec()
         
     service.stop_watching()
     
@@ -66,13 +54,71 @@ def test_ignore_non_pdf(qapp, tmp_path):
     with open(test_file, 'w') as f:
         f.write("dummy content")
         
-    # Wait briefly
-    start_time = time.time()
-    while time.time() - start_time < 1:
-        qapp.processEvents()
-        time.sleep(0.1)
+    # Wait briefly (past the watcher's debounce window)
+    loop = QEventLoop()
+    QTimer.singleShot(1000, loop.quit)
+    loop.exec()
         
     service.stop_watching()
     
     assert len(signals_received) == 0
     print("Non-PDF Ignored Successfully")
+
+def test_burst_is_coalesced_per_path(qapp):
+    """
+    Events within one debounce window collapse to one signal per file,
+    and a delete/create of the same file name becomes a move.
+    """
+    from src.core.services.file_watcher import FileMetadataHandler
+    handler = FileMetadataHandler()
+    created, deleted, moved, batches = [], [], [], []
+    handler.file_created.connect(created.append)
+    handler.file_deleted.connect(deleted.append)
+    handler.file_moved.connect(lambda s, d: moved.append((s, d)))
+    handler.changes_flushed.connect(batches.append)
+    
+    for _ in range(5):
+        handler._enqueue('created', '/r/a.pdf', '')
+    handler._enqueue('deleted', '/r/old/b.pdf', '')
+    handler._enqueue('created', '/r/new/b.pdf', '')
+    handler._enqueue('created', '/r/tmp.pdf', '')
+    handler._enqueue('moved', '/r/tmp.pdf', '/r/c.pdf')
+    handler._enqueue('deleted', '/r/gone.pdf', '')
+    assert not created # Nothing emitted before the window closes
+    
+    loop = QEventLoop()
+    handler.changes_flushed.connect(lambda paths: loop.quit())
+    QTimer.singleShot(2000, loop.quit)
+    loop.exec()
+    
+    assert created == ['/r/a.pdf', '/r/c.pdf']
+    assert moved == [('/r/old/b.pdf', '/r/new/b.pdf')]
+    assert deleted == ['/r/gone.pdf']
+    assert len(batches) == 1
+
+def test_pdf_suffix_filter():
+    from src.core.services._paths import is_pdf
+    assert is_pdf('/a/B.PDF') and is_pdf('/a/b.pdf') and is_pdf('.pdf')
+    assert not is_pdf('/a/b.pdfx') and not is_pdf('/a/bpdf') and not is_pdf('pdf')
+
+def test_network_paths_use_polling_and_restart_after_stop(qapp, tmp_path, monkeypatch):
+    from watchdog.observers.polling import PollingObserver
+    from src.core.services import file_watcher
+    assert file_watcher._is_network_path("//server/share")
+    assert not file_watcher._is_network_path(str(tmp_path))
+    
+    service = FileWatcherService()
+    monkeypatch.setattr(file_watcher, "_is_network_path", lambda p: True)
+    service.start_watching(str(tmp_path))
+    assert isinstance(service.observer, PollingObserver)
+    
+    start_time = time.time()
+    service.stop_watching()
+    assert time.time() - start_time < 2
+    
+    # A stopped observer cannot be restarted: a fresh native one is created
+    monkeypatch.setattr(file_watcher, "_is_network_path", lambda p: False)
+    service.start_watching(str(tmp_path))
+    assert not isinstance(service.observer, PollingObserver)
+    assert service.observer.is_alive()
+    service.stop_watching()
@@ -1,6 +1,6 @@
 import sys
 import os
-import glob
+from concurrent.futures import ProcessPoolExecutor
 
 # Add src to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,30 +9,59 @@ sys.path.append(src_path)
 
 from core.services.pdf_engine import PDFEngine
 
-def check_folder(folder_path):
+def iter_pdfs(root):
+    """
+    Yield PDF paths under root using os.scandir, so file types come from the
+    directory entries instead of a stat() per path. Like glob's "**", hidden
+    entries are skipped and symlinked directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Skipping unreadable folder: {e}")
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name[-4:].lower() == '.pdf' and entry.is_file():
+                yield entry.path
+        # Depth-first, in name order
+        stack.extend(reversed(subdirs))
+
+def probe(path):
+    """Worker: (path, has_toc, error message or None). Runs in a child process."""
+    try:
+        return path, PDFEngine.has_toc(path), None
+    except Exception as e:
+        return path, False, str(e)
+
+def check_folder(folder_path, workers=None):
     if not os.path.exists(folder_path):
         print(f"Error: Folder not found: {folder_path}")
         return
 
-    # Recursive search for PDFs
-    # Note: glob with recursive=True requires ** pattern
-    pdf_pattern = os.path.join(folder_path, "**", "*.pdf")
-    pdf_files = glob.glob(pdf_pattern, recursive=True)
-    
-    if not pdf_files:
-        print(f"No PDF files found in {folder_path}")
-        return
-
-    print(f"Scanning {len(pdf_files)} PDF files in: {folder_path}\n")
+    print(f"Scanning PDF files in: {folder_path}\n")
     print(f"{'Filename':<60} | {'Has ToC?':<10}")
     print("-" * 80)
 
     count_yes = 0
     count_no = 0
 
-    for f in pdf_files:
-        try:
-            has_toc = PDFEngine.has_toc(f)
+    total = 0
+    # MuPDF parsing is CPU-bound: one process per core, results in walk order.
+    # chunksize amortizes the pickling round-trip over several files.
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for f, has_toc, error in executor.map(probe, iter_pdfs(folder_path), chunksize=16):
+            total += 1
+            if error is not None:
+                print(f"Error processing {os.path.basename(f)}: {error}")
+                continue
             status = "YES" if has_toc else "NO"
             
             if has_toc:
@@ -46,11 +75,13 @@ def check_folder(folder_path):
                 filename = filename[:55] + "..."
                 
             print(f"{filename:<60} | {status:<10}")
-        except Exception as e:
-            print(f"Error processing {os.path.basename(f)}: {e}")
+
+    if not total:
+        print(f"No PDF files found in {folder_path}")
+        return
 
     print("-" * 80)
-    print(f"Total: {len(pdf_files)} | With ToC: {count_yes} | Without ToC: {count_no}")
+    print(f"Total: {total} | With ToC: {count_yes} | Without ToC: {count_no}")
 
 if __name__ == "__main__":
     target_folder = r"E:\AVEVA-TM docs\1D ENGINEERING"
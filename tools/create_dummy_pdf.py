@@ -20,6 +20,8 @@ def create_pdfs():
     
     # Add ToC
     # Format: [level, title, page_number]
+    # No dest dict: with {"to": ...} set_toc loads each referenced page to
+    # transform the point; the plain form only reads page xref/cropbox.
     toc = [
         [1, "Chapter 1", 1],
         [1, "Chapter 2", 2]
@@ -1,4 +1,5 @@
 import json
+import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
@@ -23,25 +24,21 @@ def load_config(path):
         return json.load(f)
 
 def save_config(path, config):
+    # Encode up front: json.dump issues one write() call per encoder chunk
+    text = json.dumps(config, indent=4)
     with open(path, 'w') as f:
-        json.dump(config, f, indent=4)
+        f.write(text)
+
+# "1", "1.2" or "1.2.3", optionally prefixed with "v"; missing parts count as 0
+VERSION_RE = re.compile(r"v?(\d+)(?:\.(\d+))?(?:\.(\d+))?")
 
 def increment_version(version_str):
-    try:
-        # Strip 'v' if present
-        clean_ver = version_str.lstrip('v')
-        parts = clean_ver.split('.')
-        if len(parts) < 3:
-            # Handle short versions like 1.0
-            while len(parts) < 3:
-                parts.append('0')
-                
-        major, minor, patch = map(int, parts)
-        patch += 1
-        return f"{major}.{minor}.{patch}"
-    except Exception as e:
-        print(f"Warning: Could not parse version '{version_str}': {e}. Resetting to 0.1.0")
+    match = VERSION_RE.fullmatch(version_str)
+    if match is None:
+        print(f"Warning: Could not parse version '{version_str}'. Resetting to 0.1.0")
         return "0.1.0"
+    major, minor, patch = (int(part or 0) for part in match.groups())
+    return f"{major}.{minor}.{patch + 1}"
 
 def run_git_commands(version):
     commands = [
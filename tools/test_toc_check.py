@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 
 # Add src to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,15 +10,15 @@ from core.services.pdf_engine import PDFEngine
 
 def test_toc_check():
     # 1. Define specific test files
-    base_dir = os.path.join(current_dir, '..', 'test_files')
+    # Resolve the directory once; the joined file paths are then absolute too
+    base_dir = os.path.abspath(os.path.join(current_dir, '..', 'test_files'))
     target_files = [
-        os.path.join(base_dir, 'dummy_no_toc.pdf'),
-        os.path.join(base_dir, 'dummy_with_toc.pdf'),
-        os.path.join(base_dir, 'report.pdf') # The invalid one, to test error handling
+        os.path.join(base_dir, name) for name in (
+            'dummy_no_toc.pdf',
+            'dummy_with_toc.pdf',
+            'report.pdf', # The invalid one, to test error handling
+        )
     ]
-    
-    # Resolve absolute paths
-    target_files = [os.path.abspath(f) for f in target_files]
 
     print(f"Testing ToC detection on {len(target_files)} files...\n")
     print(f"{'Filename':<40} | {'Has ToC?':<10} | {'Path'}")
@@ -1,12 +1,11 @@
 from src.core.settings import Settings
-import os
+from pathlib import Path
 
 def test_settings_persistence():
-    settings_file = "config/test_settings.json"
+    settings_file = Path("config/test_settings.json")
     
     # Clean up
-    if os.path.exists(settings_file):
-        os.remove(settings_file)
+    settings_file.unlink(missing_ok=True)
         
     # 1. Test Default Loading
     settings = Settings(settings_file)
@@ -31,8 +30,7 @@ def test_settings_persistence():
     print("Settings persistence verification passed!")
     
     # Clean up
-    if os.path.exists(settings_file):
-        os.remove(settings_file)
+    settings_file.unlink(missing_ok=True)
 
 if __name__ == "__main__":
     test_settings_persistence()